@@ -0,0 +1,121 @@
+"""
+Content-addressed cache for AI insight text.
+
+Insight prompts are fully determined by a handful of inputs (location,
+weather, simulation totals), so the Gemini response is cached under a
+SHA-256 of those inputs in canonical JSON. Weather values are bucketed
+first (2 °C, 10 % humidity, IMD rainfall intensity classes, ...) so that
+dashboards looking at the same district during the same weather share one
+entry. The prompt itself is rendered from the bucketed values, so the key
+really does address its content.
+
+The memory tier is a bounded ttl_cache.TTLCache (LRU, TTL, coalesced
+misses). An optional on-disk tier in the SQLite store survives restarts and
+is shared by all workers. Fallback results (model unavailable or timed out)
+are never cached.
+"""
+
+import hashlib
+import json
+from typing import Awaitable, Callable, Optional
+
+from ttl_cache import TTLCache
+
+# Bucket widths for numeric weather readings
+WEATHER_BUCKETS = {
+    "temperature": 2.0,    # °C
+    "humidity": 10.0,      # %
+    "wind_speed": 5.0,     # km/h
+    "uv_index": 1.0,
+}
+
+# IMD rainfall intensity classes (mm): upper bound -> label
+RAINFALL_CLASSES = [
+    (0.0, "none"),
+    (2.4, "very light"),
+    (15.5, "light"),
+    (64.4, "moderate"),
+    (115.5, "heavy"),
+    (204.4, "very heavy"),
+]
+
+
+def bucket(value, width: float):
+    """Round a reading to the middle of its bucket (None stays None)"""
+    if value is None:
+        return None
+    return round((float(value) // width) * width + width / 2, 1)
+
+
+def rainfall_class(precipitation) -> Optional[str]:
+    if precipitation is None:
+        return None
+    for upper, label in RAINFALL_CLASSES:
+        if precipitation <= upper:
+            return label
+    return "extremely heavy"
+
+
+def bucket_weather(weather_data: dict) -> dict:
+    bucketed = {name: bucket(weather_data.get(name), width) for name, width in WEATHER_BUCKETS.items()}
+    bucketed["precipitation"] = rainfall_class(weather_data.get("precipitation"))
+    condition = weather_data.get("condition")
+    bucketed["condition"] = condition.strip().lower() if condition else None
+    return bucketed
+
+
+def prompt_key(kind: str, inputs: dict) -> str:
+    """SHA-256 of the prompt kind and its inputs in canonical JSON"""
+    canonical = json.dumps({"kind": kind, "inputs": inputs}, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class AIResultCache:
+    """Memory (LRU + TTL) and optional SQLite tier for generated insight text"""
+
+    def __init__(self, ttl: float, max_entries: int = 4096, disk=None):
+        self.ttl = ttl
+        self.disk = disk  # storage.RuleStorage, or None for memory only
+        self.memory = TTLCache(ttl=ttl, max_entries=max_entries, cacheable=lambda text: text is not None)
+        self._stats = {"disk_hits": 0, "disk_misses": 0, "generated": 0, "fallbacks": 0}
+
+    async def get_or_generate(self, kind: str, inputs: dict,
+                              generate: Callable[[], Awaitable[Optional[str]]]) -> Optional[str]:
+        key = prompt_key(kind, inputs)
+        return await self.memory.get_or_fetch(key, lambda: self._load_or_generate(key, generate))
+
+    async def _load_or_generate(self, key: str, generate: Callable[[], Awaitable[Optional[str]]]) -> Optional[str]:
+        if self.disk is not None:
+            text = await self.disk.get_ai_result(key, self.ttl)
+            if text is not None:
+                self._stats["disk_hits"] += 1
+                return text
+            self._stats["disk_misses"] += 1
+        text = await generate()
+        if text is None:
+            self._stats["fallbacks"] += 1
+            return None
+        self._stats["generated"] += 1
+        if self.disk is not None:
+            await self.disk.put_ai_result(key, text)
+        return text
+
+    async def prune(self):
+        """Drop expired on-disk entries (memory entries expire on their own)"""
+        if self.disk is not None:
+            await self.disk.prune_ai_results(self.ttl)
+
+    def stats(self) -> dict:
+        memory = self.memory.stats()
+        lookups = memory["hits"] + memory["stale_hits"] + memory["misses"] + memory["coalesced"]
+        served = lookups - self._stats["generated"] - self._stats["fallbacks"]
+        return {
+            "memory_hits": memory["hits"],
+            "memory_misses": memory["misses"],
+            "coalesced": memory["coalesced"],
+            **self._stats,
+            "entries": memory["entries"],
+            "evictions": memory["evictions"],
+            "hit_rate": round(served / lookups, 4) if lookups else 0.0,
+            "disk_tier": self.disk is not None
+        }
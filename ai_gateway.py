@@ -0,0 +1,80 @@
+"""
+Non-blocking gateway for Gemini text generation.
+
+``GenerativeModel.generate_content`` is synchronous and takes seconds, so
+calling it from an ``async def`` handler stalls the event loop for every
+other request. The gateway uses the SDK's ``generate_content_async`` when the
+model has it, and otherwise runs the blocking call on a small dedicated
+thread pool. A semaphore bounds the number of calls in flight, and each call
+(including time spent waiting for a slot) has a timeout. When the model is
+missing, times out or fails, ``generate_text`` returns None so callers fall
+back to their canned insights.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+
+class AIGateway:
+    """Bounded, timed access to a Gemini model from async code"""
+
+    def __init__(self, model, max_concurrency: int = 4, timeout: float = 15.0):
+        self.model = model
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self._semaphore = None
+        self._executor = None
+        self._stats = {"calls": 0, "completed": 0, "timeouts": 0, "errors": 0, "in_flight": 0}
+
+    def open(self):
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="gemini")
+
+    def close(self):
+        if self._executor:
+            # Timed-out calls may still be running; don't hold shutdown hostage to them
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    @property
+    def available(self) -> bool:
+        return self.model is not None
+
+    async def generate_text(self, prompt: str) -> Optional[str]:
+        """Model response text, or None if the model is unavailable, too slow or failing"""
+        if self.model is None:
+            return None
+        if self._semaphore is None:
+            raise RuntimeError("AI gateway is not open (app lifespan not started)")
+
+        self._stats["calls"] += 1
+        try:
+            text = await asyncio.wait_for(self._generate(prompt), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            self._stats["timeouts"] += 1
+            print(f"⚠️  Gemini call timed out after {self.timeout:.0f}s, using fallback insights")
+            return None
+        except Exception as e:
+            self._stats["errors"] += 1
+            print(f"⚠️  Gemini call failed ({e}), using fallback insights")
+            return None
+        self._stats["completed"] += 1
+        return text
+
+    async def _generate(self, prompt: str) -> str:
+        async with self._semaphore:
+            self._stats["in_flight"] += 1
+            try:
+                if hasattr(self.model, "generate_content_async"):
+                    response = await self.model.generate_content_async(prompt)
+                else:
+                    loop = asyncio.get_running_loop()
+                    response = await loop.run_in_executor(self._executor, self.model.generate_content, prompt)
+                return response.text
+            finally:
+                self._stats["in_flight"] -= 1
+
+    def stats(self) -> dict:
+        return {**self._stats, "available": self.available,
+                "max_concurrency": self.max_concurrency, "timeout_seconds": self.timeout}
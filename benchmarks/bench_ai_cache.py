@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark: AI insight cache hit rate during a simulated monsoon event
+
+Replays /simulate-enhanced traffic concentrated on a few districts for N
+hours. Weather readings change hourly (the weather cache refresh interval)
+as a random walk with heavy rain. Compares Gemini calls for no cache, a cache
+keyed on raw weather values, and the bucketed cache; halfway through, the
+worker "restarts" with an empty memory tier to exercise the SQLite tier.
+Usage: python benchmarks/bench_ai_cache.py [hours] [requests_per_hour]
+"""
+
+import asyncio
+import os
+import random
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai_cache import AIResultCache, bucket_weather
+from storage import RuleStorage
+
+DISTRICTS = {"Ludhiana": 0.35, "Sangrur": 0.2, "Patiala": 0.15, "Amritsar": 0.15, "Jalandhar": 0.1, "Fatehgarh Sahib": 0.05}
+SIMULATION_TOTALS = {"eligible_farmers": 1646, "total_payout": 4730688, "triggered": 3}
+
+
+def hourly_weather(hours, seed=17):
+    """district -> list of hourly readings (random walk around monsoon conditions)"""
+    rng = random.Random(seed)
+    readings = {}
+    for district in DISTRICTS:
+        temperature, humidity, rain = rng.uniform(27, 31), rng.uniform(80, 92), rng.uniform(20, 60)
+        series = []
+        for _ in range(hours):
+            temperature += rng.gauss(0, 0.6)
+            humidity = min(100.0, max(60.0, humidity + rng.gauss(0, 2.5)))
+            rain = max(0.0, rain + rng.gauss(0, 8))
+            series.append({"temperature": round(temperature, 1), "humidity": round(humidity),
+                           "precipitation": round(rain, 1), "wind_speed": round(rng.uniform(12, 20), 1),
+                           "condition": "Heavy rain" if rain > 64.4 else "Moderate rain", "uv_index": 2.0})
+        readings[district] = series
+    return readings
+
+
+async def replay(cache_factory, inputs_for, hours, per_hour):
+    rng = random.Random(5)
+    weather = hourly_weather(hours)
+    calls = 0
+
+    async def generate():
+        nonlocal calls
+        calls += 1
+        return "Stub insight"
+
+    cache = cache_factory()
+    for hour in range(hours):
+        if cache and hour == hours // 2:
+            cache = cache_factory()  # worker restart: memory tier starts empty
+        for _ in range(per_hour):
+            district = rng.choices(list(DISTRICTS), weights=list(DISTRICTS.values()))[0]
+            if cache is None:
+                await generate()
+                continue
+            inputs = inputs_for(district, weather[district][hour])
+            await cache.get_or_generate("location", inputs, generate)
+    return calls, cache
+
+
+async def main(hours, per_hour):
+    total = hours * per_hour
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = RuleStorage(os.path.join(tmp, "ai_cache.db"))
+        storage.open()
+        try:
+            scenarios = [
+                ("no cache", lambda: None, None),
+                ("raw weather key, memory only", lambda: AIResultCache(21600),
+                 lambda district, reading: {"location": district.lower(), "weather": reading, **SIMULATION_TOTALS}),
+                ("bucketed key, memory + SQLite", lambda: AIResultCache(21600, disk=storage),
+                 lambda district, reading: {"location": district.lower(), "weather": bucket_weather(reading), **SIMULATION_TOTALS}),
+            ]
+            for label, factory, inputs_for in scenarios:
+                calls, cache = await replay(factory, inputs_for, hours, per_hour)
+                detail = ""
+                if cache is not None:
+                    stats = cache.stats()
+                    detail = f" | post-restart disk hits {stats['disk_hits']}"
+                print(f"{label:<30} | Gemini calls {calls:>6,} of {total:,} requests | hit rate {1 - calls / total:7.2%}{detail}")
+        finally:
+            storage.close()
+
+
+if __name__ == "__main__":
+    hours = int(sys.argv[1]) if len(sys.argv) > 1 else 12
+    per_hour = int(sys.argv[2]) if len(sys.argv) > 2 else 60
+    print(f"📊 AI insight cache: monsoon event, {len(DISTRICTS)} districts, {hours} h x {per_hour} requests/h")
+    asyncio.run(main(hours, per_hour))
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Load test: /health latency while Gemini requests are in flight
+
+Swaps the Gemini model for a stub that blocks for STUB_LATENCY seconds (like
+the synchronous SDK call), fires a wave of concurrent /ai/generate-insights
+requests and polls /health throughout. Runs once with the old inline
+generate_content call and once through ai_gateway.AIGateway, then prints
+/health latency percentiles for each. A final run with a stub slower than
+the gateway timeout checks that callers get the canned fallback in time.
+Usage: python benchmarks/bench_ai_gateway.py [ai_requests]
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["RULES_DB_PATH"] = os.path.join(tempfile.mkdtemp(), "bench_ai.db")
+
+import httpx
+
+import main
+from ai_gateway import AIGateway
+
+STUB_LATENCY = 1.0
+HEALTH_INTERVAL = 0.02
+SIMULATION_PAYLOAD = {"conditions": {"Pune": {}}, "triggeredSubsidies": [], "summary": {}}
+
+
+class StubResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class StubModel:
+    """Blocking stand-in for genai.GenerativeModel (sync API only)"""
+
+    def __init__(self, latency):
+        self.latency = latency
+
+    def generate_content(self, prompt):
+        time.sleep(self.latency)
+        return StubResponse("Stub insight: prioritise e-KYC camps and offline biometric fallbacks.")
+
+
+class InlineGateway(AIGateway):
+    """The previous behaviour: generate_content called directly on the event loop"""
+
+    async def generate_text(self, prompt):
+        return self.model.generate_content(prompt).text
+
+
+def percentile(sorted_values, q):
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))] * 1000
+
+
+async def load(client, ai_requests):
+    health_latencies = []
+    done = asyncio.Event()
+
+    async def poll_health():
+        # Latency is measured from each poll's scheduled time, so time spent stuck behind a blocked loop counts
+        scheduled = time.perf_counter()
+        while not done.is_set():
+            await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+            await client.get("/health")
+            health_latencies.append(time.perf_counter() - scheduled)
+            scheduled = max(scheduled + HEALTH_INTERVAL, time.perf_counter())
+
+    async def ai_wave():
+        await asyncio.sleep(0.1)
+        started = time.perf_counter()
+        responses = await asyncio.gather(*(client.post("/ai/generate-insights", json=SIMULATION_PAYLOAD)
+                                           for _ in range(ai_requests)))
+        elapsed = time.perf_counter() - started
+        await asyncio.sleep(0.1)
+        done.set()
+        return responses, elapsed
+
+    _, (responses, elapsed) = await asyncio.gather(poll_health(), ai_wave())
+    return sorted(health_latencies), responses, elapsed
+
+
+async def run(label, gateway, ai_requests):
+    main.ai_gateway = gateway
+    async with main.lifespan(main.app):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://bench") as client:
+            health, responses, elapsed = await load(client, ai_requests)
+    insight = responses[0].json()["insights"][0]["insight"]
+    print(f"{label:<22} | /health p50 {percentile(health, .5):7.2f} ms p99 {percentile(health, .99):8.2f} ms "
+          f"max {health[-1] * 1000:8.2f} ms ({len(health)} polls) | {ai_requests} AI calls in {elapsed:5.2f} s")
+    return insight
+
+
+async def bench(ai_requests):
+    await run("inline generate_content", InlineGateway(StubModel(STUB_LATENCY)), ai_requests)
+    await run("AIGateway (thread pool)", AIGateway(StubModel(STUB_LATENCY), max_concurrency=4, timeout=15), ai_requests)
+    insight = await run("AIGateway timeout", AIGateway(StubModel(3.0), max_concurrency=4, timeout=0.5), ai_requests)
+    print(f"timeout run served fallback: {insight.startswith('AI service unavailable')}")
+
+
+if __name__ == "__main__":
+    ai_requests = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    print(f"📊 Gemini gateway: /health latency under {ai_requests} concurrent AI requests (stub model, {STUB_LATENCY:.0f}s/call)")
+    asyncio.run(bench(ai_requests))
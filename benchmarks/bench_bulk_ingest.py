@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark: streaming bulk rule ingestion through POST /rules/bulk
+
+Streams N generated rules as NDJSON and as CSV through the FastAPI app
+(TestClient, temporary SQLite database) and reports end-to-end rules/second
+including parsing, validation, storage and worker sync.
+Usage: python benchmarks/bench_bulk_ingest.py [rule counts...]
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["RULES_DB_PATH"] = os.path.join(tempfile.mkdtemp(), "bench_bulk.db")
+
+from fastapi.testclient import TestClient
+
+import main
+
+CHUNK_ROWS = 1000
+
+
+def rule_records(count, seed=5):
+    rng = random.Random(seed)
+    districts = list(main.MOCK_CONDITIONS)
+    for i in range(count):
+        metric, low, high = rng.choice([("rainfall", 30, 150), ("temperature", 25, 45)])
+        yield {
+            "schemeName": f"Scheme {i % 100}",
+            "condition": f"{metric} {rng.choice('<>')} {rng.randint(low, high)}",
+            "amount": rng.choice([2000, 5000, 10000]),
+            "district": rng.choice(districts),
+        }
+
+
+def ndjson_body(count):
+    lines = []
+    for record in rule_records(count):
+        lines.append(json.dumps(record))
+        if len(lines) == CHUNK_ROWS:
+            yield ("\n".join(lines) + "\n").encode()
+            lines = []
+    if lines:
+        yield ("\n".join(lines) + "\n").encode()
+
+
+def csv_body(count):
+    yield b"schemeName,condition,amount,district\n"
+    lines = []
+    for r in rule_records(count):
+        lines.append(f"{r['schemeName']},{r['condition']},{r['amount']},{r['district']}")
+        if len(lines) == CHUNK_ROWS:
+            yield ("\n".join(lines) + "\n").encode()
+            lines = []
+    if lines:
+        yield ("\n".join(lines) + "\n").encode()
+
+
+def run(client, count):
+    for fmt, body, content_type in [("ndjson", ndjson_body, "application/x-ndjson"),
+                                    ("csv", csv_body, "text/csv")]:
+        start = time.perf_counter()
+        response = client.post("/rules/bulk", content=body(count), headers={"content-type": content_type})
+        elapsed = time.perf_counter() - start
+        summary = response.json()
+        assert summary["rules_created"] == count, summary
+        print(f"{count:>10,} rules | {fmt:<6} | {elapsed:6.2f} s end-to-end ({count / elapsed:>9,.0f} rules/s) | "
+              f"server-side {summary['rules_per_second']:>9,} rules/s")
+
+
+if __name__ == "__main__":
+    counts = [int(arg) for arg in sys.argv[1:]] or [10_000, 200_000]
+    print("📊 Bulk rule ingestion: streaming NDJSON and CSV through POST /rules/bulk")
+    with TestClient(main.app) as client:
+        for count in counts:
+            run(client, count)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark: dashboards polling /simulate vs the /events/stream change feed
+
+Polling cost is one full /simulate response (every triggered subsidy,
+serialized) per dashboard per interval. Push cost is one incremental
+condition update, its delta, and the encoded frame handed to every
+subscriber queue. Both are measured per operation on the same synthetic rule
+set and scaled to server CPU per second.
+Usage: python benchmarks/bench_change_feed.py [rules] [dashboards] [poll_seconds] [changes_per_minute]
+"""
+
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_incremental_simulation import make_conditions, make_rules
+from change_feed import ChangeFeed
+from incremental_simulation import IncrementalSimulation
+from rule_store import RuleRepository
+from simulation_kernel import DistrictColumns
+from storage import RuleChanges
+
+ROUNDS = 200
+
+
+def poll_response(engine):
+    """Body of one /simulate poll: every triggered subsidy plus the totals"""
+    subsidies = [{"schemeName": rule["schemeName"], "condition": rule["condition"], "amount": rule["amount"],
+                  "district": rule["district"], "eligibleFarmers": eligible, "totalPayout": payout}
+                 for rule, eligible, payout in engine.triggered()]
+    return json.dumps({"triggeredSubsidies": subsidies, "summary": engine.totals})
+
+
+async def run(count, dashboards, poll_seconds, changes_per_minute):
+    rng = random.Random(9)
+    conditions = make_conditions(rng)
+    repository = RuleRepository(DistrictColumns(conditions))
+    repository.apply_changes(RuleChanges(1, make_rules(count, list(conditions), rng), [], True))
+    engine = IncrementalSimulation(conditions, repository, rng=random.Random(1))
+    engine.rebuild()
+    engine.take_delta()
+
+    start = time.process_time()
+    for _ in range(ROUNDS):
+        size = len(poll_response(engine))
+    poll_cost = (time.process_time() - start) / ROUNDS
+
+    feed = ChangeFeed(queue_size=ROUNDS + 1)
+    subscribers = [feed.subscribe() for _ in range(dashboards)]
+    start = time.process_time()
+    for _ in range(ROUNDS):
+        district = rng.choice(list(conditions))
+        engine.update_conditions(district, {**conditions[district], "rainfall": rng.randint(20, 160)})
+        delta = engine.take_delta()
+        if delta:
+            feed.publish("triggers", delta)
+    for subscriber in subscribers:
+        while not subscriber.queue.empty():
+            subscriber.queue.get_nowait()
+    push_cost = (time.process_time() - start) / ROUNDS
+
+    poll_cpu = dashboards / poll_seconds * poll_cost
+    push_cpu = changes_per_minute / 60 * push_cost
+    print(f"{count:>8,} rules | poll response {poll_cost * 1000:7.2f} ms ({size / 1024:,.0f} KiB) x "
+          f"{dashboards / poll_seconds:5.1f}/s = {poll_cpu * 100:6.2f}% CPU | push per change "
+          f"{push_cost * 1000:6.3f} ms x {changes_per_minute / 60:5.2f}/s = {push_cpu * 100:6.3f}% CPU | "
+          f"{poll_cpu / push_cpu:7.0f}x less")
+
+
+if __name__ == "__main__":
+    args = [float(arg) for arg in sys.argv[1:]]
+    counts = [int(args[0])] if args else [10_000, 100_000]
+    dashboards = int(args[1]) if len(args) > 1 else 300
+    poll_seconds = args[2] if len(args) > 2 else 10
+    changes_per_minute = args[3] if len(args) > 3 else 6
+    print(f"📊 Dashboard refresh: {dashboards} dashboards polling every {poll_seconds:g} s vs SSE push "
+          f"({changes_per_minute:g} condition changes/min)")
+    for count in counts:
+        asyncio.run(run(count, dashboards, poll_seconds, changes_per_minute))
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Benchmark: /analytics/districts and /dashboard/efficiency per-request cost
+
+Compares rebuilding the view on every request (what the endpoints did
+before), serving the precomputed body, and answering a dashboard that sends
+the ETag it already has (304). Requests go through the ASGI app in-process,
+so the numbers include routing and response overhead.
+Usage: python benchmarks/bench_derived_metrics.py [requests]
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["RULES_DB_PATH"] = os.path.join(tempfile.mkdtemp(), "bench_derived.db")
+
+import httpx
+
+import main
+
+
+async def timed(client, path, count, headers=None, invalidate=False):
+    started = time.perf_counter()
+    for _ in range(count):
+        if invalidate:
+            main.derived_metrics.invalidate()
+        response = await client.get(path, headers=headers)
+        assert response.status_code in (200, 304), response.text
+    return (time.perf_counter() - started) / count, response
+
+
+async def bench(count):
+    async with main.lifespan(main.app):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://bench") as client:
+            for path in ("/analytics/districts", "/dashboard/efficiency"):
+                rebuild, _ = await timed(client, path, count, invalidate=True)
+                cached, response = await timed(client, path, count)
+                not_modified, _ = await timed(client, path, count, headers={"If-None-Match": response.headers["etag"]})
+                print(f"{path:<22} | rebuilt {rebuild * 1e6:8.1f} µs | precomputed {cached * 1e6:8.1f} µs | "
+                      f"304 {not_modified * 1e6:8.1f} µs ({len(response.content):,} bytes saved per poll)")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    print(f"📊 Derived district metrics: {count} requests per mode, {len(main.districts)} districts")
+    asyncio.run(bench(count))
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark: district registry load, lookup and memory at national scale
+
+Writes N synthetic districts (750 districts, 7000 sub-district blocks) to
+CSV and SQLite, then measures parse time, the kernel view build, cold
+(first) and warm lookups, and the memory of the columnar table against the
+same data held as nested dicts like MOCK_CONDITIONS.
+Usage: python benchmarks/bench_district_registry.py [counts...]
+"""
+
+import csv
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from district_registry import FIELDS, NAME_COLUMN, DistrictRegistry, DistrictTable, read_source
+from simulation_kernel import DistrictColumns
+
+LOOKUPS = 200_000
+
+
+def make_columns(count, rng):
+    raw = {NAME_COLUMN: [f"Block {i}" for i in range(count)]}
+    for column, (_, kind) in FIELDS.items():
+        if kind == "str":
+            raw[column] = [rng.choice(["low", "medium", "high"]) for _ in range(count)]
+        elif kind == "bool":
+            raw[column] = [rng.random() < 0.8 for _ in range(count)]
+        elif kind == "int":
+            raw[column] = [rng.randint(2000, 20000) for _ in range(count)]
+        else:
+            raw[column] = [round(rng.uniform(0.05, 0.95), 3) for _ in range(count)]
+    return raw
+
+
+def write_sources(raw, directory):
+    header = list(raw)
+    rows = list(zip(*raw.values()))
+    csv_path = os.path.join(directory, "districts.csv")
+    with open(csv_path, "w", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(header)
+        writer.writerows(rows)
+    db_path = os.path.join(directory, "districts.db")
+    conn = sqlite3.connect(db_path)
+    conn.execute(f"CREATE TABLE districts ({', '.join(header)})")
+    conn.executemany(f"INSERT INTO districts VALUES ({', '.join('?' * len(header))})", rows)
+    conn.commit()
+    conn.close()
+    return csv_path, db_path
+
+
+def measure_memory(build):
+    tracemalloc.start()
+    value = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return value, size
+
+
+def run(count):
+    rng = random.Random(4)
+    raw = make_columns(count, rng)
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path, db_path = write_sources(raw, directory)
+        timings = {}
+        for label, path in (("CSV", csv_path), ("SQLite", db_path)):
+            start = time.perf_counter()
+            read_source(path)
+            timings[label] = time.perf_counter() - start
+
+        registry = DistrictRegistry(csv_path)
+        start = time.perf_counter()
+        DistrictColumns(registry)
+        kernel_time = time.perf_counter() - start
+
+        cold = DistrictRegistry(csv_path)
+        len(cold)
+        names = [rng.choice(cold.table.names) for _ in range(LOOKUPS)]
+        start = time.perf_counter()
+        for name in names:
+            cold[name]
+        lookup_time = (time.perf_counter() - start) / LOOKUPS
+
+    table, table_bytes = measure_memory(lambda: DistrictTable.from_columns(raw))
+    _, dict_bytes = measure_memory(lambda: {name: table.record(i) for i, name in enumerate(table.names)})
+    print(f"{count:>6,} districts | parse CSV {timings['CSV'] * 1000:7.1f} ms, SQLite {timings['SQLite'] * 1000:7.1f} ms | "
+          f"kernel view {kernel_time * 1000:6.1f} ms | lookup {lookup_time * 1e6:5.2f} µs | "
+          f"columns {table_bytes / 1024:7.0f} KiB vs nested dicts {dict_bytes / 1024:7.0f} KiB")
+
+
+if __name__ == "__main__":
+    counts = [int(arg) for arg in sys.argv[1:]] or [750, 7000, 70_000]
+    print(f"📊 District registry: load, lookup ({LOOKUPS:,} random, cold then cached) and memory")
+    for count in counts:
+        run(count)
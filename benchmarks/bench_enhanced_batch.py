@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark: N single /simulate-enhanced calls vs one streamed batch call
+
+Weather lookups are replaced by a stub with WEATHER_LATENCY seconds of
+upstream latency (a cold weather cache) and Gemini is left unconfigured, so
+the numbers isolate request fan-out. The single-call run issues one request
+per district, one after another, as the control room does today; the batch
+run streams all districts from POST /simulate-enhanced/batch.
+Usage: python benchmarks/bench_enhanced_batch.py [districts] [max_concurrency]
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["RULES_DB_PATH"] = os.path.join(tempfile.mkdtemp(), "bench_batch.db")
+
+import httpx
+
+import main
+
+WEATHER_LATENCY = 0.15
+DISTRICTS = ["Ludhiana", "Sangrur", "Patiala", "Amritsar", "Jalandhar", "Fatehgarh Sahib", "Bathinda", "Mansa",
+             "Moga", "Firozpur", "Faridkot", "Muktsar", "Barnala", "Hoshiarpur", "Kapurthala", "Gurdaspur",
+             "Pathankot", "Rupnagar", "Mohali", "Fazilka", "Tarn Taran", "Nawanshahr", "Malerkotla", "Pune",
+             "Nashik", "Ahmedabad", "Rajkot", "Indore", "Bhopal", "Jaipur", "Kota", "Delhi"]
+
+
+async def stub_district_weather(district):
+    await asyncio.sleep(WEATHER_LATENCY)
+    return main.WeatherData(location=f"{district}, India", temperature=36.5, humidity=48, precipitation=0.0,
+                            wind_speed=14.0, condition="Sunny", uv_index=9.0, pressure=1002.0)
+
+
+async def bench(count, concurrency):
+    main.get_district_weather = stub_district_weather
+    locations = (DISTRICTS * (count // len(DISTRICTS) + 1))[:count]
+    async with main.lifespan(main.app):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://bench",
+                                     timeout=120) as client:
+            started = time.perf_counter()
+            for location in locations:
+                response = await client.post("/simulate-enhanced", json={"location": location})
+                assert response.status_code == 200, response.text
+            single_time = time.perf_counter() - started
+
+            started = time.perf_counter()
+            districts = 0
+            async with client.stream("POST", "/simulate-enhanced/batch",
+                                     json={"locations": locations, "max_concurrency": concurrency}) as response:
+                async for line in response.aiter_lines():
+                    if line and json.loads(line)["type"] == "district":
+                        districts += 1
+            batch_time = time.perf_counter() - started
+
+    print(f"{count:>3} districts | {count} single calls {single_time:6.2f} s | batch (max_concurrency {concurrency}) "
+          f"{batch_time:6.2f} s, {districts} district results | speedup {single_time / batch_time:5.1f}x")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else len(DISTRICTS)
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else main.ENHANCED_BATCH_CONCURRENCY
+    print(f"📊 /simulate-enhanced: single calls vs streamed batch (stub weather {WEATHER_LATENCY * 1000:.0f} ms)")
+    asyncio.run(bench(count, concurrency))
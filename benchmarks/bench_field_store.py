@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark: field store district overview, paging and region queries
+
+Generates N fields over 50 districts, then times what the realtime
+satellite endpoint and region queries cost with the columnar store (the
+precomputed district summary, one page of fields, grid-indexed bbox and
+polygon queries) against scanning a list of field dicts the way the old
+endpoint did. Region results are checked against a brute-force scan.
+Usage: python benchmarks/bench_field_store.py [field counts...]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from field_store import DEFAULT_PAGE_SIZE, generate_fields
+
+DISTRICTS = 50
+REPEATS = 20
+BBOX = (73.80, 18.45, 73.95, 18.60)
+POLYGON = [(73.80, 18.45), (73.95, 18.45), (73.95, 18.60), (73.85, 18.58)]
+
+
+def timed(function, repeats=REPEATS):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        result = function()
+    return result, (time.perf_counter() - start) / repeats * 1000
+
+
+def scan_overview(fields):
+    """The old per-request statistics: one list comprehension per figure"""
+    return {
+        "average_ndvi": sum(f["ndvi"] for f in fields) / len(fields),
+        "total_area": sum(f["area_hectares"] for f in fields),
+        "health": {level: len([f for f in fields if f["health_status"] == level])
+                   for level in ("excellent", "good", "moderate", "poor")},
+        "water": len([f for f in fields if f["stress_indicators"]["water_stress"]]),
+        "nutrient": len([f for f in fields if f["stress_indicators"]["nutrient_deficiency"]]),
+        "drought": len([f for f in fields if f["ndvi"] < 0.5]),
+        "insurance": len([f for f in fields if f["ndvi"] < 0.4]),
+    }
+
+
+def scan_bbox(fields, bbox):
+    min_lng, min_lat, max_lng, max_lat = bbox
+    return [f for f in fields if min_lat <= f["coordinates"]["lat"] <= max_lat
+            and min_lng <= f["coordinates"]["lng"] <= max_lng]
+
+
+def run(count):
+    names = ["Pune"] + [f"District {i}" for i in range(1, DISTRICTS)]
+    conditions = {name: {"crop_ndvi": 0.45 + 0.4 * i / DISTRICTS} for i, name in enumerate(names)}
+    start = time.perf_counter()
+    table = generate_fields(conditions, count // DISTRICTS, seed=7)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    records = table.records(slice(None))
+    pune = records[table.district_slice("Pune")]
+    _, old_overview = timed(lambda: scan_overview(pune))
+    _, new_overview = timed(lambda: table.district_summary("Pune"))
+    _, page = timed(lambda: table.records(slice(0, DEFAULT_PAGE_SIZE)))
+    old_hits, old_bbox = timed(lambda: scan_bbox(records, BBOX), repeats=3)
+    hits, new_bbox = timed(lambda: table.query(bbox=BBOX))
+    polygon_hits, new_polygon = timed(lambda: table.query(polygon=POLYGON))
+
+    brute = np.flatnonzero((table.lng >= BBOX[0]) & (table.lng <= BBOX[2]) & (table.lat >= BBOX[1]) & (table.lat <= BBOX[3]))
+    assert len(old_hits) == len(hits) and np.array_equal(brute, hits)
+    print(f"{count:>9,} fields | build {build_ms:7.1f} ms | district overview {old_overview:8.3f} -> {new_overview:6.3f} ms | "
+          f"page of {DEFAULT_PAGE_SIZE} {page:5.2f} ms | bbox ({len(hits):,}) {old_bbox:8.2f} -> {new_bbox:6.3f} ms | "
+          f"polygon ({len(polygon_hits):,}) {new_polygon:6.3f} ms")
+
+
+if __name__ == "__main__":
+    counts = [int(arg) for arg in sys.argv[1:]] or [100_000, 1_000_000]
+    print(f"📊 Field store: {DISTRICTS} districts, scan of field dicts -> columnar store with grid index")
+    for count in counts:
+        run(count)
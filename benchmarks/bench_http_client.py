@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-request httpx.AsyncClient vs the shared pooled client
+
+Runs a local stub weather server (HTTP/1.1 keep-alive, plain and TLS with a
+throwaway self-signed certificate when openssl is available) and times N
+weather calls the way get_live_weather used to make them (new client per
+call) and through http_client.OutboundHTTP, sequentially and in concurrent
+bursts. Reports p50/p99 latency per call.
+Usage: python benchmarks/bench_http_client.py [requests]
+"""
+
+import asyncio
+import json
+import os
+import shutil
+import ssl
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from http_client import OutboundHTTP
+
+STUB_RESPONSE = json.dumps({
+    "location": {"name": "Ludhiana", "region": "Punjab"},
+    "current": {"temp_c": 31.0, "humidity": 58, "precip_mm": 0.0, "wind_kph": 9.4,
+                "condition": {"text": "Sunny"}, "uv": 7.0, "pressure_mb": 1004.0}
+}).encode()
+CONCURRENCY = 20
+
+
+class StubWeatherHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(STUB_RESPONSE)))
+        self.end_headers()
+        self.wfile.write(STUB_RESPONSE)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_stub_server(cert_dir=None):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubWeatherHandler)
+    server.daemon_threads = True
+    scheme = "http"
+    if cert_dir:
+        context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        context.load_cert_chain(os.path.join(cert_dir, "cert.pem"), os.path.join(cert_dir, "key.pem"))
+        server.socket = context.wrap_socket(server.socket, server_side=True)
+        scheme = "https"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"{scheme}://localhost:{server.server_address[1]}/v1/current.json"
+
+
+def make_certificate(directory):
+    """Self-signed localhost certificate, or None when openssl is unavailable"""
+    if not shutil.which("openssl"):
+        return None
+    subprocess.run([
+        "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+        "-keyout", os.path.join(directory, "key.pem"), "-out", os.path.join(directory, "cert.pem"),
+        "-subj", "/CN=localhost", "-addext", "subjectAltName=DNS:localhost"
+    ], check=True, capture_output=True)
+    return directory
+
+
+async def per_request_client(url, verify):
+    start = time.perf_counter()
+    async with httpx.AsyncClient(verify=verify) as client:
+        (await client.get(url, params={"q": "Ludhiana"})).json()
+    return time.perf_counter() - start
+
+
+async def pooled_client(outbound, url):
+    start = time.perf_counter()
+    (await outbound.get(url, params={"q": "Ludhiana"})).json()
+    return time.perf_counter() - start
+
+
+async def measure(call, count, concurrency):
+    latencies = []
+    for offset in range(0, count, concurrency):
+        latencies += await asyncio.gather(*(call() for _ in range(min(concurrency, count - offset))))
+    return sorted(latencies)
+
+
+def percentile(sorted_values, q):
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))] * 1000
+
+
+async def run(label, url, verify, count):
+    outbound = OutboundHTTP(verify=verify)
+    outbound.open()
+    try:
+        await pooled_client(outbound, url)  # open the first pooled connection
+        for concurrency in (1, CONCURRENCY):
+            before = await measure(lambda: per_request_client(url, verify), count, concurrency)
+            after = await measure(lambda: pooled_client(outbound, url), count, concurrency)
+            print(f"{label:<5} x{concurrency:<3} | per-request client p50 {percentile(before, .5):7.2f} ms "
+                  f"p99 {percentile(before, .99):7.2f} ms | pooled p50 {percentile(after, .5):6.2f} ms "
+                  f"p99 {percentile(after, .99):6.2f} ms | p50 speedup {percentile(before, .5) / percentile(after, .5):5.1f}x")
+    finally:
+        await outbound.close()
+
+
+async def main(count):
+    server, url = start_stub_server()
+    await run("http", url, True, count)
+    server.shutdown()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cert_dir = make_certificate(tmp)
+        if cert_dir is None:
+            print("⚠️  openssl not found; skipping the TLS run")
+            return
+        server, url = start_stub_server(cert_dir)
+        await run("https", url, os.path.join(cert_dir, "cert.pem"), count)
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    print(f"📊 Outbound HTTP: new client per request vs pooled keep-alive client ({count} calls, stub server)")
+    asyncio.run(main(count))
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark: full basic re-simulation vs incremental condition updates
+
+Loads N rules over D synthetic districts, then applies hourly-feed style
+updates (one district's rainfall or temperature) through
+IncrementalSimulation.update_conditions and compares the per-update cost with
+re-evaluating every rule (what /simulate did on every call). Totals are
+checked against a full rebuild at the end.
+Usage: python benchmarks/bench_incremental_simulation.py [rule counts...]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from incremental_simulation import IncrementalSimulation
+from rule_engine import compile_condition
+from rule_store import RuleRepository
+from simulation_kernel import DistrictColumns
+from storage import RuleChanges
+
+DISTRICTS = 300
+UPDATES = 500
+
+
+def make_conditions(rng):
+    return {
+        f"District {i}": {
+            "rainfall": rng.randint(20, 160), "temperature": rng.randint(22, 46), "farmers": rng.randint(2000, 20000),
+            "soil_health": {"ph": round(rng.uniform(5.5, 8.0), 1), "nitrogen": "medium", "phosphorus": "low"},
+            "crop_ndvi": round(rng.uniform(0.3, 0.9), 2), "ekyc_completion_rate": 0.4, "payment_delays": 0.5,
+            "amount_adequacy": 0.45, "digital_literacy": 0.5, "biometric_failure_rate": 0.1,
+            "beneficiary_exclusion_errors": 0.15,
+        } for i in range(DISTRICTS)
+    }
+
+
+def make_rules(count, districts, rng):
+    templates = [
+        lambda: f"rainfall < {rng.randint(30, 150)}",
+        lambda: f"temperature > {rng.randint(25, 45)}",
+        lambda: f"crop_ndvi < {rng.choice([0.4, 0.5, 0.6])}",
+        lambda: f"temperature > {rng.randint(30, 40)} and rainfall < {rng.choice([50, 75])}",
+    ]
+    rules = []
+    for i in range(count):
+        condition = rng.choice(templates)()
+        rules.append({"id": i + 1, "schemeName": f"Scheme {i % 50}", "condition": condition,
+                      "amount": rng.choice([2000, 5000, 10000]), "district": rng.choice(districts),
+                      "predicate": compile_condition(condition)})
+    return rules
+
+
+def run(count):
+    rng = random.Random(9)
+    conditions = make_conditions(rng)
+    repository = RuleRepository(DistrictColumns(conditions))
+    repository.apply_changes(RuleChanges(1, make_rules(count, list(conditions), rng), [], True))
+    engine = IncrementalSimulation(conditions, repository, rng=random.Random(1))
+
+    start = time.perf_counter()
+    engine.rebuild()
+    full_time = time.perf_counter() - start
+
+    pairs = 0
+    start = time.perf_counter()
+    for _ in range(UPDATES):
+        district = rng.choice(list(conditions))
+        metric, low, high = rng.choice([("rainfall", 20, 160), ("temperature", 22, 46)])
+        engine.update_conditions(district, {**conditions[district], metric: rng.randint(low, high)})
+        pairs += engine.last_update["pairs_evaluated"]
+    update_time = (time.perf_counter() - start) / UPDATES
+
+    incremental_totals = dict(engine.totals)
+    draws = {rule_id: entry["draw"] for rule_id, entry in engine._triggered.items()}
+    check = IncrementalSimulation(conditions, repository, rng=random.Random(1))
+    check.rebuild()
+    assert set(check._triggered) == set(draws), "incremental trigger state differs from a full rebuild"
+    assert incremental_totals["rules"] == check.totals["rules"]
+
+    print(f"{count:>10,} rules | full re-simulation {full_time * 1000:9.2f} ms | incremental update "
+          f"{update_time * 1000:7.3f} ms ({pairs / UPDATES:7.1f} pairs re-evaluated) | "
+          f"speedup {full_time / update_time:8.1f}x")
+
+
+if __name__ == "__main__":
+    counts = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    print(f"📊 Basic simulation: full re-evaluation vs incremental updates ({DISTRICTS} districts, {UPDATES} updates)")
+    for count in counts:
+        run(count)
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark: disbursement ledger writes, inclusion proofs and verification
+
+Appends N disbursement entries the way simulations do (calls of 1,000
+entries), with Merkle batches of LEDGER_BATCH_SIZE against one batch (root +
+chained header) per entry. Then generates and verifies inclusion proofs for
+random entries, against an auditor rescanning the ledger: reading every
+entry and rebuilding every batch root.
+Usage: python benchmarks/bench_ledger.py [entry counts...]
+"""
+
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ledger import DEFAULT_BATCH_SIZE, DisbursementLedger, encode_entry, leaf_hash, merkle_levels, verify_proof
+
+CALL_SIZE = 1000
+PROOFS = 2000
+
+
+def entries(count, rng):
+    for i in range(count):
+        yield {"simulation_id": i // CALL_SIZE, "simulation_type": "basic", "timestamp": "2025-06-01T10:00:00",
+               "rule_id": rng.randrange(500_000), "schemeName": "PM-KISAN", "district": f"District {rng.randrange(700)}",
+               "amount": 6000, "eligibleFarmers": rng.randrange(100, 5000), "totalPayout": rng.randrange(10**6, 10**8)}
+
+
+def append_rate(directory, count, batch_size, fsync):
+    ledger = DisbursementLedger(directory, batch_size=batch_size, fsync=fsync)
+    ledger.open()
+    rows = list(entries(count, random.Random(3)))
+    start = time.perf_counter()
+    for i in range(0, count, CALL_SIZE):
+        ledger.append(rows[i:i + CALL_SIZE])
+    elapsed = time.perf_counter() - start
+    return ledger, count / elapsed
+
+
+def rescan(ledger):
+    """What an auditor without proofs does: every entry re-read, every batch root rebuilt"""
+    start = time.perf_counter()
+    for number in range(ledger.head()["batches"]):
+        batch = ledger.batch(number)
+        leaves = [leaf_hash(encode_entry(ledger.entry(seq))) for seq in range(batch["first_entry"], batch["first_entry"] + batch["entries"])]
+        assert merkle_levels(leaves)[-1][0].hex() == batch["merkle_root"]
+    return time.perf_counter() - start
+
+
+def run(count, root):
+    batched_dir, single_dir = os.path.join(root, f"batched-{count}"), os.path.join(root, f"single-{count}")
+    ledger, batched = append_rate(batched_dir, count, DEFAULT_BATCH_SIZE, fsync=True)
+    single_count = min(count, 50_000)
+    _, single = append_rate(single_dir, single_count, 1, fsync=True)
+
+    rng = random.Random(7)
+    picks = [rng.randrange(count) for _ in range(PROOFS)]
+    start = time.perf_counter()
+    proofs = [ledger.proof(seq) for seq in picks]
+    proof_us = (time.perf_counter() - start) / PROOFS * 1e6
+    start = time.perf_counter()
+    assert all(all(verify_proof(proof).values()) for proof in proofs)
+    verify_us = (time.perf_counter() - start) / PROOFS * 1e6
+    scan = rescan(ledger)
+    size = sum(os.path.getsize(os.path.join(batched_dir, name)) for name in os.listdir(batched_dir))
+    print(f"{count:>9,} entries | append {batched:9,.0f} entries/s batched vs {single:7,.0f} one root per entry | "
+          f"proof {proof_us:5.0f} µs ({len(proofs[0]['path'])} hashes), verify {verify_us:4.0f} µs | "
+          f"full rescan {scan:6.2f} s | {size / count:4.0f} bytes/entry on disk")
+    ledger.close()
+
+
+if __name__ == "__main__":
+    counts = [int(arg) for arg in sys.argv[1:]] or [100_000, 1_000_000]
+    print("📊 Disbursement ledger: Merkle-batched appends, O(log n) inclusion proofs vs full rescan")
+    root = tempfile.mkdtemp(prefix="ledger-bench-")
+    try:
+        for count in counts:
+            run(count, root)
+    finally:
+        shutil.rmtree(root)
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Monte Carlo payout distribution throughput
+
+Builds a realistic-simulation model from synthetic rules (the rule set of
+bench_incremental_simulation over DISTRICTS districts), then runs N trials
+with 1 worker and with the process pool, checks that both give identical
+quantiles for the same seed, and reports trials per second.
+Usage: python benchmarks/bench_monte_carlo.py [trials] [workers]
+"""
+
+import asyncio
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_incremental_simulation import make_conditions, make_rules
+from monte_carlo import MonteCarloEngine, PayoutModel
+from rule_store import RuleRepository
+from simulation_kernel import DistrictColumns, run_realistic_kernel
+from storage import RuleChanges
+
+import bench_incremental_simulation
+
+DISTRICTS = 30
+RULES = 10_000
+SEED = 11
+
+
+def build_model():
+    bench_incremental_simulation.DISTRICTS = DISTRICTS
+    rng = random.Random(9)
+    conditions = make_conditions(rng)
+    districts = DistrictColumns(conditions)
+    repository = RuleRepository(districts)
+    repository.apply_changes(RuleChanges(1, make_rules(RULES, list(conditions), rng), [], True))
+    result = run_realistic_kernel(repository.columns, districts)
+    return PayoutModel(result, repository.columns, districts), int(result.payout.sum())
+
+
+async def run(model, trials, workers):
+    engine = MonteCarloEngine(workers=workers)
+    engine.open()
+    try:
+        if workers > 1:
+            await engine.run(model, workers, SEED)  # let the spawned workers finish booting
+        return await engine.run(model, trials, SEED)
+    finally:
+        engine.close()
+
+
+if __name__ == "__main__":
+    trials = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+    model, point = build_model()
+    print(f"📊 Monte Carlo payouts: {trials:,} trials, {RULES:,} rules, {len(model.schemes)} schemes "
+          f"over {DISTRICTS} districts")
+    results = {}
+    for count in sorted({1, workers}):
+        out = asyncio.run(run(model, trials, count))
+        results[count] = out
+        print(f"{count:>2} worker(s) | {out['duration_ms'] / 1000:6.2f} s | {trials / out['duration_ms'] * 1000:12,.0f} trials/s "
+              f"| total mean {out['total']['mean']:,} (point estimate {point:,}) p50 {out['total']['p50']:,} "
+              f"p90 {out['total']['p90']:,} p99 {out['total']['p99']:,}")
+    first, last = results[1], results[max(results)]
+    print(f"identical quantiles across worker counts: {first['schemes'] == last['schemes'] and first['districts'] == last['districts']}")
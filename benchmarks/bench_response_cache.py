@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark: requests/s for large mostly-static endpoints, before and after
+the pre-serialized response cache
+
+"before" mounts the original handlers: the view is rebuilt and serialized
+by FastAPI's default JSONResponse on every call (gzip left to a proxy,
+so not counted). "after" hits the real routes: pre-encoded bytes served
+as is, the gzip variant, and 304s for dashboards that send their ETag.
+Requests go through the ASGI app in-process.
+Usage: python benchmarks/bench_response_cache.py [requests]
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["RULES_DB_PATH"] = os.path.join(tempfile.mkdtemp(), "bench_responses.db")
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+
+import main
+
+ENDPOINTS = {
+    "/research-insights": main.build_research_insights,
+    "/analytics/districts": main.build_district_analytics,
+    "/dashboard/efficiency": main.build_efficiency_dashboard,
+}
+
+
+def baseline_app():
+    """The endpoints as they were: build per request, default JSON encoder"""
+    app = FastAPI(default_response_class=JSONResponse)
+
+    def route(build):
+        async def handler():
+            main.derived_metrics.invalidate()  # nothing memoized
+            return build()
+        return handler
+
+    for path, build in ENDPOINTS.items():
+        app.get(path)(route(build))
+    return app
+
+
+async def rps(app, path, count, headers=None):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        response = await client.get(path, headers=headers)
+        etag = response.headers.get("etag")
+        if headers and "If-None-Match" in headers:
+            headers = {**headers, "If-None-Match": etag}
+        started = time.perf_counter()
+        for _ in range(count):
+            response = await client.get(path, headers=headers)
+        elapsed = time.perf_counter() - started
+    return count / elapsed, response.num_bytes_downloaded
+
+
+async def bench(count):
+    before = baseline_app()
+    async with main.lifespan(main.app):
+        for path in ENDPOINTS:
+            rows = [
+                ("before", await rps(before, path, count, {"Accept-Encoding": "identity"})),
+                ("cached", await rps(main.app, path, count, {"Accept-Encoding": "identity"})),
+                ("cached gzip", await rps(main.app, path, count, {"Accept-Encoding": "gzip"})),
+                ("304", await rps(main.app, path, count, {"Accept-Encoding": "gzip", "If-None-Match": ""})),
+            ]
+            base = rows[0][1][0]
+            print(path)
+            for label, (rate, size) in rows:
+                print(f"  {label:<12} {rate:9,.0f} req/s ({rate / base:4.1f}x) | {size:6,} bytes on the wire")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    encoder = "orjson" if main.orjson else "json"
+    print(f"📊 Pre-serialized responses ({encoder}): {count} requests per mode")
+    asyncio.run(bench(count))
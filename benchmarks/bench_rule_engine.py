@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark: legacy per-request condition parsing vs precompiled predicates
+
+Compares the string-splitting if/elif chain that /simulate used to run on
+every rule with evaluating predicates compiled once by rule_engine.
+Usage: python benchmarks/bench_rule_engine.py [rule counts...]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rule_engine import compile_condition
+
+DISTRICTS = {
+    "Ahmedabad": {"rainfall": 60, "temperature": 35, "crop_ndvi": 0.65, "soil_health": {"ph": 7.2}},
+    "Pune": {"rainfall": 85, "temperature": 32, "crop_ndvi": 0.78, "soil_health": {"ph": 6.8}},
+    "Bengaluru": {"rainfall": 45, "temperature": 28, "crop_ndvi": 0.52, "soil_health": {"ph": 6.5}},
+    "Chennai": {"rainfall": 120, "temperature": 38, "crop_ndvi": 0.82, "soil_health": {"ph": 7.8}},
+    "Mumbai": {"rainfall": 95, "temperature": 34, "crop_ndvi": 0.75, "soil_health": {"ph": 7.0}},
+    "Delhi": {"rainfall": 40, "temperature": 42, "crop_ndvi": 0.48, "soil_health": {"ph": 8.2}},
+}
+
+
+def make_rules(count, seed=42):
+    rng = random.Random(seed)
+    templates = [
+        lambda: f"rainfall < {rng.randint(30, 150)}",
+        lambda: f"rainfall > {rng.randint(30, 150)}",
+        lambda: f"temperature > {rng.randint(25, 45)}",
+        lambda: f"crop_ndvi < {rng.choice([0.4, 0.5, 0.6, 0.7])}",
+    ]
+    names = list(DISTRICTS)
+    return [
+        {"condition": rng.choice(templates)(), "district": rng.choice(names), "amount": 5000}
+        for _ in range(count)
+    ]
+
+
+def legacy_evaluate(rule):
+    """The string-parsing chain previously duplicated in run_simulation/run_realistic_simulation"""
+    condition = rule["condition"].lower()
+    district_data = DISTRICTS[rule["district"]]
+    rainfall = district_data["rainfall"]
+    temperature = district_data["temperature"]
+    if "rainfall" in condition:
+        if "<" in condition:
+            return rainfall < int(condition.split("<")[1].strip())
+        elif ">" in condition:
+            return rainfall > int(condition.split(">")[1].strip())
+    elif "temperature" in condition:
+        if "<" in condition:
+            return temperature < int(condition.split("<")[1].strip())
+        elif ">" in condition:
+            return temperature > int(condition.split(">")[1].strip())
+    elif "crop_ndvi" in condition or "ndvi" in condition:
+        if "<" in condition:
+            return district_data["crop_ndvi"] < float(condition.split("<")[1].strip())
+        elif ">" in condition:
+            return district_data["crop_ndvi"] > float(condition.split(">")[1].strip())
+    return False
+
+
+def run(count):
+    rules = make_rules(count)
+
+    start = time.perf_counter()
+    legacy_hits = sum(1 for rule in rules if legacy_evaluate(rule))
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for rule in rules:
+        rule["predicate"] = compile_condition(rule["condition"])
+    compile_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    compiled_hits = sum(1 for rule in rules if rule["predicate"].evaluate(DISTRICTS[rule["district"]]))
+    compiled_time = time.perf_counter() - start
+
+    assert legacy_hits == compiled_hits, (legacy_hits, compiled_hits)
+    print(f"{count:>10,} rules | legacy {legacy_time * 1000:9.1f} ms | "
+          f"compiled {compiled_time * 1000:9.1f} ms (one-time compile {compile_time * 1000:8.1f} ms) | "
+          f"speedup {legacy_time / compiled_time:5.2f}x | triggered {compiled_hits:,}")
+
+
+if __name__ == "__main__":
+    counts = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    print("📊 Rule condition evaluation: legacy parsing vs compiled predicates")
+    for count in counts:
+        run(count)
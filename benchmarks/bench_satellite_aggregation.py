@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark: satellite statistics in one pass vs one list comprehension per figure
+
+The realtime and subsidy-analysis endpoints used to walk the field dicts
+once per figure: health levels, stress flags (water twice, nutrient three
+times), NDVI thresholds and area sums. This times that against a single
+Python loop over the same dicts, and against the store's single vectorized
+pass over the columns (field_store.aggregate, one joint histogram that
+every figure is read from). All three must agree.
+Usage: python benchmarks/bench_satellite_aggregation.py [field counts...]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from field_store import aggregate, generate_fields, summarize
+
+LEVELS = ("excellent", "good", "moderate", "poor")
+
+
+def multi_pass(fields):
+    """The figures the two endpoints computed, the way they computed them"""
+    figures = {
+        "fields": len(fields),
+        "area": sum(f["area_hectares"] for f in fields),
+        "ndvi_sum": sum(f["ndvi"] for f in fields),
+        "health": [len([f for f in fields if f["health_status"] == level]) for level in LEVELS],
+        "water": len([f for f in fields if f["stress_indicators"]["water_stress"]]),
+        "nutrient": len([f for f in fields if f["stress_indicators"]["nutrient_deficiency"]]),
+        "severe": len([f for f in fields if f["ndvi"] < 0.4]),
+    }
+    critical = [f for f in fields if f["ndvi"] < 0.5]
+    moderate = [f for f in fields if 0.5 <= f["ndvi"] < 0.6]
+    figures["healthy"] = len([f for f in fields if f["ndvi"] >= 0.6])
+    figures["water"] = len([f for f in fields if f["stress_indicators"]["water_stress"]])
+    nutrient = [f for f in fields if f["stress_indicators"]["nutrient_deficiency"]]
+    water = [f for f in fields if f["stress_indicators"]["water_stress"]]
+    figures.update(critical=len(critical), moderate=len(moderate), nutrient=len(nutrient),
+                   critical_area=sum(f["area_hectares"] for f in critical),
+                   nutrient_area=sum(f["area_hectares"] for f in nutrient),
+                   water_area=sum(f["area_hectares"] for f in water))
+    return figures
+
+
+def single_pass(fields):
+    """Every figure accumulated in one loop over the dicts"""
+    figures = dict.fromkeys(("area", "ndvi_sum", "critical_area", "nutrient_area", "water_area"), 0.0)
+    figures.update(dict.fromkeys(("water", "nutrient", "severe", "critical", "moderate", "healthy"), 0))
+    health = dict.fromkeys(LEVELS, 0)
+    for f in fields:
+        ndvi, area, stress = f["ndvi"], f["area_hectares"], f["stress_indicators"]
+        figures["area"] += area
+        figures["ndvi_sum"] += ndvi
+        health[f["health_status"]] += 1
+        if ndvi < 0.5:
+            figures["critical"] += 1
+            figures["critical_area"] += area
+            if ndvi < 0.4:
+                figures["severe"] += 1
+        elif ndvi < 0.6:
+            figures["moderate"] += 1
+        else:
+            figures["healthy"] += 1
+        if stress["water_stress"]:
+            figures["water"] += 1
+            figures["water_area"] += area
+        if stress["nutrient_deficiency"]:
+            figures["nutrient"] += 1
+            figures["nutrient_area"] += area
+    figures["fields"] = len(fields)
+    figures["health"] = [health[level] for level in LEVELS]
+    return figures
+
+
+def vectorized(table):
+    summary = summarize(aggregate(table.ndvi, table.area, table.stress, table.district, 1))
+    bands, stress_area = summary["ndvi_bands"], summary["stress_area_hectares"]
+    return {
+        "fields": summary["fields"], "area": summary["area_hectares"], "health": list(summary["health_distribution"].values()),
+        "water": summary["stress"]["water_stress"], "nutrient": summary["stress"]["nutrient_deficiency"],
+        "severe": summary["severe_fields"], "critical": summary["critical_fields"],
+        "moderate": bands["moderate_stress"]["fields"], "healthy": bands["healthy"]["fields"],
+        "critical_area": bands["severe"]["area_hectares"] + bands["critical"]["area_hectares"],
+        "nutrient_area": stress_area["nutrient_deficiency"], "water_area": stress_area["water_stress"],
+    }
+
+
+def timed(function, *args):
+    repeats = 3
+    start = time.perf_counter()
+    for _ in range(repeats):
+        result = function(*args)
+    return result, (time.perf_counter() - start) / repeats * 1000
+
+
+def run(count):
+    table = generate_fields({"Benchmark": {"crop_ndvi": 0.55}}, count, seed=11)
+    fields = table.records(slice(None))
+    old, old_ms = timed(multi_pass, fields)
+    loop, loop_ms = timed(single_pass, fields)
+    new, new_ms = timed(vectorized, table)
+    for key, value in new.items():
+        for other in (old, loop):
+            assert abs(other[key] - value) < 0.02 if isinstance(value, float) else other[key] == value, key
+    print(f"{count:>9,} fields | {old_ms:9.1f} ms one pass per figure | {loop_ms:8.1f} ms single loop "
+          f"({old_ms / loop_ms:4.1f}x) | {new_ms:7.2f} ms vectorized columns ({old_ms / new_ms:6.0f}x)")
+
+
+if __name__ == "__main__":
+    counts = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    print("📊 Satellite field statistics: multi-pass list comprehensions vs single pass")
+    for count in counts:
+        run(count)
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark: scalar realistic-simulation loop vs the vectorized NumPy kernel
+
+The scalar reference is the per-rule loop run_realistic_simulation used
+before the kernel (compiled predicates, one TriggeredSubsidy per hit).
+Results are checked for exact equality before timings are reported.
+Usage: python benchmarks/bench_simulation_kernel.py [rule counts...]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import MOCK_CONDITIONS, TriggeredSubsidy
+from rule_engine import compile_condition
+from simulation_kernel import DistrictColumns, RuleColumns, run_realistic_kernel
+
+
+def make_rules(count, seed=7):
+    rng = random.Random(seed)
+    templates = [
+        lambda: f"rainfall < {rng.randint(30, 150)}",
+        lambda: f"rainfall > {rng.randint(30, 150)}",
+        lambda: f"temperature > {rng.randint(25, 45)}",
+        lambda: f"crop_ndvi < {rng.choice([0.4, 0.5, 0.6, 0.7])}",
+        lambda: f"temperature > {rng.randint(30, 40)} and rainfall < {rng.choice([50, 75])}",
+    ]
+    districts = list(MOCK_CONDITIONS) + ["Ludhiana"]
+    rules = []
+    for i in range(count):
+        condition = rng.choice(templates)()
+        rules.append({
+            "id": i + 1,
+            "schemeName": f"Scheme {i % 50}",
+            "condition": condition,
+            "amount": rng.choice([2000, 3000, 5000, 7500, 10000]),
+            "district": rng.choice(districts),
+            "predicate": compile_condition(condition),
+        })
+    return rules
+
+
+def scalar_reference(rules):
+    """Per-rule loop previously used by run_realistic_simulation"""
+    triggered = []
+    for rule in rules:
+        district = rule["district"]
+        if district not in MOCK_CONDITIONS:
+            continue
+        district_data = MOCK_CONDITIONS[district]
+        if not rule["predicate"].evaluate(district_data):
+            continue
+        total_farmers = district_data["farmers"]
+        payment_reliability = 1 - district_data["payment_delays"]
+        eligible_after_ekyc = int(total_farmers * 0.25 * district_data["ekyc_completion_rate"])
+        eligible_after_biometric = int(eligible_after_ekyc * (1 - district_data["biometric_failure_rate"]))
+        eligible_after_exclusion = int(eligible_after_biometric * (1 - district_data["beneficiary_exclusion_errors"]))
+        final_eligible = int(eligible_after_exclusion * (0.7 + 0.3 * district_data["digital_literacy"]))
+        effective_amount = rule["amount"] * (0.6 + 0.4 * district_data["amount_adequacy"])
+        timing_effectiveness = 0.8 if payment_reliability > 0.6 else 0.6
+        triggered.append(TriggeredSubsidy(
+            schemeName=rule["schemeName"],
+            condition=rule["condition"],
+            amount=rule["amount"],
+            district=district,
+            eligibleFarmers=final_eligible,
+            totalPayout=int(final_eligible * effective_amount * timing_effectiveness)
+        ))
+    return triggered
+
+
+def run(count):
+    rules = make_rules(count)
+    districts = DistrictColumns(MOCK_CONDITIONS)
+
+    start = time.perf_counter()
+    reference = scalar_reference(rules)
+    scalar_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    columns = RuleColumns.from_rules(rules, districts)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = run_realistic_kernel(columns, districts)
+    kernel_time = time.perf_counter() - start
+
+    expected = [(s.eligibleFarmers, s.totalPayout) for s in reference]
+    actual = list(zip(result.eligible.tolist(), result.payout.tolist()))
+    assert expected == actual, "kernel results differ from the scalar loop"
+
+    print(f"{count:>10,} rules | scalar {scalar_time * 1000:9.1f} ms | kernel {kernel_time * 1000:7.2f} ms "
+          f"(column build {build_time * 1000:8.1f} ms) | speedup {scalar_time / kernel_time:7.1f}x | "
+          f"triggered {len(actual):,} | payout ₹{int(result.payout.sum()):,}")
+
+
+if __name__ == "__main__":
+    counts = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    print("📊 Realistic simulation: scalar loop vs vectorized kernel (results verified identical)")
+    for count in counts:
+        run(count)
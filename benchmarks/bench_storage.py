@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Benchmark: SQLite bulk rule import and worker warm-up
+
+Bulk-loads N rules through RuleStorage (WAL, batched executemany), then times
+a fresh worker replaying the store into an in-memory RuleRepository, and a
+single-row insert for comparison.
+Usage: python benchmarks/bench_storage.py [rule counts...]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import MOCK_CONDITIONS
+from rule_store import RuleRepository
+from simulation_kernel import DistrictColumns
+from storage import RuleStorage
+
+
+def rule_rows(count, seed=11):
+    rng = random.Random(seed)
+    districts = list(MOCK_CONDITIONS)
+    for i in range(count):
+        metric, low, high = rng.choice([("rainfall", 30, 150), ("temperature", 25, 45)])
+        yield (f"Scheme {i % 100}", f"{metric} {rng.choice('<>')} {rng.randint(low, high)}",
+               rng.choice([2000, 5000, 10000]), rng.choice(districts))
+
+
+def run(count):
+    rows = list(rule_rows(count))
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = RuleStorage(os.path.join(tmp, "rules.db"))
+        storage.open()
+        try:
+            start = time.perf_counter()
+            inserted = storage.bulk_insert_rules_sync(rows)
+            import_time = time.perf_counter() - start
+
+            repository = RuleRepository(DistrictColumns(MOCK_CONDITIONS))
+            start = time.perf_counter()
+            repository.apply_changes(storage.rule_changes_since_sync(0, full=True))
+            load_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for _ in range(200):
+                storage.insert_rule_sync("Single", "rainfall < 75", 5000, "Pune")
+            single_time = (time.perf_counter() - start) / 200
+        finally:
+            storage.close()
+
+    print(f"{count:>10,} rules | bulk import {import_time:6.2f} s ({inserted / import_time:>11,.0f} rules/s) | "
+          f"worker warm-up {load_time:6.2f} s ({len(repository):,} rules indexed) | "
+          f"single insert {single_time * 1e6:7.1f} µs")
+
+
+if __name__ == "__main__":
+    counts = [int(arg) for arg in sys.argv[1:]] or [100_000, 1_000_000, 2_000_000]
+    print("📊 SQLite rule storage: bulk import throughput and worker warm-up")
+    for count in counts:
+        run(count)
@@ -0,0 +1,67 @@
+"""
+Streaming parsers for bulk rule uploads (NDJSON or CSV).
+
+Request bodies are consumed chunk by chunk and decoded incrementally, so an
+upload of several hundred thousand rules never has to be held in memory.
+Each line is one rule; CSV uploads start with a header row naming the
+fields (schemeName, condition, amount, district).
+"""
+
+import codecs
+import csv
+import json
+from typing import AsyncIterator, Optional, Tuple
+
+BULK_FORMATS = ("ndjson", "csv")
+
+
+def detect_format(content_type: str, requested: Optional[str] = None) -> str:
+    """Pick the upload format from an explicit ?format= or the Content-Type header"""
+    if requested:
+        requested = requested.lower()
+        if requested not in BULK_FORMATS:
+            raise ValueError(f"Unsupported format '{requested}', expected one of {', '.join(BULK_FORMATS)}")
+        return requested
+    return "csv" if "csv" in (content_type or "").lower() else "ndjson"
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Yield decoded lines from a byte stream without buffering the whole body"""
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        lines = pending.split("\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+async def iter_records(chunks: AsyncIterator[bytes], fmt: str) -> AsyncIterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """Yield (row_number, record, error) for every non-blank data row"""
+    header = None
+    row_number = 0
+    async for line in iter_lines(chunks):
+        if not line.strip():
+            continue
+        if fmt == "csv" and header is None:
+            header = [name.strip() for name in next(csv.reader([line]))]
+            continue
+        row_number += 1
+        try:
+            if fmt == "csv":
+                values = next(csv.reader([line]))
+                if len(values) != len(header):
+                    raise ValueError(f"expected {len(header)} columns, got {len(values)}")
+                record = dict(zip(header, values))
+            else:
+                record = json.loads(line)
+                if not isinstance(record, dict):
+                    raise ValueError("each line must be a JSON object")
+        except (ValueError, csv.Error) as e:
+            yield row_number, None, str(e)
+            continue
+        yield row_number, record, None
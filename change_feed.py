@@ -0,0 +1,119 @@
+"""
+In-process change feed for server-sent events.
+
+Events get increasing numbers and are pre-encoded as SSE frames once,
+however many dashboards are listening. The numbers are per process, so an
+event id is ``<epoch>-<number>``, where the epoch is drawn when the feed is
+created. The last ``replay_size`` events are kept so a reconnecting
+EventSource (``Last-Event-ID``) can catch up. If the client is further
+behind than that, it gets a ``resync`` event and should refetch the full
+state. So does a client whose id has another epoch (issued by another
+worker, or by this one before a restart), or is not an id of this feed.
+
+Each subscriber has a bounded queue. A client that stops reading (slow
+network, backgrounded tab) fills its queue. It is then switched to a single
+pending ``resync`` instead of buffering without limit, so one slow dashboard
+never holds memory or slows publishers down.
+"""
+
+import asyncio
+import json
+import uuid
+from collections import deque
+from typing import Optional
+
+
+def encode_event(event_id: str, event_type: str, data: dict) -> bytes:
+    return f"id: {event_id}\nevent: {event_type}\ndata: {json.dumps(data, default=str)}\n\n".encode()
+
+
+class Subscriber:
+    """One connected client: a bounded queue of encoded frames"""
+
+    def __init__(self, feed: "ChangeFeed", queue_size: int):
+        self.feed = feed
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.overflowed = False
+
+    def offer(self, frame: bytes):
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            # Too far behind: drop the backlog and ask the client to refetch state
+            self.overflowed = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(self.feed.resync_frame("subscriber queue overflow"))
+            self.feed.stats["overflows"] += 1
+
+    async def next_frame(self, timeout: float) -> Optional[bytes]:
+        """Next frame, or None if nothing arrived within ``timeout`` (time for a heartbeat)"""
+        try:
+            frame = await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        if self.overflowed and self.queue.empty():
+            self.overflowed = False
+        return frame
+
+
+class ChangeFeed:
+    """Fan-out of change events to SSE subscribers with a bounded replay buffer"""
+
+    def __init__(self, replay_size: int = 1024, queue_size: int = 256):
+        self.queue_size = queue_size
+        self.epoch = uuid.uuid4().hex[:12]
+        self.last_id = 0
+        self._replay = deque(maxlen=replay_size)  # (event id, encoded frame)
+        self._subscribers = set()
+        self.stats = {"published": 0, "overflows": 0, "resyncs": 0}
+
+    def __len__(self):
+        return len(self._subscribers)
+
+    def event_id(self, number: Optional[int] = None) -> str:
+        """SSE id of event ``number`` (default: the latest)"""
+        return f"{self.epoch}-{self.last_id if number is None else number}"
+
+    def parse_event_id(self, event_id: str) -> Optional[int]:
+        """Event number of an id this feed issued; None for another epoch or a malformed id"""
+        epoch, _, number = event_id.rpartition("-")
+        if epoch != self.epoch or not number.isdigit() or int(number) > self.last_id:
+            return None
+        return int(number)
+
+    def publish(self, event_type: str, data: dict) -> int:
+        self.last_id += 1
+        frame = encode_event(self.event_id(), event_type, data)
+        self._replay.append((self.last_id, frame))
+        for subscriber in self._subscribers:
+            subscriber.offer(frame)
+        self.stats["published"] += 1
+        return self.last_id
+
+    def resync_frame(self, reason: str) -> bytes:
+        self.stats["resyncs"] += 1
+        return encode_event(self.event_id(), "resync", {"reason": reason, "last_event_id": self.event_id()})
+
+    def subscribe(self, last_event_id: Optional[str] = None) -> Subscriber:
+        """Register a client; with ``last_event_id`` the missed events are replayed first"""
+        subscriber = Subscriber(self, self.queue_size)
+        last = self.parse_event_id(last_event_id) if last_event_id is not None else None
+        if last_event_id is not None and last is None:
+            # Not an id this feed issued: another worker, or before a restart
+            subscriber.offer(self.resync_frame("unknown last event id"))
+        elif last is not None and last < self.last_id:
+            oldest = self._replay[0][0] if self._replay else self.last_id + 1
+            if last + 1 < oldest:
+                subscriber.offer(self.resync_frame("replay buffer exceeded"))
+            else:
+                for number, frame in self._replay:
+                    if number > last:
+                        subscriber.offer(frame)
+        self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        self._subscribers.discard(subscriber)
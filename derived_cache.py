@@ -0,0 +1,140 @@
+"""
+Versioned cache of views derived from the district data.
+
+District analytics, risk scores and efficiency metrics are pure functions of
+the district conditions, which change far less often than dashboards ask
+for them. Each view is computed once per data version and kept both as a
+value and as an encoded JSON body with a content-hash ETag. invalidate()
+(called whenever district data changes) bumps the version and drops every
+entry. Requests whose If-None-Match matches get a bodiless 304.
+
+Bodies are encoded with orjson when it is installed. Bodies of
+COMPRESS_MIN_SIZE bytes or more also get gzip (and, with the ``brotli``
+package, br) variants. Each variant is compressed once per version, on first
+request, and served by Accept-Encoding with its own ETag. The same class,
+never invalidated, holds fully static payloads.
+"""
+
+import gzip
+import hashlib
+import json
+from typing import Callable, Optional
+
+from fastapi import Request, Response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Smaller bodies are not worth compressing (headers and framing dominate)
+COMPRESS_MIN_SIZE = 1024
+COMPRESSORS = {"gzip": lambda body: gzip.compress(body, compresslevel=9, mtime=0)}
+if brotli is not None:
+    COMPRESSORS["br"] = lambda body: brotli.compress(body, quality=11)
+# Server preference when the client accepts several encodings equally
+ENCODING_PREFERENCE = ("br", "gzip")
+
+
+def encode_json(content) -> bytes:
+    """UTF-8 JSON in the compact form FastAPI responses use; orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(content, default=str, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None,
+                      separators=(",", ":"), default=str).encode("utf-8")
+
+
+def preferred_encoding(accept_encoding: str) -> Optional[str]:
+    """Best available content coding from an Accept-Encoding header, or None for identity"""
+    accepted = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                continue
+        accepted[coding.strip().lower()] = quality
+    candidates = [coding for coding in ENCODING_PREFERENCE
+                  if coding in COMPRESSORS and accepted.get(coding, accepted.get("*", 0)) > 0]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda coding: accepted.get(coding, accepted.get("*", 0)))
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match check (weak comparison, as RFC 9110 requires for this header)"""
+    if if_none_match.strip() == "*":
+        return True
+    tags = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in tags)
+
+
+class PrecomputedResponse:
+    """Encoded body of one view version plus its compressed variants"""
+
+    __slots__ = ("body", "etag", "_variants")
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        self._variants = {}
+
+    def variant(self, encoding: Optional[str]) -> tuple:
+        """(body, ETag) for a content coding; identity if None or the body is small"""
+        if encoding is None or len(self.body) < COMPRESS_MIN_SIZE:
+            return self.body, self.etag
+        if encoding not in self._variants:
+            self._variants[encoding] = COMPRESSORS[encoding](self.body)
+        # Each representation gets its own strong ETag
+        return self._variants[encoding], f'{self.etag[:-1]}-{encoding}"'
+
+
+class DerivedCache:
+    """Derived views of versioned data, rebuilt only after the data changes"""
+
+    def __init__(self):
+        self.version = 0
+        self._values = {}
+        self._responses = {}
+        self.stats = {"builds": 0, "hits": 0, "not_modified": 0, "invalidations": 0}
+
+    def invalidate(self):
+        """District data changed: every derived view is stale"""
+        self.version += 1
+        self._values.clear()
+        self._responses.clear()
+        self.stats["invalidations"] += 1
+
+    def value(self, name: str, build: Callable[[], object]):
+        """Derived value for the current data version"""
+        if name in self._values:
+            self.stats["hits"] += 1
+            return self._values[name]
+        self.stats["builds"] += 1
+        value = self._values[name] = build()
+        return value
+
+    def response(self, request: Request, name: str, build: Callable[[], object]) -> Response:
+        """JSON response for a derived view; 304 if the client already has this version"""
+        entry = self._responses.get(name)
+        if entry is None:
+            entry = self._responses[name] = PrecomputedResponse(encode_json(self.value(name, build)))
+        else:
+            self.stats["hits"] += 1
+        encoding = preferred_encoding(request.headers.get("accept-encoding", ""))
+        body, etag = entry.variant(encoding)
+        headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and etag_matches(if_none_match, etag):
+            self.stats["not_modified"] += 1
+            return Response(status_code=304, headers=headers)
+        if body is not entry.body:
+            headers["Content-Encoding"] = encoding
+        return Response(content=body, media_type="application/json", headers=headers)
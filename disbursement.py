@@ -0,0 +1,350 @@
+"""
+Direct benefit transfer (DBT) disbursement pipeline.
+
+A triggered subsidy ends at a total payout for N eligible farmers. A
+disbursement run turns the triggered subsidies of a simulation into one
+payment instruction per farmer. Each subsidy's total payout is split evenly;
+the first (total mod N) farmers get one rupee more, so the instructions add
+up exactly. The instructions are grouped into bank files of chunk_size,
+and the files are submitted through a pool of at most `concurrency` async
+workers to a bank adapter.
+
+Instructions are never stored. A run stores its allocations (one row per
+subsidy: rule, scheme, district, eligible farmers, payout), and chunk n is
+rebuilt from them on demand: a bisect over the cumulative farmer counts
+finds the first subsidy of the chunk. Progress is checkpointed per chunk in
+SQLite (storage.RuleStorage):
+
+* a chunk is marked submitting, with its attempt count, before every call
+  to the bank, and done (or failed) with the bank's receipt afterwards;
+* a run is executed by one worker at a time, the holder of a lease renewed
+  before every submission; other workers wait for the lease to lapse;
+* a run interrupted by a crash or shutdown resumes from the chunks not yet
+  done, including the one that was in flight;
+* with a ledger (ledger.DisbursementLedger), every done chunk is appended
+  to it once, keyed by run id and chunk. Chunks done but not yet recorded
+  (a crash in between) are recorded when the run resumes.
+
+That chunk is why submission has to be idempotent. A file's id
+(run id + chunk number) and each instruction's id are fixed for the run,
+and the bank must answer a resubmitted file id with the original receipt
+instead of paying twice. Transient bank errors (BankUnavailable, timeouts)
+are retried with capped exponential backoff and jitter. Any other BankError
+fails the chunk at once.
+"""
+
+import asyncio
+import bisect
+import importlib
+import random
+import socket
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional
+
+DEFAULT_CHUNK_SIZE = 10_000
+MAX_CHUNK_SIZE = 100_000
+DEFAULT_CONCURRENCY = 4
+DEFAULT_MAX_ATTEMPTS = 5
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 30.0
+SUBMIT_TIMEOUT = 60.0
+LEASE_SECONDS = 120.0
+
+
+class BankError(Exception):
+    """The bank rejected a payment file; not retried"""
+
+
+class BankUnavailable(BankError):
+    """Transient failure (timeout, maintenance window, throttling); retried with backoff"""
+
+
+class LeaseLost(Exception):
+    """Another worker took over the run (this one stalled past its lease)"""
+
+
+def allocations_from(priced) -> List[dict]:
+    """One allocation per (rule, eligible farmers, payout) that pays anything"""
+    return [
+        {"rule_id": rule["id"], "schemeName": rule["schemeName"], "district": rule["district"],
+         "eligible": int(eligible), "payout": int(payout)}
+        for rule, eligible, payout in priced if eligible > 0 and payout > 0
+    ]
+
+
+class PaymentPlan:
+    """Per-farmer payment instructions of a run, grouped into bank files"""
+
+    def __init__(self, run_id: str, allocations: List[dict], chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.run_id = run_id
+        self.allocations = allocations
+        self.chunk_size = chunk_size
+        self.offsets = [0]
+        for allocation in allocations:
+            self.offsets.append(self.offsets[-1] + allocation["eligible"])
+        self.instructions = self.offsets[-1]
+        self.chunks = -(-self.instructions // chunk_size)
+        self.total_amount = sum(allocation["payout"] for allocation in allocations)
+
+    def file_id(self, chunk: int) -> str:
+        return f"{self.run_id}-{chunk:06d}"
+
+    def payment_file(self, chunk: int) -> dict:
+        """Bank file for one chunk, rebuilt identically on every call"""
+        if not 0 <= chunk < self.chunks:
+            raise IndexError(f"Chunk {chunk} out of range (run has {self.chunks})")
+        start = chunk * self.chunk_size
+        end = min(start + self.chunk_size, self.instructions)
+        index = bisect.bisect_right(self.offsets, start) - 1
+        instructions = []
+        while start < end:
+            allocation = self.allocations[index]
+            base, extra = divmod(allocation["payout"], allocation["eligible"])
+            first, last = start - self.offsets[index], min(end, self.offsets[index + 1]) - self.offsets[index]
+            rule_id, scheme, district = allocation["rule_id"], allocation["schemeName"], allocation["district"]
+            for farmer in range(first, last):
+                instructions.append({
+                    "instruction_id": f"{self.run_id}-{rule_id}-{farmer}",
+                    # No farmer register yet: the bank adapter resolves (rule, district, farmer n) to an account
+                    "beneficiary_ref": f"{district}/{rule_id}/{farmer}",
+                    "scheme": scheme,
+                    "district": district,
+                    "amount": base + (farmer < extra)
+                })
+            start += last - first
+            index += 1
+        return {"file_id": self.file_id(chunk), "run_id": self.run_id, "chunk": chunk,
+                "instructions": instructions, "count": len(instructions),
+                "amount": sum(instruction["amount"] for instruction in instructions)}
+
+
+class BankAdapter:
+    """Submits payment files to a bank / the DBT gateway. submit must be idempotent on file_id"""
+
+    async def submit(self, payment_file: dict) -> dict:
+        """Receipt: {"bank_reference", "accepted", "amount_accepted", "rejected": [instruction ids]}"""
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
+
+class StubBankAdapter(BankAdapter):
+    """Local stand-in: latency, transient outages and per-instruction rejections, seeded"""
+
+    def __init__(self, latency: float = 0.05, failure_rate: float = 0.05, rejection_rate: float = 0.001,
+                 seed: Optional[int] = None):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.rejection_rate = rejection_rate
+        self.rng = random.Random(seed)
+        self._receipts: Dict[str, dict] = {}
+        self.stats = {"files": 0, "replayed": 0, "outages": 0}
+
+    async def submit(self, payment_file: dict) -> dict:
+        await asyncio.sleep(self.latency)
+        receipt = self._receipts.get(payment_file["file_id"])
+        if receipt is not None:
+            self.stats["replayed"] += 1
+            return receipt
+        if self.rng.random() < self.failure_rate:
+            self.stats["outages"] += 1
+            raise BankUnavailable("stub bank unavailable")
+        rejected = [instruction for instruction in payment_file["instructions"]
+                    if self.rejection_rate and self.rng.random() < self.rejection_rate]
+        self.stats["files"] += 1
+        receipt = self._receipts[payment_file["file_id"]] = {
+            "bank_reference": f"STUB{len(self._receipts) + 1:010d}",
+            "accepted": payment_file["count"] - len(rejected),
+            "amount_accepted": payment_file["amount"] - sum(instruction["amount"] for instruction in rejected),
+            "rejected": [instruction["instruction_id"] for instruction in rejected]
+        }
+        return receipt
+
+
+def load_bank_adapter(spec: str, **stub_options) -> BankAdapter:
+    """'stub', or 'module:ClassName' for an adapter constructed without arguments"""
+    if spec == "stub":
+        return StubBankAdapter(**stub_options)
+    module_name, _, class_name = spec.partition(":")
+    if not class_name:
+        raise ValueError(f"Bank adapter must be 'stub' or 'module:ClassName', got '{spec}'")
+    return getattr(importlib.import_module(module_name), class_name)()
+
+
+class DisbursementPipeline:
+    """Runs disbursement plans against a bank adapter, checkpointed in storage"""
+
+    def __init__(self, storage, bank: BankAdapter, concurrency: int = DEFAULT_CONCURRENCY,
+                 max_attempts: int = DEFAULT_MAX_ATTEMPTS, backoff_base: float = BACKOFF_BASE,
+                 backoff_max: float = BACKOFF_MAX, submit_timeout: float = SUBMIT_TIMEOUT,
+                 lease_seconds: float = LEASE_SECONDS, ledger=None):
+        self.storage = storage
+        self.bank = bank
+        self.ledger = ledger
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.submit_timeout = submit_timeout
+        self.lease_seconds = lease_seconds
+        self.owner = f"{socket.gethostname()}:{uuid.uuid4().hex[:8]}"
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self.stats = {"files_submitted": 0, "retries": 0, "chunks_failed": 0, "chunks_recorded": 0}
+
+    async def create(self, run_id: str, simulation_type: str, allocations: List[dict],
+                     chunk_size: int = DEFAULT_CHUNK_SIZE) -> bool:
+        """Store a new run and start it; False (nothing started) if run_id exists already"""
+        plan = PaymentPlan(run_id, allocations, chunk_size)
+        created = await self.storage.create_disbursement_run(run_id, simulation_type, chunk_size, plan.instructions,
+                                                             plan.chunks, plan.total_amount, allocations)
+        if created:
+            self.start(run_id)
+        return created
+
+    def start(self, run_id: str, restart: bool = False):
+        """Execute a stored run in the background, unless this worker is already running it"""
+        task = self._tasks.get(run_id)
+        if task is None or task.done():
+            self._tasks[run_id] = asyncio.create_task(self.execute(run_id, restart))
+
+    async def resume_unfinished(self) -> List[str]:
+        """Start every run left running (by a crash or a shutdown); other workers' leases are respected"""
+        run_ids = await self.storage.unfinished_disbursement_runs()
+        for run_id in run_ids:
+            self.start(run_id)
+        return run_ids
+
+    def running(self) -> List[str]:
+        return [run_id for run_id, task in self._tasks.items() if not task.done()]
+
+    async def close(self):
+        """Stop the workers; interrupted runs stay checkpointed and resume on the next start"""
+        tasks = [task for task in self._tasks.values() if not task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await self.bank.close()
+
+    async def execute(self, run_id: str, restart: bool = False):
+        while not await self.storage.claim_disbursement_run(run_id, self.owner, self.lease_seconds, restart):
+            run = await self.storage.get_disbursement_run(run_id)
+            if run is None or run["status"] != "running":
+                return
+            # Held by another worker: wait its lease out, then take over if it was not renewed (a crash)
+            await asyncio.sleep(max(1.0, (run["lease_until"] or 0) - time.time()))
+            restart = False
+        status = None
+        try:
+            allocations = await self.storage.get_disbursement_allocations(run_id)
+            run = await self.storage.get_disbursement_run(run_id)
+            plan = PaymentPlan(run_id, allocations, run["chunk_size"])
+            for chunk in await self.storage.unrecorded_disbursement_chunks(run_id):
+                await self._record_in_ledger(plan, run["simulation_type"], chunk)
+            done = await self.storage.done_disbursement_chunks(run_id)
+            pending = asyncio.Queue()
+            for chunk in range(plan.chunks):
+                if chunk not in done:
+                    pending.put_nowait(chunk)
+            failed = []
+            workers = [asyncio.create_task(self._worker(run_id, run["simulation_type"], plan, pending, failed))
+                       for _ in range(min(self.concurrency, pending.qsize()))]
+            try:
+                await asyncio.gather(*workers)
+            finally:
+                for worker in workers:
+                    worker.cancel()
+            status = "failed" if failed else "completed"
+        except LeaseLost:
+            print(f"⚠️  Disbursement run {run_id}: lease taken over by another worker")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"❌ Disbursement run {run_id} stopped: {e!r}")
+        finally:
+            await asyncio.shield(self.storage.finish_disbursement_run(run_id, self.owner, status))
+
+    async def _worker(self, run_id: str, simulation_type: str, plan: PaymentPlan, pending: asyncio.Queue, failed: list):
+        loop = asyncio.get_running_loop()
+        while not pending.empty():
+            chunk = pending.get_nowait()
+            # Building a file of chunk_size instructions is CPU work; keep it off the event loop
+            payment_file = await loop.run_in_executor(None, plan.payment_file, chunk)
+            if await self._submit(run_id, payment_file):
+                await self._record_in_ledger(plan, simulation_type, chunk)
+            else:
+                failed.append(chunk)
+
+    async def _submit(self, run_id: str, payment_file: dict) -> bool:
+        """Submit one file until it is accepted, rejected, or out of attempts; True if accepted"""
+        chunk = payment_file["chunk"]
+        for attempt in range(1, self.max_attempts + 1):
+            if not await self.storage.claim_disbursement_run(run_id, self.owner, self.lease_seconds):
+                raise LeaseLost(run_id)
+            await self.storage.record_chunk_attempt(run_id, chunk, payment_file["count"], payment_file["amount"])
+            try:
+                receipt = await asyncio.wait_for(self.bank.submit(payment_file), self.submit_timeout)
+            except (BankUnavailable, asyncio.TimeoutError) as e:
+                error = f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+                if attempt < self.max_attempts:
+                    self.stats["retries"] += 1
+                    await asyncio.sleep(self.backoff(attempt))
+                    continue
+            except BankError as e:
+                error = f"{type(e).__name__}: {e}"
+            else:
+                self.stats["files_submitted"] += 1
+                await self.storage.record_chunk_result(run_id, chunk, "done", receipt=receipt)
+                return True
+            self.stats["chunks_failed"] += 1
+            await self.storage.record_chunk_result(run_id, chunk, "failed", error=error)
+            return False
+        return False
+
+    async def _record_in_ledger(self, plan: PaymentPlan, simulation_type: str, chunk: int):
+        """Append a done chunk to the ledger, exactly once per (run id, chunk)"""
+        if self.ledger is None:
+            return
+        run_id = plan.run_id
+        state = await self.storage.chunk_ledger_state(run_id, chunk)
+        if state is None or state["status"] != "done" or state["ledger_seq"] is not None:
+            return
+        loop = asyncio.get_running_loop()
+        if state["ledger_from"] is not None:
+            # An earlier attempt may have appended the entry before it could store where
+            seq = await loop.run_in_executor(None, self._find_in_ledger, state["ledger_from"], run_id, chunk)
+            if seq is not None:
+                await self.storage.set_chunk_ledger_seq(run_id, chunk, seq)
+                return
+        if not await self.storage.claim_disbursement_run(run_id, self.owner, self.lease_seconds):
+            raise LeaseLost(run_id)
+        await self.storage.set_chunk_ledger_from(run_id, chunk, len(self.ledger))
+        entry = {
+            "run_id": run_id,
+            "chunk": chunk,
+            "file_id": plan.file_id(chunk),
+            "simulation_type": simulation_type,
+            "bank_reference": state["bank_reference"],
+            "instructions": state["instructions"],
+            "amount": state["amount"],
+            "accepted": state["accepted"],
+            "amount_accepted": state["amount_accepted"],
+            "recorded_at": datetime.now().isoformat()
+        }
+        written = await loop.run_in_executor(None, self.ledger.append, [entry])
+        await self.storage.set_chunk_ledger_seq(run_id, chunk, written["first_entry"])
+        self.stats["chunks_recorded"] += 1
+
+    def _find_in_ledger(self, start: int, run_id: str, chunk: int) -> Optional[int]:
+        """Seq of the ledger entry of (run id, chunk) at or after start, if there is one"""
+        for seq in range(start, self.ledger.head()["entries"]):
+            entry = self.ledger.entry(seq)
+            if entry.get("run_id") == run_id and entry.get("chunk") == chunk:
+                return seq
+        return None
+
+    def backoff(self, attempt: int) -> float:
+        """Capped exponential backoff with full jitter"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
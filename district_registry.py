@@ -0,0 +1,307 @@
+"""
+District data registry.
+
+District conditions are loaded from a file into one typed column per field
+(NumPy arrays for numbers and flags, lists for labels) plus a name -> index
+map. 750 districts or 7000 sub-district blocks then cost a few arrays rather
+than thousands of nested dicts. The registry is a Mapping of district name ->
+condition record in the nested shape the rest of the app uses
+(``record["soil_health"]["ph"]``). Records are built from the columns on
+first lookup and kept until that district changes, so lookups are O(1).
+
+Sources, chosen by extension:
+  .csv               one row per district, a ``district`` column plus FIELDS
+  .db/.sqlite        the same columns in a ``districts`` table
+  .parquet           the same columns (needs pyarrow)
+Without a source the built-in default records are used.
+
+The file is read on first access, not at import. read_if_changed()
+re-reads it when its modification time or size changed, and replace() swaps
+the new table in, so updated data is picked up without a restart. A new
+table starts without the PATCHed conditions; main.sync_conditions applies
+the stored ones made after the file was written.
+"""
+
+import csv
+import os
+import sqlite3
+import threading
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Dict, Iterator, Optional
+
+import numpy as np
+
+# Flat column -> (path in the condition record, kind), in record order.
+# "number" columns are stored as floats and returned as ints when whole (rainfall 60, not 60.0)
+FIELDS = {
+    "rainfall": (("rainfall",), "number"),
+    "temperature": (("temperature",), "number"),
+    "farmers": (("farmers",), "int"),
+    "soil_ph": (("soil_health", "ph"), "float"),
+    "soil_nitrogen": (("soil_health", "nitrogen"), "str"),
+    "soil_phosphorus": (("soil_health", "phosphorus"), "str"),
+    "crop_ndvi": (("crop_ndvi",), "float"),
+    "market_price_trend": (("market_price_trend",), "str"),
+    "ekyc_completion_rate": (("ekyc_completion_rate",), "float"),
+    "payment_delays": (("payment_delays",), "float"),
+    "amount_adequacy": (("amount_adequacy",), "float"),
+    "digital_literacy": (("digital_literacy",), "float"),
+    "biometric_failure_rate": (("biometric_failure_rate",), "float"),
+    "beneficiary_exclusion_errors": (("beneficiary_exclusion_errors",), "float"),
+    "inclusion_errors": (("inclusion_errors",), "float"),
+    "agristack_integration": (("agristack_integration",), "bool"),
+    "krishi_dss_availability": (("krishi_dss_availability",), "bool"),
+}
+NAME_COLUMN = "district"
+SQLITE_TABLE = "districts"
+
+TRUE_VALUES = {"1", "true", "yes", "y", "t"}
+FALSE_VALUES = {"0", "false", "no", "n", "f", ""}
+
+
+class DistrictDataError(ValueError):
+    """The district source is missing, unreadable or does not match FIELDS"""
+
+
+def _parse_bool(value) -> bool:
+    if isinstance(value, (bool, np.bool_, int)):
+        return bool(value)
+    text = str(value).strip().lower()
+    if text not in TRUE_VALUES | FALSE_VALUES:
+        raise ValueError(f"not a boolean: {value!r}")
+    return text in TRUE_VALUES
+
+
+def _parse_column(values: list, kind: str):
+    """Typed column from raw values (strings from CSV, native values from SQLite/Parquet)"""
+    if kind == "str":
+        return ["" if value is None else str(value) for value in values]
+    if kind == "bool":
+        return np.array([_parse_bool(value) for value in values], dtype=np.bool_)
+    column = np.asarray(values, dtype=np.float64)
+    if np.isnan(column).any():
+        raise ValueError("missing value")
+    return column.astype(np.int64) if kind == "int" else column
+
+
+def _python_values(column, kind: str) -> list:
+    """Column as Python values in the record representation"""
+    if kind == "str":
+        return column
+    values = column.tolist()
+    if kind == "number":
+        return [int(value) if value.is_integer() else value for value in values]
+    return values
+
+
+class DistrictTable:
+    """One loaded snapshot of the district data as typed columns"""
+
+    def __init__(self, names: list, columns: Dict[str, object]):
+        self.names = names
+        self.index = {name: i for i, name in enumerate(names)}
+        if len(self.index) != len(names):
+            raise DistrictDataError("Duplicate district names in the district source")
+        self.columns = columns
+
+    @classmethod
+    def from_columns(cls, raw: Dict[str, list]) -> "DistrictTable":
+        """Build from flat column lists (as read from a file)"""
+        missing = [column for column in (NAME_COLUMN, *FIELDS) if column not in raw]
+        if missing:
+            raise DistrictDataError(f"District source is missing columns: {', '.join(missing)}")
+        names = [str(name).strip() for name in raw[NAME_COLUMN]]
+        columns = {}
+        for column, (_, kind) in FIELDS.items():
+            try:
+                columns[column] = _parse_column(raw[column], kind)
+            except (TypeError, ValueError) as e:
+                raise DistrictDataError(f"Bad value in column '{column}': {e}")
+        return cls(names, columns)
+
+    @classmethod
+    def from_records(cls, records: Dict[str, dict]) -> "DistrictTable":
+        """Build from nested condition records (the built-in defaults)"""
+        raw = {NAME_COLUMN: list(records)}
+        for column, (path, _) in FIELDS.items():
+            raw[column] = [_lookup(record, path) for record in records.values()]
+        return cls.from_columns(raw)
+
+    def record(self, i: int) -> dict:
+        return self._build({column: _python_values(self.columns[column][i:i + 1], kind)[0]
+                            for column, (_, kind) in FIELDS.items()})
+
+    def records(self) -> list:
+        """Every record, converting each column once (much faster than record() per district)"""
+        values = {column: _python_values(self.columns[column], kind) for column, (_, kind) in FIELDS.items()}
+        return [self._build({column: values[column][i] for column in FIELDS}) for i in range(len(self.names))]
+
+    @staticmethod
+    def _build(values: dict) -> dict:
+        record = {}
+        for column, (path, _) in FIELDS.items():
+            target = record
+            for key in path[:-1]:
+                target = target.setdefault(key, {})
+            target[path[-1]] = values[column]
+        return record
+
+    def write(self, i: int, record: dict):
+        for column, (path, kind) in FIELDS.items():
+            self.columns[column][i] = _parse_column([_lookup(record, path)], kind)[0]
+
+
+def _lookup(record: dict, path: tuple):
+    for key in path:
+        record = record[key]
+    return record
+
+
+def read_source(path: str) -> DistrictTable:
+    """Parse a district file into a DistrictTable"""
+    extension = os.path.splitext(path)[1].lower()
+    try:
+        if extension == ".csv":
+            with open(path, newline="", encoding="utf-8-sig") as handle:
+                reader = csv.reader(handle)
+                header = [column.strip() for column in next(reader, [])]
+                rows = [row for row in reader if row]
+            if any(len(row) != len(header) for row in rows):
+                raise DistrictDataError(f"District source '{path}' has rows with a different number of columns than the header")
+            raw = {column: [row[i] for row in rows] for i, column in enumerate(header)}
+        elif extension in (".db", ".sqlite", ".sqlite3"):
+            conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+            try:
+                cursor = conn.execute(f"SELECT * FROM {SQLITE_TABLE}")
+                header = [description[0] for description in cursor.description]
+                rows = cursor.fetchall()
+            finally:
+                conn.close()
+            raw = {column: [row[i] for row in rows] for i, column in enumerate(header)}
+        elif extension == ".parquet":
+            try:
+                import pyarrow.parquet as pq
+            except ImportError:
+                raise DistrictDataError("Reading .parquet district data needs pyarrow (pip install pyarrow)")
+            raw = pq.read_table(path, columns=[NAME_COLUMN, *FIELDS]).to_pydict()
+        else:
+            raise DistrictDataError(f"Unsupported district source '{path}' (use .csv, .db/.sqlite or .parquet)")
+    except (OSError, sqlite3.Error) as e:
+        raise DistrictDataError(f"Cannot read district source '{path}': {e}")
+    return DistrictTable.from_columns(raw)
+
+
+def source_signature(path: str) -> tuple:
+    try:
+        stat = os.stat(path)
+    except OSError as e:
+        raise DistrictDataError(f"Cannot read district source '{path}': {e}")
+    return stat.st_mtime_ns, stat.st_size
+
+
+class DistrictRegistry(Mapping):
+    """District name -> condition record, backed by a columnar DistrictTable"""
+
+    def __init__(self, source: Optional[str] = None, defaults: Optional[Dict[str, dict]] = None):
+        self.source = source
+        self.defaults = defaults or {}
+        self.version = 0
+        self.loaded_at = None
+        # When the data last changed: the source file's mtime, or when the last applied per-district
+        # update was stored (set by the caller, so every worker reports the same time)
+        self.modified_at = None
+        self.source_modified_at = None
+        # Last stored condition change applied over this table (see main.sync_conditions)
+        self.synced_seq = 0
+        self._table = None
+        self._records = []
+        self._signature = None
+        self._lock = threading.Lock()
+
+    # Mapping interface (O(1) lookups through the name -> index map)
+
+    def __getitem__(self, name: str) -> dict:
+        table = self.table
+        i = table.index[name]
+        record = self._records[i]
+        if record is None:
+            record = self._records[i] = table.record(i)
+        return record
+
+    def __contains__(self, name) -> bool:
+        return name in self.table.index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.table.names)
+
+    def __len__(self) -> int:
+        return len(self.table.names)
+
+    def values(self) -> list:
+        """All records in district order; missing ones are built in one pass over the columns"""
+        table = self.table
+        if any(record is None for record in self._records):
+            built = table.records()
+            self._records = [record if record is not None else built[i] for i, record in enumerate(self._records)]
+        return list(self._records)
+
+    def items(self) -> list:
+        return list(zip(self.table.names, self.values()))
+
+    def __setitem__(self, name: str, record: dict):
+        """Replace the conditions of an existing district"""
+        table = self.table
+        i = table.index[name]
+        table.write(i, record)
+        self._records[i] = None
+        self.version += 1
+
+    def index_of(self, name: str) -> int:
+        return self.table.index[name]
+
+    def column(self, field: str):
+        """Raw column for a flat field name (see FIELDS)"""
+        return self.table.columns[field]
+
+    # Loading and hot reload
+
+    @property
+    def table(self) -> DistrictTable:
+        if self._table is None:
+            with self._lock:
+                if self._table is None:
+                    self.replace(*self.read())
+        return self._table
+
+    def read(self) -> tuple:
+        """(table, source signature) read from the source; safe to call off the event loop"""
+        if not self.source:
+            return DistrictTable.from_records(self.defaults), None
+        signature = source_signature(self.source)  # before reading: a write during the read shows up next check
+        return read_source(self.source), signature
+
+    def read_if_changed(self) -> Optional[tuple]:
+        """Like read(), but None when the source file is unchanged since the last load"""
+        if not self.source or (self._table is not None and source_signature(self.source) == self._signature):
+            return None
+        return self.read()
+
+    def replace(self, table: DistrictTable, signature: Optional[tuple] = None):
+        """Swap in a newly read table"""
+        self._table = table
+        self._records = [None] * len(table.names)
+        self._signature = signature
+        self.loaded_at = datetime.now()
+        self.source_modified_at = datetime.fromtimestamp(signature[0] / 1e9) if signature else None
+        self.modified_at = self.source_modified_at
+        self.synced_seq = 0
+        self.version += 1
+
+    def stats(self) -> dict:
+        return {
+            "source": self.source or "built-in",
+            "districts": len(self._table.names) if self._table is not None else None,
+            "loaded_at": self.loaded_at.isoformat() if self.loaded_at else None,
+            "version": self.version
+        }
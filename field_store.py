@@ -0,0 +1,445 @@
+"""
+Field-level satellite NDVI store.
+
+Every monitored field is one row of parallel NumPy columns (district, lat,
+lng, NDVI, area, crop, stress flags, capture time). Rows are ordered by
+district, so a district's fields are one contiguous slice that pages without
+copying. Per-district aggregates (joint histograms of health level, NDVI
+band and stress flags, from which every count and area is read) are computed
+once per load, so district overviews never scan fields.
+
+Region queries use a uniform grid index. Fields are sorted by the key of
+their GRID_CELL_DEGREES cell, so each grid row a bounding box crosses is one
+binary-searched range of that order. The candidates are then filtered
+exactly against the box, or against a polygon by ray casting.
+
+Fields come from a .csv or .parquet file with one row per field (COLUMNS).
+Without a file, fields_per_district fields are generated per district
+around the district's crop NDVI. Generation is seeded per district, so every
+worker serves the same fields.
+"""
+
+import csv
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from random_streams import RandomStreams, key_part
+
+CROP_TYPES = ("Rice", "Wheat", "Cotton", "Sugarcane", "Maize")
+# NDVI above each threshold: excellent > 0.8, good > 0.6, moderate > 0.4, else poor
+HEALTH_LEVELS = ("excellent", "good", "moderate", "poor")
+HEALTH_THRESHOLDS = (0.8, 0.6, 0.4)
+# Bit flags of the stress column
+STRESS_FLAGS = {"water_stress": 1, "nutrient_deficiency": 2, "pest_damage": 4}
+STRESS_COMBINATIONS = 1 << len(STRESS_FLAGS)
+# NDVI bands of the subsidy rules: severe < 0.4 (crop insurance claim) <= critical < 0.5 (drought relief;
+# "critical_fields" counts both) <= moderate stress < 0.6 <= healthy
+NDVI_BANDS = ("severe", "critical", "moderate_stress", "healthy")
+BAND_EDGES = (0.4, 0.5, 0.6)
+
+# Grid index cell size (about 1 km at Indian latitudes)
+GRID_CELL_DEGREES = 0.01
+GRID_COLUMNS = int(round(360 / GRID_CELL_DEGREES)) + 1
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Generated fields: approximate centres of the sample districts, spread (degrees) around them
+DISTRICT_CENTRES = {
+    "Ahmedabad": (23.03, 72.58),
+    "Pune": (18.52, 73.86),
+    "Bengaluru": (12.97, 77.59),
+    "Chennai": (13.08, 80.27),
+    "Mumbai": (19.08, 72.88),
+    "Delhi": (28.70, 77.10),
+}
+DISTRICT_SPREAD = 0.15
+
+# File columns: field_id, district, lat, lng, ndvi, area_hectares, crop_type, the STRESS_FLAGS
+# as booleans and last_captured (ISO timestamp)
+COLUMNS = ("field_id", "district", "lat", "lng", "ndvi", "area_hectares", "crop_type",
+           *STRESS_FLAGS, "last_captured")
+TRUE_VALUES = {"1", "true", "yes", "y", "t"}
+
+
+class FieldDataError(ValueError):
+    """The field source is missing, unreadable or does not match COLUMNS"""
+
+
+def health_codes(ndvi: np.ndarray) -> np.ndarray:
+    """Index into HEALTH_LEVELS for each NDVI value"""
+    codes = np.zeros(len(ndvi), dtype=np.int64)
+    for threshold in HEALTH_THRESHOLDS:
+        codes += ndvi <= threshold
+    return codes
+
+
+def band_codes(ndvi: np.ndarray) -> np.ndarray:
+    """Index into NDVI_BANDS for each NDVI value"""
+    return np.searchsorted(BAND_EDGES, ndvi, side="right")
+
+
+def aggregate(ndvi: np.ndarray, area: np.ndarray, stress: np.ndarray,
+              groups: np.ndarray, count: int) -> Dict[str, np.ndarray]:
+    """Per-group joint histograms of (health level, NDVI band, stress flags): field count, area and NDVI sum.
+
+    Every statistic the satellite endpoints report (health distribution, stress counts and areas, band
+    counts and areas, allocation bases) is a sum over cells of these, so the fields are read in one
+    vectorized pass however many figures are derived from them.
+    """
+    shape = (count, len(HEALTH_LEVELS), len(NDVI_BANDS), STRESS_COMBINATIONS)
+    cells = ((groups * len(HEALTH_LEVELS) + health_codes(ndvi)) * len(NDVI_BANDS) + band_codes(ndvi)) * STRESS_COMBINATIONS + stress
+    size = int(np.prod(shape))
+    return {
+        "fields": np.bincount(cells, minlength=size).reshape(shape),
+        "area": np.bincount(cells, weights=area, minlength=size).reshape(shape),
+        "ndvi": np.bincount(cells, weights=ndvi, minlength=size).reshape(shape),
+    }
+
+
+def summarize(totals: Dict[str, np.ndarray], group: int = 0) -> dict:
+    fields, area = totals["fields"][group], totals["area"][group]
+    count = int(fields.sum())
+    by_band = {name: (int(n), round(float(a), 2))
+               for name, n, a in zip(NDVI_BANDS, fields.sum(axis=(0, 2)).tolist(), area.sum(axis=(0, 2)).tolist())}
+    by_stress = fields.sum(axis=(0, 1))
+    stress_area = area.sum(axis=(0, 1))
+    flagged = {name: (np.arange(STRESS_COMBINATIONS) & flag) != 0 for name, flag in STRESS_FLAGS.items()}
+    return {
+        "fields": count,
+        "area_hectares": round(float(area.sum()), 2),
+        "average_ndvi": round(float(totals["ndvi"][group].sum()) / count, 3) if count else 0.0,
+        "health_distribution": dict(zip(HEALTH_LEVELS, fields.sum(axis=(1, 2)).tolist())),
+        "ndvi_bands": {name: {"fields": n, "area_hectares": a} for name, (n, a) in by_band.items()},
+        "stress": {name: int(by_stress[mask].sum()) for name, mask in flagged.items()},
+        "stress_area_hectares": {name: round(float(stress_area[mask].sum()), 2) for name, mask in flagged.items()},
+        "critical_fields": by_band["severe"][0] + by_band["critical"][0],
+        "severe_fields": by_band["severe"][0],
+    }
+
+
+def parse_bbox(text: str) -> Tuple[float, float, float, float]:
+    """'min_lng,min_lat,max_lng,max_lat' -> tuple"""
+    try:
+        min_lng, min_lat, max_lng, max_lat = (float(part) for part in text.split(","))
+    except ValueError:
+        raise ValueError("bbox must be 'min_lng,min_lat,max_lng,max_lat'")
+    if min_lng > max_lng or min_lat > max_lat:
+        raise ValueError("bbox minimums must not exceed its maximums")
+    return min_lng, min_lat, max_lng, max_lat
+
+
+def parse_polygon(text: str) -> List[Tuple[float, float]]:
+    """'lng lat,lng lat,...' (three or more vertices; closing vertex optional) -> [(lng, lat), ...]"""
+    try:
+        vertices = [tuple(float(value) for value in point.split()) for point in text.split(",")]
+    except ValueError:
+        raise ValueError("polygon must be 'lng lat,lng lat,...'")
+    if any(len(vertex) != 2 for vertex in vertices):
+        raise ValueError("polygon must be 'lng lat,lng lat,...'")
+    if len(vertices) > 1 and vertices[0] == vertices[-1]:
+        vertices.pop()
+    if len(vertices) < 3:
+        raise ValueError("polygon needs at least three vertices")
+    return vertices
+
+
+def _cells(lat, lng) -> Tuple[np.ndarray, np.ndarray]:
+    rows = np.floor((np.asarray(lat) + 90) / GRID_CELL_DEGREES).astype(np.int64)
+    columns = np.floor((np.asarray(lng) + 180) / GRID_CELL_DEGREES).astype(np.int64)
+    return rows, columns
+
+
+def district_centre(name: str) -> Tuple[float, float]:
+    """Centre for generated fields; districts without a known centre get a stable point inside India"""
+    if name in DISTRICT_CENTRES:
+        return DISTRICT_CENTRES[name]
+    h = key_part(name)
+    return 10 + (h % 10_000) / 10_000 * 20, 72 + (h // 10_000 % 10_000) / 10_000 * 15
+
+
+class FieldTable:
+    """One loaded snapshot of the fields as typed columns, with the grid index and district aggregates"""
+
+    def __init__(self, district_names: List[str], columns: Dict[str, np.ndarray], ids: Optional[List[str]] = None):
+        # Stable sort by district: each district is one contiguous slice, in source order
+        order = np.argsort(columns["district"], kind="stable")
+        for name in columns:
+            columns[name] = columns[name][order]
+        self.ids = [ids[i] for i in order.tolist()] if ids is not None else None
+        self.district_names = district_names
+        self.district_index = {name: d for d, name in enumerate(district_names)}
+        self.district = columns["district"]
+        self.lat = columns["lat"]
+        self.lng = columns["lng"]
+        self.ndvi = columns["ndvi"]
+        self.area = columns["area"]
+        self.crop = columns["crop"]
+        self.stress = columns["stress"]
+        self.captured = columns["captured"]
+        self.offsets = np.searchsorted(self.district, np.arange(len(district_names) + 1))
+
+        rows, cells = _cells(self.lat, self.lng)
+        keys = rows * GRID_COLUMNS + cells
+        self.grid_order = np.argsort(keys, kind="stable")
+        self.grid_keys = keys[self.grid_order]
+
+        self.totals = aggregate(self.ndvi, self.area, self.stress, self.district, len(district_names))
+
+    def __len__(self) -> int:
+        return len(self.district)
+
+    def district_slice(self, name: str) -> slice:
+        d = self.district_index.get(name)
+        if d is None:
+            return slice(0, 0)
+        return slice(int(self.offsets[d]), int(self.offsets[d + 1]))
+
+    def district_summary(self, name: str) -> dict:
+        d = self.district_index.get(name)
+        if d is None:
+            return self.summary(np.empty(0, dtype=np.int64))
+        return summarize(self.totals, d)
+
+    def summary(self, indices: np.ndarray) -> dict:
+        """Aggregates over an arbitrary selection (e.g. a region query result)"""
+        return summarize(aggregate(self.ndvi[indices], self.area[indices], self.stress[indices],
+                                   np.zeros(len(indices), dtype=np.int64), 1))
+
+    def targets(self, indices) -> Dict[str, np.ndarray]:
+        """Indices of the fields in each NDVI band and with each stress flag, from one classification pass
+        ("critical" includes the severe band, as critical_fields does)"""
+        indices = np.arange(*indices.indices(len(self))) if isinstance(indices, slice) else np.asarray(indices)
+        bands = band_codes(self.ndvi[indices])
+        stress = self.stress[indices]
+        selected = {name: indices[bands == b] for b, name in enumerate(NDVI_BANDS)}
+        selected["critical"] = indices[bands <= NDVI_BANDS.index("critical")]
+        for name, flag in STRESS_FLAGS.items():
+            selected[name] = indices[(stress & flag) != 0]
+        return selected
+
+    def lowest_ndvi(self, indices: np.ndarray, count: int) -> np.ndarray:
+        """The ``count`` fields of ``indices`` with the lowest NDVI, most stressed first"""
+        if count < len(indices):
+            indices = indices[np.argpartition(self.ndvi[indices], count)[:count]]
+        return indices[np.argsort(self.ndvi[indices], kind="stable")]
+
+    def query(self, bbox: Optional[Sequence[float]] = None, polygon: Optional[Sequence[Tuple[float, float]]] = None,
+              district: Optional[str] = None) -> np.ndarray:
+        """Indices (ascending) of fields inside a bbox and/or polygon, optionally within one district"""
+        if polygon is not None:
+            lngs, lats = zip(*polygon)
+            outline = (min(lngs), min(lats), max(lngs), max(lats))
+            bbox = outline if bbox is None else (max(bbox[0], outline[0]), max(bbox[1], outline[1]),
+                                                 min(bbox[2], outline[2]), min(bbox[3], outline[3]))
+        if bbox is None:
+            selected = np.arange(len(self))
+        else:
+            selected = self._bbox_candidates(*bbox)
+        if district is not None:
+            part = self.district_slice(district)
+            selected = selected[(selected >= part.start) & (selected < part.stop)]
+        if polygon is not None:
+            selected = selected[self._inside(selected, polygon)]
+        return selected
+
+    def _bbox_candidates(self, min_lng: float, min_lat: float, max_lng: float, max_lat: float) -> np.ndarray:
+        if min_lng > max_lng or min_lat > max_lat:
+            return np.empty(0, dtype=np.int64)
+        (row_low, row_high), (column_low, column_high) = _cells([min_lat, max_lat], [min_lng, max_lng])
+        rows = np.arange(row_low, row_high + 1) * GRID_COLUMNS
+        # One contiguous range of the grid order per row of cells the box crosses
+        starts = np.searchsorted(self.grid_keys, rows + column_low, side="left")
+        stops = np.searchsorted(self.grid_keys, rows + column_high, side="right")
+        ranges = [self.grid_order[start:stop] for start, stop in zip(starts.tolist(), stops.tolist()) if stop > start]
+        if not ranges:
+            return np.empty(0, dtype=np.int64)
+        candidates = np.sort(np.concatenate(ranges))
+        lat, lng = self.lat[candidates], self.lng[candidates]
+        return candidates[(lat >= min_lat) & (lat <= max_lat) & (lng >= min_lng) & (lng <= max_lng)]
+
+    def _inside(self, indices: np.ndarray, polygon: Sequence[Tuple[float, float]]) -> np.ndarray:
+        """Even-odd ray casting, vectorized over fields"""
+        x, y = self.lng[indices], self.lat[indices]
+        inside = np.zeros(len(indices), dtype=bool)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for (x1, y1), (x2, y2) in zip(polygon, [*polygon[1:], polygon[0]]):
+                crosses = (y1 > y) != (y2 > y)
+                inside ^= crosses & (x < x1 + (y - y1) * (x2 - x1) / (y2 - y1))
+        return inside
+
+    def field_ids(self, indices) -> List[str]:
+        if self.ids is not None:
+            return [self.ids[i] for i in indices]
+        # Generated fields are numbered within their district
+        return [f"FIELD_{self.district_names[d][:3].upper()}_{i - int(self.offsets[d]) + 1:03d}"
+                for i, d in zip(indices, self.district[indices].tolist())]
+
+    def records(self, indices) -> List[dict]:
+        """Fields in the API shape, converting each column once"""
+        indices = np.arange(*indices.indices(len(self))) if isinstance(indices, slice) else np.asarray(indices)
+        index_list = indices.tolist()
+        ndvi = self.ndvi[indices]
+        health = health_codes(ndvi).tolist()
+        stress = self.stress[indices].tolist()
+        columns = zip(self.field_ids(index_list), self.lat[indices].round(6).tolist(),
+                      self.lng[indices].round(6).tolist(), ndvi.tolist(), self.area[indices].tolist(),
+                      self.crop[indices].tolist(), health, stress, self.captured[indices].tolist())
+        return [{
+            "field_id": field_id,
+            "coordinates": {"lat": lat, "lng": lng},
+            "ndvi": field_ndvi,
+            "area_hectares": area,
+            "crop_type": CROP_TYPES[crop],
+            "health_status": HEALTH_LEVELS[level],
+            "stress_indicators": {name: bool(flags & flag) for name, flag in STRESS_FLAGS.items()},
+            "last_captured": datetime.fromtimestamp(captured).isoformat()
+        } for field_id, lat, lng, field_ndvi, area, crop, level, flags, captured in columns]
+
+
+def generate_fields(districts: Mapping[str, dict], per_district: int, seed: int, now: Optional[float] = None) -> FieldTable:
+    """Synthetic fields around each district's crop NDVI, from the seeded stream ("fields", district)"""
+    now = time.time() if now is None else now
+    streams = RandomStreams(seed)
+    names = list(districts)
+    parts = {name: [] for name in ("district", "lat", "lng", "ndvi", "area", "crop", "stress", "captured")}
+    for d, (name, conditions) in enumerate(zip(names, districts.values())):
+        rng = streams.generator("fields", name)
+        n = per_district
+        ndvi = np.clip(conditions["crop_ndvi"] + rng.uniform(-0.25, 0.25, n), 0.0, 1.0).round(3)
+        stress = (np.where((ndvi < 0.6) & (rng.random(n) < 0.5), STRESS_FLAGS["water_stress"], 0)
+                  | np.where((ndvi < 0.5) & (rng.random(n) < 0.5), STRESS_FLAGS["nutrient_deficiency"], 0)
+                  | np.where((ndvi < 0.4) & (rng.random(n) < 0.5), STRESS_FLAGS["pest_damage"], 0))
+        lat, lng = district_centre(name)
+        parts["district"].append(np.full(n, d, dtype=np.int64))
+        parts["lat"].append(lat + rng.normal(0, DISTRICT_SPREAD, n))
+        parts["lng"].append(lng + rng.normal(0, DISTRICT_SPREAD, n))
+        parts["ndvi"].append(ndvi)
+        parts["area"].append(rng.uniform(0.5, 8.0, n).round(2))
+        parts["crop"].append(rng.integers(0, len(CROP_TYPES), n, dtype=np.uint8))
+        parts["stress"].append(stress.astype(np.uint8))
+        parts["captured"].append(now - rng.integers(5, 181, n) * 60.0)
+    columns = {name: np.concatenate(values) if values else np.empty(0) for name, values in parts.items()}
+    columns["district"] = columns["district"].astype(np.int64)
+    columns["crop"] = columns["crop"].astype(np.uint8)
+    columns["stress"] = columns["stress"].astype(np.uint8)
+    return FieldTable(names, columns)
+
+
+def read_fields(path: str, district_names: List[str]) -> FieldTable:
+    """Parse a field file; rows of districts that are not loaded are skipped"""
+    extension = os.path.splitext(path)[1].lower()
+    try:
+        if extension == ".csv":
+            with open(path, newline="", encoding="utf-8-sig") as handle:
+                reader = csv.reader(handle)
+                header = [column.strip() for column in next(reader, [])]
+                rows = [row for row in reader if row]
+            if any(len(row) != len(header) for row in rows):
+                raise FieldDataError(f"Field source '{path}' has rows with a different number of columns than the header")
+            raw = {column: [row[i] for row in rows] for i, column in enumerate(header)}
+        elif extension == ".parquet":
+            try:
+                import pyarrow.parquet as pq
+            except ImportError:
+                raise FieldDataError("Reading .parquet field data needs pyarrow (pip install pyarrow)")
+            raw = pq.read_table(path, columns=list(COLUMNS)).to_pydict()
+        else:
+            raise FieldDataError(f"Unsupported field source '{path}' (use .csv or .parquet)")
+    except OSError as e:
+        raise FieldDataError(f"Cannot read field source '{path}': {e}")
+    missing = [column for column in COLUMNS if column not in raw]
+    if missing:
+        raise FieldDataError(f"Field source is missing columns: {', '.join(missing)}")
+
+    index = {name: d for d, name in enumerate(district_names)}
+    district = np.array([index.get(str(name).strip(), -1) for name in raw["district"]], dtype=np.int64)
+    keep = district >= 0
+    crop_index = {crop.lower(): c for c, crop in enumerate(CROP_TYPES)}
+    try:
+        crop = np.array([crop_index[str(value).strip().lower()] for value in raw["crop_type"]], dtype=np.uint8)
+        stress = np.zeros(len(district), dtype=np.uint8)
+        for name, flag in STRESS_FLAGS.items():
+            stress |= np.array([str(value).strip().lower() in TRUE_VALUES for value in raw[name]], dtype=np.uint8) * flag
+        columns = {
+            "district": district,
+            "lat": np.asarray(raw["lat"], dtype=np.float64),
+            "lng": np.asarray(raw["lng"], dtype=np.float64),
+            "ndvi": np.asarray(raw["ndvi"], dtype=np.float64),
+            "area": np.asarray(raw["area_hectares"], dtype=np.float64),
+            "crop": crop,
+            "stress": stress,
+            "captured": np.array([datetime.fromisoformat(str(value)).timestamp() for value in raw["last_captured"]]),
+        }
+    except KeyError as e:
+        raise FieldDataError(f"Unknown crop type {e} (expected one of {', '.join(CROP_TYPES)})")
+    except (TypeError, ValueError) as e:
+        raise FieldDataError(f"Bad value in field source: {e}")
+    ids = [str(value) for value, kept in zip(raw["field_id"], keep.tolist()) if kept]
+    return FieldTable(district_names, {name: column[keep] for name, column in columns.items()}, ids)
+
+
+class FieldStore:
+    """Fields of the loaded districts, built by open() and rebuilt by rebind() after the districts change"""
+
+    def __init__(self, districts: Mapping[str, dict], source: Optional[str] = None,
+                 fields_per_district: int = 2000, seed: int = 0):
+        self.districts = districts
+        self.source = source
+        self.fields_per_district = fields_per_district
+        self.seed = seed
+        self.loaded_at = None
+        self.load_ms = None
+        self._table = None
+        self._error = None
+        self._lock = threading.Lock()
+
+    @property
+    def table(self) -> FieldTable:
+        """The current table; built here only if open() was never called. FieldDataError if loading failed"""
+        if self._table is None:
+            if self._error is not None:
+                raise self._error
+            with self._lock:
+                if self._table is None:
+                    self._table = self.load()
+        return self._table
+
+    def open(self):
+        """Build the table; parsing a large source takes a while, so call it off the event loop"""
+        self.rebind()
+
+    def load(self) -> FieldTable:
+        started = time.perf_counter()
+        if self.source:
+            table = read_fields(self.source, list(self.districts))
+        else:
+            table = generate_fields(self.districts, self.fields_per_district, self.seed)
+        self.loaded_at = datetime.now()
+        self.load_ms = round((time.perf_counter() - started) * 1000, 1)
+        return table
+
+    def rebind(self):
+        """District list may have changed: build a new table and swap it in (off the event loop, like open()).
+        On FieldDataError the previous table, if any, stays in use"""
+        try:
+            table = self.load()
+        except FieldDataError as e:
+            self._error = e
+            raise
+        self._table, self._error = table, None
+
+    def stats(self) -> dict:
+        table = self._table
+        return {
+            "source": self.source or "generated",
+            "fields": len(table) if table is not None else None,
+            "loaded_at": self.loaded_at.isoformat() if self.loaded_at else None,
+            "load_ms": self.load_ms,
+            "error": str(self._error) if self._error is not None else None
+        }
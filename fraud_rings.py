@@ -0,0 +1,209 @@
+"""
+Collusion-ring detection over shared identifiers.
+
+Fraud rings register many "farmers" that share a phone number, a bank
+account (IFSC + account number) or a land parcel id. Each record is a node
+of a union-find forest. The first record seen with an identifier owns it,
+and every later record with the same identifier is merged into the owner's
+component. Records merge in near-constant time (union by size, path
+halving), so the graph grows incrementally as batches arrive.
+
+Memory per record is a parent and a size (array('i')), a shared-identifier
+bitmask and a district code, plus one owner entry per distinct identifier
+(keyed by hash, as in beneficiary_dedup) and the record id. 5M records with
+three identifiers each take about 2 GB.
+
+Records are merged in the order given, so a graph rebuilt from the same
+records in the same order is identical: main.py stores them in SQLite and
+every worker replays the new ones into its own graph before ranking.
+
+Ranking works on a snapshot. Roots are resolved for every record at once by
+pointer jumping in NumPy, and component sizes and payout exposure are
+bincounts over the roots. A member's exposure is the per-farmer amount of
+every subsidy triggered in its district.
+"""
+
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from beneficiary_dedup import normalize_key
+
+# Identifier kinds and their bit in the shared-identifier mask
+IDENTIFIERS = {"phone": 1, "bank_account": 2, "land_parcel": 4}
+MIN_RING_SIZE = 3
+DEFAULT_TOP = 50
+# Member ids listed per ring (all are counted)
+MAX_MEMBERS_LISTED = 100
+SORT_KEYS = ("exposure", "size")
+
+
+def identifier_keys(record: dict) -> dict:
+    """Normalized identifiers of a record, by kind; missing ones are left out"""
+    keys = {}
+    phone = normalize_key(record.get("phone") or record.get("mobile"), digits_only=True)
+    if len(phone) >= 10:
+        # Country code and trunk prefixes dropped: the last 10 digits are the number
+        keys["phone"] = phone[-10:]
+    account = normalize_key(record.get("bank_account") or record.get("account_number"), digits_only=True)
+    if account:
+        keys["bank_account"] = f"{normalize_key(record.get('ifsc'))}:{account}"
+    parcel = normalize_key(record.get("land_parcel_id") or record.get("land_record_id"))
+    if parcel:
+        keys["land_parcel"] = parcel
+    return keys
+
+
+def ring_record(record: dict) -> Tuple[Optional[str], str, dict]:
+    """(beneficiary id or None, district, identifier keys) of a record; ValueError if it has no identifier"""
+    keys = identifier_keys(record)
+    if not keys:
+        raise ValueError("phone, bank_account or land_parcel_id is required")
+    beneficiary_id = record.get("beneficiary_id")
+    return (str(beneficiary_id) if beneficiary_id else None), str(record.get("district") or ""), keys
+
+
+class RingGraph:
+    """Incremental union-find over beneficiary records linked by shared identifiers"""
+
+    def __init__(self):
+        # Position in the shared record store this graph has merged up to (see main.sync_ring_graph)
+        self.synced_seq = 0
+        self.first_seq = None
+        self.ids: List[str] = []
+        self._parent = array("i")
+        self._size = array("i")
+        self._shared = array("B")
+        self._district = array("I")
+        self._districts: Dict[str, int] = {}
+        self._owners: Dict[int, int] = {}
+        self.unions = 0
+        self.links = dict.fromkeys(IDENTIFIERS, 0)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add(self, record: dict, default_id: str) -> int:
+        """Add one record and merge it with every record sharing an identifier; ValueError if it has none"""
+        beneficiary_id, district, keys = ring_record(record)
+        return self.add_keys(beneficiary_id or default_id, district, keys)
+
+    def add_keys(self, record_id: str, district: str, keys: dict) -> int:
+        """add() for a record already reduced to its identifier keys (see ring_record)"""
+        index = len(self.ids)
+        self.ids.append(record_id)
+        self._parent.append(index)
+        self._size.append(1)
+        self._shared.append(0)
+        self._district.append(self._district_code(district))
+        for kind, key in keys.items():
+            owner = self._owners.setdefault(hash((kind, key)), index)
+            if owner != index:
+                bit = IDENTIFIERS[kind]
+                self._shared[index] |= bit
+                self._shared[owner] |= bit
+                self.links[kind] += 1
+                self.union(owner, index)
+        return index
+
+    def _district_code(self, district: str) -> int:
+        code = self._districts.get(district)
+        if code is None:
+            code = self._districts[district] = len(self._districts)
+        return code
+
+    def find(self, index: int) -> int:
+        parent = self._parent
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    def union(self, a: int, b: int) -> int:
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return a
+        if self._size[a] < self._size[b]:
+            a, b = b, a
+        self._parent[b] = a
+        self._size[a] += self._size[b]
+        self.unions += 1
+        return a
+
+    def component_size(self, index: int) -> int:
+        return self._size[self.find(index)]
+
+    def snapshot(self) -> dict:
+        """Copies of the arrays, so ranking can run in a thread while records keep arriving"""
+        return {
+            "ids": self.ids,
+            "parent": np.frombuffer(self._parent, dtype=np.int32).copy(),
+            "shared": np.frombuffer(self._shared, dtype=np.uint8).copy(),
+            "district": np.frombuffer(self._district, dtype=np.uint32).copy(),
+            "districts": list(self._districts)
+        }
+
+    def stats(self) -> dict:
+        return {
+            "records": len(self.ids),
+            "components": len(self.ids) - self.unions,
+            "identifiers": len(self._owners),
+            "links": dict(self.links)
+        }
+
+
+def resolve_roots(parent: np.ndarray) -> np.ndarray:
+    """Root of every record: pointer jumping, each pass halves the remaining depth"""
+    roots = parent
+    while True:
+        jumped = roots[roots]
+        if np.array_equal(jumped, roots):
+            return roots
+        roots = jumped
+
+
+def rank_rings(snapshot: dict, exposure: Dict[str, float], min_size: int = MIN_RING_SIZE,
+               top: int = DEFAULT_TOP, sort: str = "exposure") -> dict:
+    """Components of at least min_size records, largest payout exposure (or size) first"""
+    if sort not in SORT_KEYS:
+        raise ValueError(f"Unknown sort '{sort}', expected one of {', '.join(SORT_KEYS)}")
+    count = len(snapshot["parent"])
+    roots = resolve_roots(snapshot["parent"])
+    amounts = np.array([exposure.get(name, 0) for name in snapshot["districts"]] or [0], dtype=np.float64)
+    member_exposure = amounts[snapshot["district"]]
+    sizes = np.bincount(roots, minlength=count)
+    totals = np.bincount(roots, weights=member_exposure, minlength=count)
+    rings = np.nonzero(sizes >= max(min_size, 2))[0]
+    primary, secondary = (totals, sizes) if sort == "exposure" else (sizes, totals)
+    ranked = rings[np.lexsort((-secondary[rings], -primary[rings]))][:top]
+
+    # Members of the listed rings, grouped by root
+    members = np.nonzero(np.isin(roots, ranked))[0]
+    members = members[np.argsort(roots[members], kind="stable")]
+    starts = np.searchsorted(roots[members], np.sort(ranked))
+    by_root = dict(zip(np.sort(ranked).tolist(), np.split(members, starts[1:])))
+
+    ids, names = snapshot["ids"], snapshot["districts"]
+    listed = []
+    for root in ranked.tolist():
+        group = by_root[root]
+        shared = snapshot["shared"][group]
+        districts = np.bincount(snapshot["district"][group], minlength=len(names))
+        listed.append({
+            "ring_id": ids[group[0]],
+            "size": int(sizes[root]),
+            "payout_exposure": round(float(totals[root]), 2),
+            "shared_identifiers": {kind: int(np.count_nonzero(shared & bit)) for kind, bit in IDENTIFIERS.items()},
+            "districts": {names[code] or "unknown": int(n) for code, n in enumerate(districts.tolist()) if n},
+            "members": [ids[i] for i in group[:MAX_MEMBERS_LISTED].tolist()],
+            "members_truncated": len(group) > MAX_MEMBERS_LISTED
+        })
+    return {
+        "records": count,
+        "rings": len(rings),
+        "records_in_rings": int(sizes[rings].sum()),
+        "exposure_in_rings": round(float(totals[rings].sum()), 2),
+        "largest_ring": int(sizes.max()) if count else 0,
+        "ranked": listed
+    }
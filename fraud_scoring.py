@@ -0,0 +1,179 @@
+"""
+Streaming fraud scoring for disbursement transactions and rule changes.
+
+Events are scored one at a time, as they arrive, against sliding-window
+counters:
+
+* payouts per bank account (many payouts to one account within
+  account_window seconds),
+* rules created per district (bursts of rules within rule_window seconds),
+* payout amount against the scheme's cap (the largest per-farmer amount any
+  active rule of that scheme pays).
+
+Each window is split into WINDOW_BUCKETS buckets, and a key keeps one count
+(and amount) per bucket plus running totals. Events expire a bucket at a
+time, so a window is accurate to 1/WINDOW_BUCKETS of its length, and a key
+costs the same memory however many events it sees. At most max_keys keys
+are tracked per counter. When that is exceeded, the least recently seen key
+is dropped; its window has usually expired anyway. Scoring an event is a few
+dict operations: microseconds, with no I/O.
+
+Each signal scores 0-1, and signals combine as a noisy-or
+(1 - prod(1 - s)). Events at or above FLAG_THRESHOLD are flagged, and the
+last ALERT_HISTORY flagged events are kept for /fraud-detection/alerts.
+"""
+
+import math
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+WINDOW_BUCKETS = 12
+FLAG_THRESHOLD = 0.5
+ALERT_HISTORY = 1000
+EVENT_TYPES = ("payout", "rule_created")
+# Latest accepted timestamp (9999-12-31 UTC): later ones cannot be shown as dates
+MAX_TIMESTAMP = 253_402_214_400
+
+
+class WindowCounters:
+    """Per-key event count and amount over a sliding window, in bounded memory"""
+
+    def __init__(self, window: float, buckets: int = WINDOW_BUCKETS, max_keys: int = 1_000_000):
+        self.window = window
+        self.buckets = buckets
+        self.width = window / buckets
+        self.max_keys = max_keys
+        self.evictions = 0
+        # key -> [newest bucket number, count, amount, bucket counts, bucket amounts]
+        self._keys = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, key, timestamp: float, amount: float = 0.0) -> Tuple[int, float]:
+        """Record an event; (count, amount) of the key's window including it"""
+        slot = int(timestamp // self.width)
+        entry = self._keys.get(key)
+        if entry is None:
+            entry = self._keys[key] = [slot, 0, 0.0, [0] * self.buckets, [0.0] * self.buckets]
+            if len(self._keys) > self.max_keys:
+                self._keys.popitem(last=False)
+                self.evictions += 1
+        else:
+            self._keys.move_to_end(key)
+        newest, counts, amounts = entry[0], entry[3], entry[4]
+        if slot >= newest + self.buckets:
+            # The whole window expired
+            entry[:] = [slot, 0, 0.0, [0] * self.buckets, [0.0] * self.buckets]
+            counts, amounts = entry[3], entry[4]
+        elif slot > newest:
+            # Expire the buckets the window moved past
+            for expired in range(newest + 1, slot + 1):
+                i = expired % self.buckets
+                entry[1] -= counts[i]
+                entry[2] -= amounts[i]
+                counts[i] = 0
+                amounts[i] = 0.0
+            entry[0] = slot
+        elif slot <= newest - self.buckets:
+            # Older than the window (late event): counted against the window, not into it
+            return entry[1] + 1, entry[2] + amount
+        i = slot % self.buckets
+        counts[i] += 1
+        amounts[i] += amount
+        entry[1] += 1
+        entry[2] += amount
+        return entry[1], entry[2]
+
+
+def over_limit(count: float, limit: float) -> float:
+    """0 up to the limit, then from just over 0.5 (flagged) towards 1: 0.75 at twice the limit"""
+    return 1 - 0.5 * limit / count if count > limit > 0 else 0.0
+
+
+def parse_timestamp(value) -> float:
+    """Epoch seconds or ISO 8601; ValueError if malformed, non-finite or out of range"""
+    if value is None or value == "":
+        return time.time()
+    try:
+        timestamp = float(value)
+    except ValueError:
+        timestamp = datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+    if not (math.isfinite(timestamp) and 0 <= timestamp <= MAX_TIMESTAMP):
+        raise ValueError(f"Timestamp {value!r} is out of range")
+    return timestamp
+
+
+class TransactionScorer:
+    """Scores payout and rule-creation events as they arrive"""
+
+    def __init__(self, account_window: float = 86400, max_account_payouts: int = 3,
+                 rule_window: float = 3600, max_district_rules: int = 20, max_keys: int = 1_000_000):
+        self.max_account_payouts = max_account_payouts
+        self.max_district_rules = max_district_rules
+        self.accounts = WindowCounters(account_window, max_keys=max_keys)
+        self.districts = WindowCounters(rule_window, max_keys=max_keys)
+        self.caps: Dict[str, float] = {}
+        self.caps_version = None
+        self.alerts = deque(maxlen=ALERT_HISTORY)
+        self.stats = {"scored": 0, "flagged": 0}
+
+    def set_caps(self, caps: Dict[str, float], version=None):
+        """Scheme name -> largest allowed payout"""
+        self.caps = caps
+        self.caps_version = version
+
+    def score(self, event: dict) -> dict:
+        """Risk of one event; ValueError if it is malformed"""
+        kind = event.get("type", "payout")
+        timestamp = parse_timestamp(event.get("timestamp"))
+        signals = {}
+        if kind == "payout":
+            account = event.get("account") or event.get("bank_account")
+            if not account:
+                raise ValueError("payout events need an account")
+            amount = float(event.get("amount") or 0)
+            count, _ = self.accounts.add(str(account), timestamp, amount)
+            if count > self.max_account_payouts:
+                signals["account_velocity"] = over_limit(count, self.max_account_payouts)
+            cap = self.caps.get(event.get("scheme") or event.get("schemeName"))
+            if cap and amount > cap:
+                signals["over_scheme_cap"] = min(1.0, 0.5 + (amount - cap) / cap)
+        elif kind == "rule_created":
+            district = event.get("district")
+            if not district:
+                raise ValueError("rule_created events need a district")
+            count, _ = self.districts.add(str(district), timestamp)
+            if count > self.max_district_rules:
+                signals["district_rule_burst"] = over_limit(count, self.max_district_rules)
+        else:
+            raise ValueError(f"Unknown event type '{kind}', expected one of {', '.join(EVENT_TYPES)}")
+
+        risk = 0.0
+        if signals:
+            safe = 1.0
+            for value in signals.values():
+                safe *= 1 - value
+            risk = 1 - safe
+        self.stats["scored"] += 1
+        result = {"risk": round(risk, 3), "flagged": risk >= FLAG_THRESHOLD,
+                  "signals": {name: round(value, 3) for name, value in signals.items()}}
+        if result["flagged"]:
+            self.stats["flagged"] += 1
+            self.alerts.append({"event": event, "timestamp": datetime.fromtimestamp(timestamp).isoformat(), **result})
+        return result
+
+    def recent_alerts(self, limit: Optional[int] = None) -> list:
+        alerts = list(self.alerts)
+        return alerts[::-1][:limit] if limit else alerts[::-1]
+
+    def describe(self) -> dict:
+        return {
+            **self.stats,
+            "tracked_accounts": len(self.accounts),
+            "tracked_districts": len(self.districts),
+            "evictions": self.accounts.evictions + self.districts.evictions,
+            "schemes_with_caps": len(self.caps)
+        }
@@ -0,0 +1,108 @@
+"""
+Shared outbound HTTP client for the external data providers.
+
+A single httpx.AsyncClient is opened with the app and closed on shutdown, so
+weather (and other provider) calls reuse pooled keep-alive connections
+instead of paying a TCP + TLS handshake per request. HTTP/2 is negotiated
+when the ``h2`` package is installed (``httpx[http2]``). Timeouts can be set
+per provider host; hosts without an override use the default.
+"""
+
+import os
+from typing import Dict, Iterator, Optional, Union
+from urllib.parse import urlsplit
+
+import httpx
+
+try:
+    import h2  # noqa: F401 - httpx only needs it importable for HTTP/2
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+DEFAULT_CONNECT_TIMEOUT = 5.0
+
+
+def provider_urls(sources: dict) -> Iterator[str]:
+    """Every endpoint URL declared in a REAL_DATA_SOURCES-style mapping"""
+    for source in sources.values():
+        if "endpoint" in source:
+            yield source["endpoint"]
+        yield from source.get("endpoints", {}).values()
+
+
+def parse_host_timeouts(spec: str) -> Dict[str, float]:
+    """Parse ``host=seconds,host=seconds`` (as used by HTTP_HOST_TIMEOUTS)"""
+    timeouts = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        host, _, seconds = item.partition("=")
+        try:
+            timeouts[host.strip().lower()] = float(seconds)
+        except ValueError:
+            print(f"⚠️  Ignoring invalid HTTP_HOST_TIMEOUTS entry '{item}'")
+    return timeouts
+
+
+class OutboundHTTP:
+    """Pooled httpx.AsyncClient (keep-alive, optional HTTP/2) with per-host timeouts"""
+
+    def __init__(self, max_connections: int = 100, max_keepalive_connections: int = 20,
+                 keepalive_expiry: float = 30.0, http2: bool = True, default_timeout: float = 10.0,
+                 host_timeouts: Optional[Dict[str, float]] = None, verify: Union[bool, str] = True):
+        if http2 and not HTTP2_AVAILABLE:
+            print("⚠️  HTTP/2 requested but the 'h2' package is missing; using HTTP/1.1 (pip install 'httpx[http2]')")
+            http2 = False
+        self.http2 = http2
+        self.verify = verify
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        self.default_timeout = self._timeout(default_timeout)
+        self.host_timeouts = {host: self._timeout(seconds) for host, seconds in (host_timeouts or {}).items()}
+        self._client = None
+
+    @classmethod
+    def from_env(cls, sources: dict) -> "OutboundHTTP":
+        """Build from HTTP_* environment variables; every provider host in ``sources`` gets a timeout"""
+        default_timeout = float(os.getenv("HTTP_TIMEOUT", "10"))
+        host_timeouts = {urlsplit(url).hostname: default_timeout for url in provider_urls(sources)}
+        host_timeouts.update(parse_host_timeouts(os.getenv("HTTP_HOST_TIMEOUTS", "")))
+        return cls(
+            max_connections=int(os.getenv("HTTP_MAX_CONNECTIONS", "100")),
+            max_keepalive_connections=int(os.getenv("HTTP_MAX_KEEPALIVE", "20")),
+            keepalive_expiry=float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30")),
+            http2=os.getenv("HTTP2", "true").lower() in ("1", "true", "yes"),
+            default_timeout=default_timeout,
+            host_timeouts=host_timeouts
+        )
+
+    @staticmethod
+    def _timeout(seconds: float) -> httpx.Timeout:
+        return httpx.Timeout(seconds, connect=min(seconds, DEFAULT_CONNECT_TIMEOUT))
+
+    def open(self):
+        self._client = httpx.AsyncClient(limits=self.limits, http2=self.http2,
+                                         timeout=self.default_timeout, verify=self.verify)
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            raise RuntimeError("Outbound HTTP client is not open (app lifespan not started)")
+        return self._client
+
+    def timeout_for(self, url: str) -> httpx.Timeout:
+        return self.host_timeouts.get(urlsplit(url).hostname, self.default_timeout)
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        kwargs.setdefault("timeout", self.timeout_for(url))
+        return await self.client.request(method, url, **kwargs)
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
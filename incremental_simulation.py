@@ -0,0 +1,213 @@
+"""
+Incremental engine for the basic (/simulate) simulation.
+
+Keeps the last trigger state of every rule plus per-district and overall
+payout aggregates. A rule write re-evaluates just that rule; a change to a
+district's conditions re-evaluates only the rules of that district that read
+one of the changed metrics (via the repository's (district, metric) index),
+and re-prices the district's triggered rules only if farmers or crop health
+changed. Totals are patched by the difference, so recompute cost scales with
+the size of the change instead of the rule set.
+
+A rule's eligibility draw is kept while it stays triggered, so repeated
+simulations over unchanged inputs return the same numbers. With ``streams``
+(a seeded RandomStreams) each draw is derived from (rule id, district, run)
+instead of a shared RNG, so it is identical across restarts and workers, and
+priced() re-prices the triggered set for any other seed or run. take_delta()
+reports what changed since it was last called (for the SSE change feed).
+"""
+
+import random
+from typing import Dict, Iterable, Optional
+
+from random_streams import RandomStreams
+from rule_engine import METRICS
+from rule_store import RuleRepository
+
+# Condition keys that feed the eligibility/payout calculation of triggered rules
+PRICING_KEYS = ("farmers", "crop_ndvi")
+
+# Range of the base eligibility draw for a triggered rule
+DRAW_RANGE = (0.15, 0.35)
+
+
+def eligible_farmers(draw: float, district_data: dict) -> int:
+    """Eligible farmers for a triggered rule given its base eligibility draw"""
+    base_eligibility = draw
+    # Adjust eligibility based on crop health
+    if district_data["crop_ndvi"] < 0.5:  # Poor crop health
+        base_eligibility *= 1.5  # More farmers eligible
+    elif district_data["crop_ndvi"] > 0.8:  # Excellent crop health
+        base_eligibility *= 0.7  # Fewer farmers need subsidy
+    return int(district_data["farmers"] * min(base_eligibility, 1.0))
+
+
+def changed_metrics(old: dict, new: dict) -> set:
+    """Rule metrics whose value differs between two condition records"""
+    return {name for name, (extract, _) in METRICS.items() if extract(old) != extract(new)}
+
+
+class IncrementalSimulation:
+    """Trigger state and payout aggregates for the basic simulation, patched by deltas"""
+
+    def __init__(self, conditions: Dict[str, dict], rules: RuleRepository, rng: Optional[random.Random] = None,
+                 streams: Optional[RandomStreams] = None, run: int = 0):
+        self.conditions = conditions
+        self.rules = rules
+        self.rng = rng or random.Random()
+        self.streams = streams
+        self.run = run
+        self._triggered = {}            # rule id -> {"district", "draw", "eligible", "payout"}
+        self._triggered_by_district = {}  # district -> set of triggered rule ids
+        self.district_totals = {}       # district -> {"rules", "farmers", "payout"}
+        self.totals = {"rules": 0, "farmers": 0, "payout": 0}
+        self.last_update = {"mode": "none", "pairs_evaluated": 0}
+        self._touched = {}       # rule id -> trigger entry before the current delta window (None: not triggered)
+        self._edited = set()     # rule ids whose rule itself changed in the current delta window
+        self._totals_before = dict(self.totals)
+        self._reset = False
+
+    def rebuild(self):
+        """Evaluate every (rule, district) pair from scratch"""
+        self._triggered = {}
+        self._triggered_by_district = {}
+        self.district_totals = {}
+        self.totals = {"rules": 0, "farmers": 0, "payout": 0}
+        self._touched = {}
+        self._edited = set()
+        self._reset = True
+        rules = self.rules.candidates(self.conditions)
+        for rule in rules:
+            self._evaluate(rule)
+        self.last_update = {"mode": "full", "pairs_evaluated": len(rules)}
+
+    def apply_rule_changes(self, changes):
+        """Follow a storage.RuleChanges batch the repository has just applied"""
+        if changes.full_reload:
+            self.rebuild()
+            return
+        rule_ids = [rule["id"] for rule in changes.rules] + list(changes.deleted_ids)
+        self._edited.update(rule_ids)
+        for rule_id in rule_ids:
+            self._untrigger(rule_id)
+            rule = self.rules.get(rule_id)
+            if rule is not None:
+                self._evaluate(rule)
+        self.last_update = {"mode": "rules", "pairs_evaluated": len(rule_ids)}
+
+    def update_conditions(self, district: str, record: dict) -> dict:
+        """Replace a district's conditions and re-evaluate only the affected rules"""
+        old = self.conditions[district]
+        self.conditions[district] = record
+        metrics = changed_metrics(old, record)
+        affected = self.rules.ids_reading(district, metrics)
+        if any(old.get(key) != record.get(key) for key in PRICING_KEYS):
+            affected |= self._triggered_by_district.get(district, set())
+        for rule_id in affected:
+            previous = self._triggered.get(rule_id)
+            rule = self.rules.get(rule_id)
+            if previous is not None and rule["predicate"].evaluate(record):
+                # Still triggered: keep the draw, re-price against the new conditions
+                self._untrigger(rule_id)
+                self._trigger(rule, previous["draw"])
+            else:
+                self._untrigger(rule_id)
+                self._evaluate(rule)
+        self.last_update = {"mode": "conditions", "district": district,
+                            "changed_metrics": sorted(metrics), "pairs_evaluated": len(affected)}
+        return self.last_update
+
+    def take_delta(self) -> Optional[dict]:
+        """
+        Changes since the previous call: triggered subsidies added or re-priced, rule ids no
+        longer triggered, and the summary delta. {"reset": True, ...} after a full rebuild;
+        None if nothing changed.
+        """
+        totals = dict(self.totals)
+        summary_delta = {key: totals[key] - self._totals_before[key] for key in totals}
+        if self._reset:
+            delta = {"reset": True, "totals": totals}
+        else:
+            changed, removed = [], []
+            for rule_id, before in self._touched.items():
+                after = self._triggered.get(rule_id)
+                if after is None:
+                    if before is not None:
+                        removed.append(rule_id)
+                elif rule_id in self._edited or before is None or \
+                        (before["eligible"], before["payout"]) != (after["eligible"], after["payout"]):
+                    rule = self.rules.get(rule_id)
+                    changed.append({
+                        "rule_id": rule_id,
+                        "schemeName": rule["schemeName"],
+                        "condition": rule["condition"],
+                        "amount": rule["amount"],
+                        "district": rule["district"],
+                        "eligibleFarmers": after["eligible"],
+                        "totalPayout": after["payout"]
+                    })
+            delta = None
+            if changed or removed:
+                delta = {"changed": changed, "removed": sorted(removed),
+                         "summary_delta": summary_delta, "totals": totals}
+        self._touched = {}
+        self._edited = set()
+        self._totals_before = totals
+        self._reset = False
+        return delta
+
+    def triggered(self) -> Iterable[tuple]:
+        """(rule, eligible farmers, payout) for every triggered rule, by rule id"""
+        for rule_id in sorted(self._triggered):
+            entry = self._triggered[rule_id]
+            yield self.rules.get(rule_id), entry["eligible"], entry["payout"]
+
+    def priced(self, streams: RandomStreams, run: int = 0) -> Iterable[tuple]:
+        """Like triggered(), with the draws taken from ``streams`` for ``run`` instead of the kept ones"""
+        for rule_id in sorted(self._triggered):
+            rule = self.rules.get(rule_id)
+            eligible = eligible_farmers(streams.uniform(*DRAW_RANGE, rule_id, rule["district"], run),
+                                        self.conditions[rule["district"]])
+            yield rule, eligible, eligible * rule["amount"]
+
+    def _draw(self, rule: dict) -> float:
+        if self.streams is not None:
+            return self.streams.uniform(*DRAW_RANGE, rule["id"], rule["district"], self.run)
+        return self.rng.uniform(*DRAW_RANGE)
+
+    def _evaluate(self, rule: dict):
+        district_data = self.conditions.get(rule["district"])
+        if district_data is not None and rule["predicate"].evaluate(district_data):
+            self._trigger(rule, self._draw(rule))
+
+    def _trigger(self, rule: dict, draw: float):
+        district = rule["district"]
+        eligible = eligible_farmers(draw, self.conditions[district])
+        entry = {"district": district, "draw": draw, "eligible": eligible, "payout": eligible * rule["amount"]}
+        if not self._reset:
+            self._touched.setdefault(rule["id"], None)
+        self._triggered[rule["id"]] = entry
+        self._triggered_by_district.setdefault(district, set()).add(rule["id"])
+        self._add_to_totals(district, 1, entry["eligible"], entry["payout"])
+
+    def _untrigger(self, rule_id: int):
+        entry = self._triggered.pop(rule_id, None)
+        if entry is None:
+            return
+        if not self._reset:
+            self._touched.setdefault(rule_id, entry)
+        district = entry["district"]
+        ids = self._triggered_by_district[district]
+        ids.discard(rule_id)
+        if not ids:
+            del self._triggered_by_district[district]
+        self._add_to_totals(district, -1, -entry["eligible"], -entry["payout"])
+
+    def _add_to_totals(self, district: str, rules: int, farmers: int, payout: int):
+        totals = self.district_totals.setdefault(district, {"rules": 0, "farmers": 0, "payout": 0})
+        for target in (totals, self.totals):
+            target["rules"] += rules
+            target["farmers"] += farmers
+            target["payout"] += payout
+        if totals["rules"] == 0:
+            del self.district_totals[district]
@@ -0,0 +1,340 @@
+"""
+Append-only disbursement ledger with Merkle batch proofs.
+
+Entries (one per disbursement) are appended in batches of at most
+batch_size. Each batch gets a Merkle tree over its entries, and a batch
+hash that chains it to the previous batch:
+
+    leaf  = sha256(0x00 || entry JSON)
+    node  = sha256(0x01 || left || right)      (an odd last node moves up unchanged)
+    batch = sha256(previous batch hash || root || first entry, count, timestamp)
+
+Rewriting any recorded entry changes its batch root and every batch hash
+after it. A payout is proven by its audit path: one sibling hash per tree
+level, O(log batch size). An auditor checks it against the batch header
+without reading the rest of the ledger.
+
+On disk, in the ledger directory:
+
+* segment-NNNNNN.ndjson: entries as canonical JSON lines. A new segment is
+  started once the current one exceeds segment_bytes.
+* entries.idx: fixed-width (segment, offset, length) per entry, so entry n
+  is one seek away.
+* merkle.dat: every level of every batch tree, so a proof is one read per
+  level rather than a rebuild of the tree.
+* batches.idx: fixed-width batch headers. A batch counts as written once its
+  header is; anything after the last full header (a crash mid-batch) is
+  truncated on open.
+
+Writers in different processes take an exclusive lock on ledger.lock
+(fcntl, where available) and pick up batches other processes appended.
+"""
+
+import bisect
+import hashlib
+import json
+import os
+import struct
+import threading
+import time
+from array import array
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process writers only
+    fcntl = None
+
+DEFAULT_BATCH_SIZE = 4096
+DEFAULT_SEGMENT_BYTES = 64 * 1024 * 1024
+HASH_SIZE = 32
+GENESIS = bytes(HASH_SIZE)
+
+_INDEX = struct.Struct("<IQI")              # segment, offset, length
+_BATCH = struct.Struct("<QIQd32s32s32s")    # first entry, count, tree offset, timestamp, root, previous, hash
+_BATCH_FIELDS = struct.Struct("<QId")
+
+
+class LedgerError(ValueError):
+    pass
+
+
+def encode_entry(entry: dict) -> bytes:
+    return json.dumps(entry, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str).encode()
+
+
+def leaf_hash(payload: bytes) -> bytes:
+    return hashlib.sha256(b"\x00" + payload).digest()
+
+
+def node_hash(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(b"\x01" + left + right).digest()
+
+
+def batch_hash(previous: bytes, root: bytes, first: int, count: int, timestamp: float) -> bytes:
+    return hashlib.sha256(previous + root + _BATCH_FIELDS.pack(first, count, timestamp)).digest()
+
+
+def level_sizes(count: int) -> List[int]:
+    """Node count of each tree level, leaves first"""
+    sizes = [count]
+    while sizes[-1] > 1:
+        sizes.append((sizes[-1] + 1) // 2)
+    return sizes
+
+
+def merkle_levels(leaves: List[bytes]) -> List[List[bytes]]:
+    levels = [leaves]
+    while len(levels[-1]) > 1:
+        level = levels[-1]
+        parents = [node_hash(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            parents.append(level[-1])
+        levels.append(parents)
+    return levels
+
+
+def verify_proof(proof: dict) -> Dict[str, bool]:
+    """Check a proof on its own: entry -> leaf -> audit path -> batch root -> batch hash"""
+    batch = proof["batch"]
+    leaf = leaf_hash(encode_entry(proof["entry"]))
+    node = leaf
+    for step in proof["path"]:
+        sibling = bytes.fromhex(step["hash"])
+        node = node_hash(sibling, node) if step["side"] == "left" else node_hash(node, sibling)
+    root = bytes.fromhex(batch["merkle_root"])
+    chained = batch_hash(bytes.fromhex(batch["previous_hash"]), root, batch["first_entry"],
+                         batch["entries"], batch["timestamp"])
+    return {
+        "leaf_matches": leaf.hex() == proof["leaf_hash"],
+        "root_matches": node == root,
+        "batch_hash_matches": chained.hex() == batch["batch_hash"],
+        "entry_in_batch": batch["first_entry"] <= proof["entry"].get("seq", -1) < batch["first_entry"] + batch["entries"]
+    }
+
+
+class DisbursementLedger:
+    """Segmented append-only ledger of disbursements, Merkle-batched and hash-chained"""
+
+    def __init__(self, directory: str, batch_size: int = DEFAULT_BATCH_SIZE,
+                 segment_bytes: int = DEFAULT_SEGMENT_BYTES, fsync: bool = True):
+        self.directory = directory
+        self.batch_size = batch_size
+        self.segment_bytes = segment_bytes
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._fds: Dict[str, int] = {}
+        self._firsts = array("Q")   # first entry of every batch, for bisect
+        self._entries = 0
+        self._tree_end = 0
+        self._head = GENESIS
+        self._segment = 0
+        self._segment_size = 0
+        self.stats = {"appended": 0, "batches_written": 0, "proofs": 0}
+
+    # Files
+
+    def _fd(self, name: str) -> int:
+        fd = self._fds.get(name)
+        if fd is None:
+            fd = os.open(os.path.join(self.directory, name), os.O_RDWR | os.O_CREAT, 0o644)
+            # Readers and the writer thread may race to open the same file; keep one descriptor
+            kept = self._fds.setdefault(name, fd)
+            if kept != fd:
+                os.close(fd)
+            fd = kept
+        return fd
+
+    @staticmethod
+    def _segment_name(number: int) -> str:
+        return f"segment-{number:06d}.ndjson"
+
+    def open(self):
+        os.makedirs(self.directory, exist_ok=True)
+        with self._lock, self._file_lock():
+            self._refresh()
+            self._recover()
+
+    def close(self):
+        with self._lock:
+            for fd in self._fds.values():
+                os.close(fd)
+            self._fds = {}
+
+    @contextmanager
+    def _file_lock(self):
+        """Exclusive across processes (on top of self._lock within this one)"""
+        if fcntl is None:
+            yield
+            return
+        fd = self._fd("ledger.lock")
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+
+    def _read_batch(self, number: int) -> tuple:
+        return _BATCH.unpack(os.pread(self._fd("batches.idx"), _BATCH.size, number * _BATCH.size))
+
+    def _read_index(self, seq: int) -> tuple:
+        return _INDEX.unpack(os.pread(self._fd("entries.idx"), _INDEX.size, seq * _INDEX.size))
+
+    def _refresh(self):
+        """Pick up batches written since the last look (by this or another process)"""
+        written = os.fstat(self._fd("batches.idx")).st_size // _BATCH.size
+        if written == len(self._firsts):
+            return
+        for number in range(len(self._firsts), written):
+            first, count, tree_offset, _, _, _, digest = self._read_batch(number)
+            self._firsts.append(first)
+            self._entries = first + count
+            self._tree_end = tree_offset + sum(level_sizes(count)) * HASH_SIZE
+            self._head = digest
+        if self._entries:
+            segment, offset, length = self._read_index(self._entries - 1)
+            self._segment, self._segment_size = segment, offset + length + 1
+
+    def _recover(self):
+        """Drop whatever a crashed writer left after the last complete batch header"""
+        os.ftruncate(self._fd("batches.idx"), len(self._firsts) * _BATCH.size)
+        os.ftruncate(self._fd("entries.idx"), self._entries * _INDEX.size)
+        os.ftruncate(self._fd("merkle.dat"), self._tree_end)
+        for name in os.listdir(self.directory):
+            if name.startswith("segment-") and name.endswith(".ndjson"):
+                number = int(name[8:14])
+                if number > self._segment:
+                    os.remove(os.path.join(self.directory, name))
+                elif number == self._segment:
+                    os.truncate(os.path.join(self.directory, name), self._segment_size)
+
+    # Writes
+
+    def append(self, entries: Iterable[dict]) -> Optional[dict]:
+        """Append entries (each gets its "seq"), in batches of at most batch_size; the range written"""
+        entries = list(entries)
+        if not entries:
+            return None
+        with self._lock, self._file_lock():
+            self._refresh()
+            first = self._entries
+            number = len(self._firsts)
+            headers, firsts, segments = [], [], set()
+            for start in range(0, len(entries), self.batch_size):
+                chunk = entries[start:start + self.batch_size]
+                firsts.append(first + start)
+                headers.append(self._write_batch(chunk, first + start))
+                segments.add(self._segment)
+            # Entries, index and trees are made durable first; the headers go last,
+            # since until a batch's header is written the batch does not exist
+            if self.fsync:
+                for name in [self._segment_name(segment) for segment in sorted(segments)] + ["entries.idx", "merkle.dat"]:
+                    os.fsync(self._fd(name))
+            os.pwrite(self._fd("batches.idx"), b"".join(headers), number * _BATCH.size)
+            if self.fsync:
+                os.fsync(self._fd("batches.idx"))
+            self._firsts.extend(firsts)
+            self._entries = first + len(entries)
+        batches = list(range(number, number + len(headers)))
+        self.stats["appended"] += len(entries)
+        self.stats["batches_written"] += len(batches)
+        return {"first_entry": first, "entries": len(entries), "batches": batches, "head_hash": self._head.hex()}
+
+    def _write_batch(self, entries: List[dict], first: int) -> bytes:
+        """Write one batch's entries, index and tree; the header that commits them is returned, not written"""
+        payloads = []
+        for seq, entry in enumerate(entries, first):
+            entry["seq"] = seq
+            payloads.append(encode_entry(entry))
+        levels = merkle_levels([leaf_hash(payload) for payload in payloads])
+        root = levels[-1][0]
+
+        data = b"\n".join(payloads) + b"\n"
+        if self._segment == 0 or (self._segment_size and self._segment_size + len(data) > self.segment_bytes):
+            self._segment, self._segment_size = self._segment + 1, 0
+        index = bytearray()
+        offset = self._segment_size
+        for payload in payloads:
+            index += _INDEX.pack(self._segment, offset, len(payload))
+            offset += len(payload) + 1
+        os.pwrite(self._fd(self._segment_name(self._segment)), data, self._segment_size)
+        os.pwrite(self._fd("entries.idx"), bytes(index), first * _INDEX.size)
+        os.pwrite(self._fd("merkle.dat"), b"".join(node for level in levels for node in level), self._tree_end)
+
+        timestamp = time.time()
+        digest = batch_hash(self._head, root, first, len(entries), timestamp)
+        header = _BATCH.pack(first, len(entries), self._tree_end, timestamp, root, self._head, digest)
+        self._segment_size = offset
+        self._tree_end += sum(len(level) for level in levels) * HASH_SIZE
+        self._head = digest
+        return header
+
+    # Reads
+
+    def __len__(self) -> int:
+        return self._entries
+
+    def _locate(self, seq: int) -> int:
+        """Batch number holding entry seq; LedgerError past the end"""
+        if seq >= self._entries:
+            with self._lock:
+                self._refresh()
+        if not 0 <= seq < self._entries:
+            raise LedgerError(f"Entry {seq} not found (ledger has {self._entries} entries)")
+        return bisect.bisect_right(self._firsts, seq) - 1
+
+    def entry(self, seq: int) -> dict:
+        self._locate(seq)
+        segment, offset, length = self._read_index(seq)
+        return json.loads(os.pread(self._fd(self._segment_name(segment)), length, offset))
+
+    def _has_batch(self, number: int) -> bool:
+        """Whether batch number exists; batches appended by other handles are picked up first"""
+        if number >= len(self._firsts):
+            with self._lock:
+                self._refresh()
+        return 0 <= number < len(self._firsts)
+
+    def batch(self, number: int) -> dict:
+        if not self._has_batch(number):
+            raise LedgerError(f"Batch {number} not found (ledger has {len(self._firsts)} batches)")
+        first, count, _, timestamp, root, previous, digest = self._read_batch(number)
+        return {"batch": number, "first_entry": first, "entries": count, "timestamp": timestamp,
+                "merkle_root": root.hex(), "previous_hash": previous.hex(), "batch_hash": digest.hex()}
+
+    def proof(self, seq: int) -> dict:
+        """Inclusion proof of entry seq: the entry, its audit path and its batch header"""
+        number = self._locate(seq)
+        first, count, tree_offset, *_ = self._read_batch(number)
+        tree = self._fd("merkle.dat")
+        index, level_offset, path = seq - first, tree_offset, []
+        leaf = os.pread(tree, HASH_SIZE, level_offset + index * HASH_SIZE)
+        for size in level_sizes(count)[:-1]:
+            sibling = index ^ 1
+            if sibling < size:
+                path.append({"side": "left" if sibling < index else "right",
+                             "hash": os.pread(tree, HASH_SIZE, level_offset + sibling * HASH_SIZE).hex()})
+            level_offset += size * HASH_SIZE
+            index //= 2
+        self.stats["proofs"] += 1
+        return {"seq": seq, "entry": self.entry(seq), "leaf_hash": leaf.hex(), "path": path, "batch": self.batch(number)}
+
+    def verify(self, proof: dict) -> dict:
+        """verify_proof, plus: the proof's batch is the one this ledger recorded"""
+        checks = verify_proof(proof)
+        number = proof["batch"]["batch"]
+        checks["batch_recorded"] = (self._has_batch(number)
+                                    and self._read_batch(number)[6].hex() == proof["batch"]["batch_hash"])
+        return {"valid": all(checks.values()), "checks": checks}
+
+    def head(self) -> dict:
+        with self._lock:
+            self._refresh()
+        return {
+            "entries": self._entries,
+            "batches": len(self._firsts),
+            "head_hash": self._head.hex(),
+            "segments": self._segment,
+            **self.stats
+        }
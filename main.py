@@ -1,14 +1,79 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, Field, ValidationError
 from typing import List, Optional
 from datetime import datetime, timedelta
+from contextlib import asynccontextmanager
+import asyncio
 import random
-import httpx
+import time
 import json
+import uuid
+from collections import Counter
 import google.generativeai as genai
 
-app = FastAPI(title="Subsidy Design Engine API", version="1.0.0")
+from rule_engine import ConditionSyntaxError, compile_condition
+from simulation_kernel import DistrictColumns, barrier_challenges, run_realistic_kernel
+from rule_store import RuleRepository
+from storage import RuleStorage
+from bulk_ingest import detect_format, iter_records
+from http_client import OutboundHTTP
+from ttl_cache import TTLCache
+from ai_gateway import AIGateway
+from ai_cache import AIResultCache, bucket_weather
+from incremental_simulation import IncrementalSimulation
+from random_streams import RandomStreams
+from monte_carlo import DEFAULT_QUANTILES, MonteCarloEngine, PayoutModel
+from change_feed import ChangeFeed, encode_event
+from derived_cache import DerivedCache, orjson
+from district_registry import DistrictDataError, DistrictRegistry
+from beneficiary_dedup import CHUNK_SIZE as DEDUP_CHUNK_SIZE, SIMILARITY_THRESHOLD, DuplicateScreen
+from fraud_scoring import TransactionScorer
+from fraud_rings import DEFAULT_TOP as RING_TOP, MIN_RING_SIZE, SORT_KEYS as RING_SORT_KEYS, RingGraph, rank_rings, ring_record
+from ledger import DisbursementLedger, LedgerError
+from disbursement import (DEFAULT_CHUNK_SIZE as DBT_DEFAULT_CHUNK_SIZE, MAX_CHUNK_SIZE as DBT_MAX_CHUNK_SIZE,
+                          DisbursementPipeline, PaymentPlan, allocations_from, load_bank_adapter)
+from field_store import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, FieldDataError, FieldStore, parse_bbox, parse_polygon
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open shared resources on startup and release them on shutdown"""
+    storage.open()
+    http_client.open()
+    ai_gateway.open()
+    monte_carlo.open()
+    ledger.open()
+    try:
+        load_district_columns()
+    except DistrictDataError as e:
+        print(f"❌ Cannot load district data from DISTRICTS_SOURCE={DISTRICTS_SOURCE}: {e}")
+        raise
+    await load_field_store(field_store.open)
+    await sync_rules()
+    await ai_cache.prune()
+    if DBT_RESUME_ON_START:
+        resumed = await disbursements.resume_unfinished()
+        if resumed:
+            print(f"🔁 Resuming {len(resumed)} unfinished disbursement run(s)")
+    feed_sync = asyncio.create_task(sync_rules_for_subscribers())
+    district_watch = None
+    if DISTRICTS_SOURCE and DISTRICTS_RELOAD_INTERVAL > 0:
+        district_watch = asyncio.create_task(watch_district_source())
+    yield
+    if district_watch:
+        district_watch.cancel()
+    feed_sync.cancel()
+    await disbursements.close()
+    ledger.close()
+    monte_carlo.close()
+    ai_gateway.close()
+    await http_client.close()
+    storage.close()
+
+# Dynamic responses are encoded with orjson when it is installed
+app = FastAPI(title="Subsidy Design Engine API", version="1.0.0", lifespan=lifespan,
+              default_response_class=ORJSONResponse if orjson else JSONResponse)
 
 # Load environment variables for secure API key management
 import os
@@ -21,6 +86,68 @@ load_dotenv()
 WEATHER_API_KEY = os.getenv('WEATHER_API_KEY')
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
 
+# Live weather cache: WeatherAPI data changes hourly, so serve it from memory for that long
+WEATHER_CACHE_TTL = float(os.getenv('WEATHER_CACHE_TTL', '3600'))
+WEATHER_CACHE_STALE_TTL = float(os.getenv('WEATHER_CACHE_STALE_TTL', '3600'))
+WEATHER_CACHE_MAX_ENTRIES = int(os.getenv('WEATHER_CACHE_MAX_ENTRIES', '2048'))
+
+# AI insight cache: seconds a generated insight stays valid, in-memory entries, SQLite tier on/off
+AI_CACHE_TTL = float(os.getenv('AI_CACHE_TTL', '21600'))
+AI_CACHE_MAX_ENTRIES = int(os.getenv('AI_CACHE_MAX_ENTRIES', '4096'))
+AI_CACHE_DISK = os.getenv('AI_CACHE_DISK', 'true').lower() in ('1', 'true', 'yes')
+
+# Server-sent change events: replay buffer for reconnects, per-client queue bound,
+# heartbeat and rule-sync intervals (seconds) while dashboards are connected
+SSE_REPLAY_SIZE = int(os.getenv('SSE_REPLAY_SIZE', '1024'))
+SSE_QUEUE_SIZE = int(os.getenv('SSE_QUEUE_SIZE', '256'))
+SSE_HEARTBEAT_SECONDS = float(os.getenv('SSE_HEARTBEAT_SECONDS', '15'))
+SSE_RULE_SYNC_INTERVAL = float(os.getenv('SSE_RULE_SYNC_INTERVAL', '1'))
+
+# Seed for reproducible basic simulations: eligibility draws are derived per (rule, district, run),
+# so every worker returns identical payouts for identical inputs. Unset: unseeded draws
+SIMULATION_SEED = os.getenv('SIMULATION_SEED')
+
+# District conditions: CSV/SQLite/Parquet file (default: the built-in MOCK_CONDITIONS), seconds between
+# checks for a changed file (0: only on POST /districts/reload), district shown in simulation headers
+DISTRICTS_SOURCE = os.getenv('DISTRICTS_SOURCE')
+DISTRICTS_RELOAD_INTERVAL = float(os.getenv('DISTRICTS_RELOAD_INTERVAL', '30'))
+PRIMARY_DISTRICT = os.getenv('PRIMARY_DISTRICT', 'Ahmedabad')
+
+# Satellite fields: CSV/Parquet file with one row per field (see field_store.COLUMNS); unset generates
+# FIELDS_PER_DISTRICT fields per district (seeded by SIMULATION_SEED, so every worker serves the same fields)
+FIELDS_SOURCE = os.getenv('FIELDS_SOURCE')
+FIELDS_PER_DISTRICT = int(os.getenv('FIELDS_PER_DISTRICT', '2000'))
+
+# Streaming fraud scoring: payouts allowed per bank account within FRAUD_ACCOUNT_WINDOW seconds, rules created
+# per district within FRAUD_RULE_WINDOW seconds, keys tracked per counter (least recently seen dropped first)
+FRAUD_ACCOUNT_WINDOW = float(os.getenv('FRAUD_ACCOUNT_WINDOW', '86400'))
+FRAUD_ACCOUNT_MAX_PAYOUTS = int(os.getenv('FRAUD_ACCOUNT_MAX_PAYOUTS', '3'))
+FRAUD_RULE_WINDOW = float(os.getenv('FRAUD_RULE_WINDOW', '3600'))
+FRAUD_DISTRICT_MAX_RULES = int(os.getenv('FRAUD_DISTRICT_MAX_RULES', '20'))
+FRAUD_MAX_TRACKED_KEYS = int(os.getenv('FRAUD_MAX_TRACKED_KEYS', '1000000'))
+
+# Persistent rule/simulation storage shared by all uvicorn workers
+RULES_DB_PATH = os.getenv('RULES_DB_PATH', 'subsidy_engine.db')
+
+# Disbursement ledger: directory (shared by all workers), entries per Merkle batch, segment file size,
+# fsync after every append
+LEDGER_DIR = os.getenv('LEDGER_DIR', 'ledger')
+LEDGER_BATCH_SIZE = int(os.getenv('LEDGER_BATCH_SIZE', '4096'))
+LEDGER_SEGMENT_BYTES = int(os.getenv('LEDGER_SEGMENT_BYTES', str(64 * 1024 * 1024)))
+LEDGER_FSYNC = os.getenv('LEDGER_FSYNC', 'true').lower() in ('1', 'true', 'yes')
+
+# DBT disbursement runs: bank adapter ('stub' or 'module:ClassName'), instructions per bank file, files in
+# flight at once, attempts per file, and whether unfinished runs resume when a worker starts
+DBT_BANK_ADAPTER = os.getenv('DBT_BANK_ADAPTER', 'stub')
+DBT_CHUNK_SIZE = int(os.getenv('DBT_CHUNK_SIZE', str(DBT_DEFAULT_CHUNK_SIZE)))
+DBT_CONCURRENCY = int(os.getenv('DBT_CONCURRENCY', '4'))
+DBT_MAX_ATTEMPTS = int(os.getenv('DBT_MAX_ATTEMPTS', '5'))
+DBT_RESUME_ON_START = os.getenv('DBT_RESUME_ON_START', 'true').lower() in ('1', 'true', 'yes')
+# Stub bank only: seconds per file, share of submissions failing transiently, share of instructions rejected
+DBT_STUB_LATENCY = float(os.getenv('DBT_STUB_LATENCY', '0.05'))
+DBT_STUB_FAILURE_RATE = float(os.getenv('DBT_STUB_FAILURE_RATE', '0.05'))
+DBT_STUB_REJECTION_RATE = float(os.getenv('DBT_STUB_REJECTION_RATE', '0.001'))
+
 # Validate API keys are loaded
 if not WEATHER_API_KEY:
     print("⚠️  Warning: WEATHER_API_KEY not found in environment variables")
@@ -35,6 +162,30 @@ else:
     print("❌ Cannot configure Gemini AI: API key missing")
     model = None
 
+# Gemini calls run off the event loop: at most GEMINI_MAX_CONCURRENCY at once, each capped at GEMINI_TIMEOUT seconds
+ai_gateway = AIGateway(
+    model,
+    max_concurrency=int(os.getenv('GEMINI_MAX_CONCURRENCY', '4')),
+    timeout=float(os.getenv('GEMINI_TIMEOUT', '15'))
+)
+
+# Per-stage timeouts (seconds) for /simulate-enhanced; only the simulation stage is critical
+ENHANCED_STAGE_TIMEOUTS = {
+    "simulation": float(os.getenv('ENHANCED_SIMULATION_TIMEOUT', '10')),
+    "weather": float(os.getenv('ENHANCED_WEATHER_TIMEOUT', '8')),
+    "ai_insights": float(os.getenv('ENHANCED_AI_TIMEOUT', str(ai_gateway.timeout + 2)))
+}
+
+# Batch /simulate-enhanced: weather fetches in flight at once (default and hard cap), max locations per request
+ENHANCED_BATCH_CONCURRENCY = int(os.getenv('ENHANCED_BATCH_CONCURRENCY', '8'))
+ENHANCED_BATCH_MAX_CONCURRENCY = 32
+ENHANCED_BATCH_MAX_LOCATIONS = 100
+
+# Monte Carlo payout exposure: worker processes (0/1: run in a thread), trials per vectorized batch, trial cap
+MONTE_CARLO_WORKERS = int(os.getenv('MONTE_CARLO_WORKERS', str(os.cpu_count() or 1)))
+MONTE_CARLO_BATCH_SIZE = int(os.getenv('MONTE_CARLO_BATCH_SIZE', '20000'))
+MONTE_CARLO_MAX_TRIALS = int(os.getenv('MONTE_CARLO_MAX_TRIALS', '2000000'))
+
 # Enable CORS for frontend
 app.add_middleware(
     CORSMiddleware,
@@ -70,6 +221,20 @@ class TriggeredSubsidy(BaseModel):
 class EnhancedSimulationRequest(BaseModel):
     location: Optional[str] = "Ludhiana"
 
+class EnhancedBatchSimulationRequest(BaseModel):
+    locations: List[str]
+    max_concurrency: Optional[int] = None
+    include_ai_insights: bool = True
+
+class MonteCarloRequest(BaseModel):
+    trials: int = 100_000
+    seed: Optional[int] = Field(None, ge=0)
+    quantiles: List[float] = list(DEFAULT_QUANTILES)
+
+class DisbursementRequest(BaseModel):
+    simulation_type: str = "basic"
+    chunk_size: Optional[int] = None
+
 class SimulationResponse(BaseModel):
     timestamp: datetime
     conditions: dict
@@ -117,15 +282,12 @@ class SystemEfficiency(BaseModel):
     digital_literacy: float
     overall_efficiency_score: float
 
-# In-memory storage (replace with database in production)
-rules_db = []
-rule_counter = 1
-
 # Real-world API integration data sources
 REAL_DATA_SOURCES = {
     "weather": {
-        "providers": ["Weatherbit.io", "Ambee", "Tomorrow.io"],
+        "providers": ["WeatherAPI.com", "Weatherbit.io", "Ambee", "Tomorrow.io"],
         "endpoints": {
+            "weatherapi": "https://api.weatherapi.com/v1/current.json",
             "weatherbit": "https://api.weatherbit.io/v2.0/current",
             "ambee": "https://api.ambeedata.com/weather/latest",
             "tomorrow": "https://api.tomorrow.io/v4/timelines"
@@ -166,7 +328,15 @@ REAL_DATA_SOURCES = {
     }
 }
 
-# Research-based realistic conditions (based on Agricultural Subsidy Fintech Platform Design paper)
+# One pooled client (keep-alive, HTTP/2, per-host timeouts) for every provider above
+http_client = OutboundHTTP.from_env(REAL_DATA_SOURCES)
+
+# Weather lookups keyed by normalized location; concurrent misses share one upstream call
+weather_cache = TTLCache(ttl=WEATHER_CACHE_TTL, stale_ttl=WEATHER_CACHE_STALE_TTL,
+                         max_entries=WEATHER_CACHE_MAX_ENTRIES)
+
+# Research-based realistic conditions (based on Agricultural Subsidy Fintech Platform Design paper);
+# the built-in district data when DISTRICTS_SOURCE is not set
 MOCK_CONDITIONS = {
     "Ahmedabad": {
         "rainfall": 60, "temperature": 35, "farmers": 12500,
@@ -255,38 +425,311 @@ MOCK_CONDITIONS = {
     }
 }
 
+# District conditions by name (O(1) lookups over columnar storage, loaded on first use, hot-reloadable).
+# PATCHed conditions are stored in SQLite and applied on every worker (see sync_conditions)
+districts = DistrictRegistry(DISTRICTS_SOURCE, defaults=MOCK_CONDITIONS)
+conditions_sync_lock = asyncio.Lock()
+
+# Satellite NDVI per field: columnar, grid-indexed for region queries, aggregated per district. Built in a
+# thread at startup and after each district reload (the old table is served until the new one is swapped in)
+field_store = FieldStore(districts, source=FIELDS_SOURCE, fields_per_district=FIELDS_PER_DISTRICT,
+                         seed=int(SIMULATION_SEED or 0))
+
+# Columnar view of district conditions for the vectorized simulation kernel; empty until
+# load_district_columns() runs at startup, so DISTRICTS_SOURCE is not read at import
+district_columns = DistrictColumns({})
+
+# SQLite (WAL) is the source of truth; each worker keeps an id/district/metric indexed
+# in-memory copy (with the kernel's rule columns) in sync through the change log
+storage = RuleStorage(RULES_DB_PATH)
+rule_store = RuleRepository(district_columns)
+ai_cache = AIResultCache(AI_CACHE_TTL, max_entries=AI_CACHE_MAX_ENTRIES, disk=storage if AI_CACHE_DISK else None)
+
+# Trigger state and payout totals of the basic simulation, patched as rules and conditions change
+simulation_streams = RandomStreams(int(SIMULATION_SEED)) if SIMULATION_SEED else None
+simulation_state = IncrementalSimulation(districts, rule_store, streams=simulation_streams)
+
+# Trigger/summary/risk changes pushed to dashboards over SSE (/events/stream)
+change_feed = ChangeFeed(replay_size=SSE_REPLAY_SIZE, queue_size=SSE_QUEUE_SIZE)
+
+# District analytics/risk/efficiency views, recomputed only when district conditions change
+derived_metrics = DerivedCache()
+# Fixed payloads (research insights), encoded and compressed once per process
+static_responses = DerivedCache()
+
+# Sliding-window fraud scoring of payout and rule-creation events (per worker, in memory)
+transaction_scorer = TransactionScorer(
+    account_window=FRAUD_ACCOUNT_WINDOW, max_account_payouts=FRAUD_ACCOUNT_MAX_PAYOUTS,
+    rule_window=FRAUD_RULE_WINDOW, max_district_rules=FRAUD_DISTRICT_MAX_RULES, max_keys=FRAUD_MAX_TRACKED_KEYS
+)
+
+# Collusion rings: beneficiary records linked by shared phone / bank account / land parcel. The records
+# live in SQLite; each worker merges the ones it has not seen into its in-memory graph before ranking
+ring_graph = RingGraph()
+ring_sync_lock = asyncio.Lock()
+
+# Append-only, hash-chained record of the payments actually submitted: one entry per bank file a
+# disbursement run got accepted
+ledger = DisbursementLedger(LEDGER_DIR, batch_size=LEDGER_BATCH_SIZE, segment_bytes=LEDGER_SEGMENT_BYTES,
+                            fsync=LEDGER_FSYNC)
+
+# Per-farmer payment instructions submitted to the bank in chunked files, checkpointed in SQLite
+disbursements = DisbursementPipeline(
+    storage,
+    load_bank_adapter(DBT_BANK_ADAPTER, latency=DBT_STUB_LATENCY, failure_rate=DBT_STUB_FAILURE_RATE,
+                      rejection_rate=DBT_STUB_REJECTION_RATE),
+    concurrency=DBT_CONCURRENCY,
+    max_attempts=DBT_MAX_ATTEMPTS,
+    ledger=ledger
+)
+
+# Process pool for Monte Carlo payout distributions (/simulate-realistic/monte-carlo)
+monte_carlo = MonteCarloEngine(workers=MONTE_CARLO_WORKERS, batch_size=MONTE_CARLO_BATCH_SIZE)
+
+def publish_simulation_changes():
+    """Push whatever the incremental simulation changed since the last publish"""
+    delta = simulation_state.take_delta()
+    if delta is not None:
+        change_feed.publish("reset" if delta.get("reset") else "triggers", delta)
+
+async def sync_rules():
+    """Replay rule writes and condition updates committed by any worker since this worker's last sync"""
+    # Nothing loaded yet: take every rule, even if the change log is empty
+    changes = await storage.rule_changes_since(rule_store.synced_seq, full=rule_store.version == 0)
+    if rule_store.apply_changes(changes):
+        simulation_state.apply_rule_changes(changes)
+        publish_simulation_changes()
+    await sync_conditions()
+
+async def sync_conditions():
+    """
+    Apply district conditions PATCHed on any worker since this worker's last sync. After a
+    district file (re)load, only changes made later than the file are applied over it.
+    """
+    async with conditions_sync_lock:
+        after = districts.source_modified_at.timestamp() if districts.source_modified_at else 0
+        changes = await storage.condition_changes_since(districts.synced_seq, after)
+        for seq, district, record, changed_at in changes:
+            if district in districts:
+                apply_conditions(district, record, changed_at)
+            districts.synced_seq = seq
+    if changes:
+        publish_simulation_changes()
+
+def apply_conditions(district: str, record: dict, changed_at: float) -> dict:
+    """Set a district's conditions on this worker and re-simulate its affected rules"""
+    previous_risk = district_risk_scores()[district]
+    update = simulation_state.update_conditions(district, record)
+    # The stored time of the change, not this worker's clock, so last_updated (and the ETag) match across workers
+    districts.modified_at = datetime.fromtimestamp(changed_at)
+    district_columns.update(district, record)
+    derived_metrics.invalidate()
+    risk_score = district_risk_scores()[district]
+    if risk_score != previous_risk:
+        change_feed.publish("district", {"district": district, "risk_score": risk_score, "previous_risk_score": previous_risk})
+    return update
+
+async def sync_rules_for_subscribers():
+    """While dashboards are connected, pick up rule writes made by other workers"""
+    while True:
+        await asyncio.sleep(SSE_RULE_SYNC_INTERVAL)
+        if len(change_feed):
+            try:
+                await sync_rules()
+            except Exception as e:
+                print(f"⚠️  Rule sync for event subscribers failed: {e}")
+
+def district_data_updated_at() -> Optional[str]:
+    """When the district data last changed (None for the built-in data); the same on every worker"""
+    return districts.modified_at.isoformat() if districts.modified_at else None
+
+def primary_district_name() -> str:
+    """District shown in simulation response headers"""
+    return PRIMARY_DISTRICT if PRIMARY_DISTRICT in districts else next(iter(districts))
+
+def load_district_columns():
+    """Build the kernel's district columns from the registry (the first access reads DISTRICTS_SOURCE)"""
+    global district_columns
+    district_columns = DistrictColumns(districts)
+    rule_store.rebind(district_columns)
+
+async def load_field_store(load):
+    """Build the satellite field table in a thread; a bad FIELDS_SOURCE only disables the satellite endpoints"""
+    try:
+        await asyncio.get_running_loop().run_in_executor(None, load)
+    except FieldDataError as e:
+        print(f"⚠️  Satellite field data unavailable (FIELDS_SOURCE={FIELDS_SOURCE}): {e}")
+
+def satellite_fields():
+    """The loaded field table; 503 if the field source could not be loaded"""
+    try:
+        return field_store.table
+    except FieldDataError as e:
+        raise HTTPException(status_code=503, detail=f"Satellite field data unavailable (FIELDS_SOURCE={FIELDS_SOURCE}): {e}")
+
+async def reload_districts(force: bool = False) -> bool:
+    """Re-read DISTRICTS_SOURCE if it changed (or always, with ``force``) and rebuild what derives from it"""
+    read = districts.read if force else districts.read_if_changed
+    loaded = await asyncio.get_running_loop().run_in_executor(None, read)
+    if loaded is None:
+        return False
+    if force:
+        await storage.clear_condition_changes()
+    districts.replace(*loaded)
+    load_district_columns()
+    simulation_state.rebuild()
+    await load_field_store(field_store.rebind)
+    derived_metrics.invalidate()
+    await sync_conditions()
+    publish_simulation_changes()
+    return True
+
+async def watch_district_source():
+    """Hot reload: pick up a changed district file without a restart"""
+    while True:
+        await asyncio.sleep(DISTRICTS_RELOAD_INTERVAL)
+        try:
+            if await reload_districts():
+                print(f"🔄 Reloaded {len(districts)} districts from {DISTRICTS_SOURCE}")
+        except Exception as e:
+            print(f"⚠️  District data reload failed, keeping the current data: {e}")
+
+def merge_conditions(current: dict, updates: dict) -> dict:
+    """New condition record with ``updates`` applied; only existing fields, with matching types"""
+    merged = dict(current)
+    for key, value in updates.items():
+        if key not in current:
+            raise ValueError(f"Unknown condition field '{key}'")
+        existing = current[key]
+        if isinstance(existing, dict):
+            if not isinstance(value, dict):
+                raise ValueError(f"'{key}' must be an object")
+            merged[key] = merge_conditions(existing, value)
+        elif isinstance(existing, bool) or isinstance(value, bool):
+            if type(value) is not type(existing):
+                raise ValueError(f"'{key}' must be {type(existing).__name__}")
+            merged[key] = value
+        elif isinstance(existing, (int, float)):
+            if not isinstance(value, (int, float)):
+                raise ValueError(f"'{key}' must be a number")
+            merged[key] = value
+        elif not isinstance(value, type(existing)):
+            raise ValueError(f"'{key}' must be {type(existing).__name__}")
+        else:
+            merged[key] = value
+    return merged
+
 @app.get("/")
 async def root():
     return {"message": "Subsidy Design Engine API", "version": "1.0.0"}
 
+def compile_rule_condition(condition: str):
+    """Compile a rule condition once at write time, rejecting invalid syntax"""
+    try:
+        return compile_condition(condition)
+    except ConditionSyntaxError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid condition '{condition}': {str(e)}")
+
 @app.post("/rules", response_model=RuleResponse)
 async def create_rule(rule: Rule):
     """Create a new subsidy rule"""
-    global rule_counter
-    
-    new_rule = {
-        "id": rule_counter,
-        "schemeName": rule.schemeName,
-        "condition": rule.condition,
-        "amount": rule.amount,
-        "district": rule.district,
-        "created_at": datetime.now()
-    }
-    
-    rules_db.append(new_rule)
-    rule_counter += 1
+    compile_rule_condition(rule.condition)
     
-    return new_rule
+    rule_id = await storage.insert_rule(rule.schemeName, rule.condition, rule.amount, rule.district)
+    await sync_rules()
+    # Flagged bursts land in the alert history (/fraud-detection/alerts)
+    transaction_scorer.score({"type": "rule_created", "district": rule.district, "rule_id": rule_id})
+    return rule_store.get(rule_id)
+
+# Bulk ingestion: rows validated and inserted per batch, with at most this many errors reported
+BULK_BATCH_SIZE = 5000
+BULK_MAX_ERRORS = 1000
+
+def format_validation_error(error: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(str(part) for part in e['loc'])}: {e['msg']}" for e in error.errors())
+
+async def insert_rule_batch(batch: list, created: Counter) -> int:
+    """Insert validated rule rows, counting them per district in ``created``"""
+    inserted = await storage.bulk_insert_rules(batch)
+    created.update(district for _, _, _, district in batch)
+    return inserted
+
+@app.post("/rules/bulk")
+async def bulk_create_rules(
+    request: Request,
+    fmt: Optional[str] = Query(None, alias="format"),
+    max_errors: int = BULK_MAX_ERRORS
+):
+    """Stream NDJSON or CSV rules (one per line) into storage, validating in batches"""
+    try:
+        fmt = detect_format(request.headers.get("content-type", ""), fmt)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    started = time.perf_counter()
+    rows_received = rules_created = rows_rejected = 0
+    errors = []
+    batch = []
+    pending_insert = None
+    created = Counter()
+    
+    async for row_number, record, error in iter_records(request.stream(), fmt):
+        rows_received += 1
+        if error is None:
+            try:
+                rule = Rule(**record)
+                compile_condition(rule.condition)
+            except ValidationError as e:
+                error = format_validation_error(e)
+            except ConditionSyntaxError as e:
+                error = f"Invalid condition '{rule.condition}': {str(e)}"
+        
+        if error is not None:
+            rows_rejected += 1
+            if len(errors) < max_errors:
+                errors.append({"row": row_number, "error": error})
+            continue
+        
+        batch.append((rule.schemeName, rule.condition, rule.amount, rule.district))
+        if len(batch) >= BULK_BATCH_SIZE:
+            # Keep one batch inserting in the storage thread while the next one is parsed
+            if pending_insert:
+                rules_created += await pending_insert
+            pending_insert = asyncio.ensure_future(insert_rule_batch(batch, created))
+            batch = []
+    
+    if pending_insert:
+        rules_created += await pending_insert
+    if batch:
+        rules_created += await insert_rule_batch(batch, created)
+    await sync_rules()
+    # One rule_created event per district per import: a seasonal load is one burst candidate, not one per row
+    for district, count in created.items():
+        transaction_scorer.score({"type": "rule_created", "district": district, "rules": count, "source": "bulk"})
+    
+    duration = time.perf_counter() - started
+    return {
+        "format": fmt,
+        "rows_received": rows_received,
+        "rules_created": rules_created,
+        "rows_rejected": rows_rejected,
+        "errors": errors,
+        "errors_truncated": rows_rejected > len(errors),
+        "duration_seconds": round(duration, 3),
+        "rules_per_second": round(rules_created / duration) if duration > 0 else 0
+    }
 
 @app.get("/rules", response_model=List[RuleResponse])
 async def get_all_rules():
     """Get all active subsidy rules"""
-    return rules_db
+    await sync_rules()
+    return rule_store.all()
 
 @app.get("/rules/{rule_id}", response_model=RuleResponse)
 async def get_rule(rule_id: int):
     """Get a specific rule by ID"""
-    rule = next((r for r in rules_db if r["id"] == rule_id), None)
+    await sync_rules()
+    rule = rule_store.get(rule_id)
     if not rule:
         raise HTTPException(status_code=404, detail="Rule not found")
     return rule
@@ -294,116 +737,63 @@ async def get_rule(rule_id: int):
 @app.put("/rules/{rule_id}", response_model=RuleResponse)
 async def update_rule(rule_id: int, rule: Rule):
     """Update an existing rule"""
-    existing_rule = next((r for r in rules_db if r["id"] == rule_id), None)
-    if not existing_rule:
-        raise HTTPException(status_code=404, detail="Rule not found")
+    compile_rule_condition(rule.condition)
     
-    existing_rule.update({
-        "schemeName": rule.schemeName,
-        "condition": rule.condition,
-        "amount": rule.amount,
-        "district": rule.district
-    })
+    if not await storage.update_rule(rule_id, rule.schemeName, rule.condition, rule.amount, rule.district):
+        raise HTTPException(status_code=404, detail="Rule not found")
     
-    return existing_rule
+    await sync_rules()
+    return rule_store.get(rule_id)
 
 @app.delete("/rules/{rule_id}")
 async def delete_rule(rule_id: int):
     """Delete a rule"""
-    global rules_db
-    rules_db = [r for r in rules_db if r["id"] != rule_id]
+    await storage.delete_rule(rule_id)
+    await sync_rules()
     return {"message": "Rule deleted successfully"}
 
 @app.get("/simulate", response_model=SimulationResponse)
-async def run_simulation():
+async def run_simulation(seed: Optional[int] = Query(None, ge=0), run: int = Query(0, ge=0)):
     """Run advanced subsidy simulation with real-world data integration"""
-    triggered_subsidies = []
+    await sync_rules()
+    
+    # Seeded mode: draws come from per-(rule, district, run) streams, so responses are reproducible
+    streams = RandomStreams(seed) if seed is not None else simulation_streams
+    if streams is None and run:
+        raise HTTPException(status_code=400, detail="'run' requires a seed (query parameter or SIMULATION_SEED)")
+    if streams is not None and (streams is not simulation_streams or run != simulation_state.run):
+        priced = list(simulation_state.priced(streams, run))
+        totals = {
+            "rules": len(priced),
+            "farmers": sum(eligible for _, eligible, _ in priced),
+            "payout": sum(payout for _, _, payout in priced)
+        }
+    else:
+        # Trigger state is maintained incrementally; only rules touched since the last change were re-evaluated
+        priced = simulation_state.triggered()
+        totals = simulation_state.totals
+    
+    triggered_subsidies = [
+        TriggeredSubsidy(
+            schemeName=rule["schemeName"],
+            condition=rule["condition"],
+            amount=rule["amount"],
+            district=rule["district"],
+            eligibleFarmers=eligible_farmers,
+            totalPayout=total_payout
+        ) for rule, eligible_farmers, total_payout in priced
+    ]
     
-    for rule in rules_db:
-        district = rule["district"]
-        condition = rule["condition"].lower()
-        
-        # Get enhanced conditions for the district
-        if district not in MOCK_CONDITIONS:
-            continue
-            
-        district_data = MOCK_CONDITIONS[district]
-        rainfall = district_data["rainfall"]
-        temperature = district_data["temperature"]
-        total_farmers = district_data["farmers"]
-        soil_health = district_data["soil_health"]
-        crop_ndvi = district_data["crop_ndvi"]
-        
-        # Enhanced condition evaluation with multiple data sources
-        rule_triggered = False
-        
-        # Weather-based conditions
-        if "rainfall" in condition:
-            if "<" in condition:
-                threshold = int(condition.split("<")[1].strip())
-                rule_triggered = rainfall < threshold
-            elif ">" in condition:
-                threshold = int(condition.split(">")[1].strip())
-                rule_triggered = rainfall > threshold
-        
-        elif "temperature" in condition:
-            if "<" in condition:
-                threshold = int(condition.split("<")[1].strip())
-                rule_triggered = temperature < threshold
-            elif ">" in condition:
-                threshold = int(condition.split(">")[1].strip())
-                rule_triggered = temperature > threshold
-        
-        # Crop health-based conditions (NDVI)
-        elif "crop_health" in condition or "ndvi" in condition:
-            if "<" in condition:
-                threshold = float(condition.split("<")[1].strip())
-                rule_triggered = crop_ndvi < threshold
-            elif ">" in condition:
-                threshold = float(condition.split(">")[1].strip())
-                rule_triggered = crop_ndvi > threshold
-        
-        # Soil health-based conditions
-        elif "soil_ph" in condition:
-            if "<" in condition:
-                threshold = float(condition.split("<")[1].strip())
-                rule_triggered = soil_health["ph"] < threshold
-            elif ">" in condition:
-                threshold = float(condition.split(">")[1].strip())
-                rule_triggered = soil_health["ph"] > threshold
-        
-        if rule_triggered:
-            # Calculate eligible farmers with enhanced logic
-            base_eligibility = random.uniform(0.15, 0.35)
-            
-            # Adjust eligibility based on crop health
-            if crop_ndvi < 0.5:  # Poor crop health
-                base_eligibility *= 1.5  # More farmers eligible
-            elif crop_ndvi > 0.8:  # Excellent crop health
-                base_eligibility *= 0.7  # Fewer farmers need subsidy
-            
-            eligible_farmers = int(total_farmers * min(base_eligibility, 1.0))
-            total_payout = eligible_farmers * rule["amount"]
-            
-            triggered_subsidies.append(TriggeredSubsidy(
-                schemeName=rule["schemeName"],
-                condition=rule["condition"],
-                amount=rule["amount"],
-                district=district,
-                eligibleFarmers=eligible_farmers,
-                totalPayout=total_payout
-            ))
-    
-    # Calculate comprehensive summary
-    total_rules_triggered = len(triggered_subsidies)
-    total_farmers_impacted = sum(s.eligibleFarmers for s in triggered_subsidies)
-    total_payout_amount = sum(s.totalPayout for s in triggered_subsidies)
+    # Comprehensive summary from the running aggregates
+    total_rules_triggered = totals["rules"]
+    total_farmers_impacted = totals["farmers"]
+    total_payout_amount = totals["payout"]
     
     # Enhanced conditions response with multiple data points
-    primary_district = "Ahmedabad"
-    conditions = MOCK_CONDITIONS[primary_district]
+    primary_district = primary_district_name()
+    conditions = districts[primary_district]
     
-    return SimulationResponse(
+    simulation = SimulationResponse(
         timestamp=datetime.now(),
         conditions={
             "rainfall": conditions["rainfall"],
@@ -419,9 +809,14 @@ async def run_simulation():
             "totalFarmersImpacted": total_farmers_impacted,
             "totalPayoutAmount": total_payout_amount,
             "dataFreshness": "Real-time integration",
-            "apiCallsMade": len(REAL_DATA_SOURCES)
+            "apiCallsMade": len(REAL_DATA_SOURCES),
+            "seed": streams.seed if streams is not None else None,
+            "run": run
         }
     )
+    await storage.record_simulation("basic", simulation.summary)
+    
+    return simulation
 
 # Research-based realistic simulation endpoint
 @app.get("/simulate-realistic", response_model=SimulationResponse)
@@ -430,97 +825,30 @@ async def run_realistic_simulation():
     Run realistic subsidy simulation based on PM-KISAN research findings
     Incorporates real-world challenges: e-KYC barriers, payment delays, digital exclusion
     """
-    triggered_subsidies = []
-    total_challenges = []
+    await sync_rules()
     
-    for rule in rules_db:
-        district = rule["district"]
-        condition = rule["condition"].lower()
-        
-        if district not in MOCK_CONDITIONS:
-            continue
-            
-        district_data = MOCK_CONDITIONS[district]
-        rainfall = district_data["rainfall"]
-        temperature = district_data["temperature"]
-        total_farmers = district_data["farmers"]
-        
-        # Apply research-based reality filters
-        ekyc_rate = district_data["ekyc_completion_rate"]
-        payment_reliability = 1 - district_data["payment_delays"]
-        amount_adequacy = district_data["amount_adequacy"]
-        digital_literacy = district_data["digital_literacy"]
-        biometric_failure = district_data["biometric_failure_rate"]
-        exclusion_errors = district_data["beneficiary_exclusion_errors"]
-        
-        # Weather/condition evaluation (same logic)
-        rule_triggered = False
-        if "rainfall" in condition:
-            if "<" in condition:
-                threshold = int(condition.split("<")[1].strip())
-                rule_triggered = rainfall < threshold
-            elif ">" in condition:
-                threshold = int(condition.split(">")[1].strip())
-                rule_triggered = rainfall > threshold
-        elif "temperature" in condition:
-            if "<" in condition:
-                threshold = int(condition.split("<")[1].strip())
-                rule_triggered = temperature < threshold
-            elif ">" in condition:
-                threshold = int(condition.split(">")[1].strip())
-                rule_triggered = temperature > threshold
-        elif "crop_ndvi" in condition or "ndvi" in condition:
-            if "<" in condition:
-                threshold = float(condition.split("<")[1].strip())
-                rule_triggered = district_data["crop_ndvi"] < threshold
-            elif ">" in condition:
-                threshold = float(condition.split(">")[1].strip())
-                rule_triggered = district_data["crop_ndvi"] > threshold
-        
-        if rule_triggered:
-            # Calculate eligible farmers with realistic barriers
-            base_eligibility = 0.25  # Assume 25% base eligibility
-            
-            # Apply research-based barriers sequentially (multiplicative impact)
-            # 1. e-KYC completion barrier (64.67% lack awareness)
-            eligible_after_ekyc = int(total_farmers * base_eligibility * ekyc_rate)
-            
-            # 2. Biometric authentication failures
-            eligible_after_biometric = int(eligible_after_ekyc * (1 - biometric_failure))
-            
-            # 3. Exclusion errors (deserving farmers excluded due to data issues)
-            eligible_after_exclusion = int(eligible_after_biometric * (1 - exclusion_errors))
-            
-            # 4. Digital literacy barrier (affects ability to navigate system)
-            final_eligible = int(eligible_after_exclusion * 
-                               (0.7 + 0.3 * digital_literacy))  # Minimum 70% can get help
-            
-            # Calculate realistic payout considering amount adequacy
-            base_amount = rule["amount"]
-            # If amount is inadequate, some farmers may not utilize it effectively
-            effective_amount = base_amount * (0.6 + 0.4 * amount_adequacy)
-            
-            # Payment timing issues (56.67% face delays)
-            # Delayed payments reduce effectiveness by 20-40%
-            timing_effectiveness = 0.8 if payment_reliability > 0.6 else 0.6
-            effective_payout = int(final_eligible * effective_amount * timing_effectiveness)
-            
-            triggered_subsidies.append(TriggeredSubsidy(
-                schemeName=rule["schemeName"],
-                condition=rule["condition"],
-                amount=rule["amount"],
-                district=district,
-                eligibleFarmers=final_eligible,
-                totalPayout=effective_payout
-            ))
-            
-            # Track challenges for reporting
-            total_challenges.extend([
-                f"e-KYC barrier: {int(total_farmers * base_eligibility * (1-ekyc_rate))} farmers",
-                f"Biometric failures: {int(eligible_after_ekyc * biometric_failure)} farmers",
-                f"Exclusion errors: {int(eligible_after_biometric * exclusion_errors)} farmers",
-                f"Payment delays affecting {int(final_eligible * (1-payment_reliability))} farmers"
-            ])
+    # Trigger masks, barrier chain and payouts in one vectorized pass over all rules
+    rule_columns = rule_store.columns
+    result = run_realistic_kernel(rule_columns, district_columns)
+    
+    triggered_subsidies = []
+    for i, eligible, payout in zip(result.rule_index.tolist(), result.eligible.tolist(), result.payout.tolist()):
+        rule = rule_columns.rules[i]
+        triggered_subsidies.append(TriggeredSubsidy(
+            schemeName=rule["schemeName"],
+            condition=rule["condition"],
+            amount=rule["amount"],
+            district=rule["district"],
+            eligibleFarmers=eligible,
+            totalPayout=payout
+        ))
+    
+    # Track challenges for reporting (the barrier chain only depends on the district)
+    total_challenges = [
+        challenge
+        for district in set(result.district.tolist())
+        for challenge in barrier_challenges(district_columns, result.barriers, district)
+    ]
     
     # Calculate comprehensive summary with research insights
     total_rules_triggered = len(triggered_subsidies)
@@ -528,14 +856,14 @@ async def run_realistic_simulation():
     total_payout_amount = sum(s.totalPayout for s in triggered_subsidies)
     
     # Calculate system efficiency metrics
-    avg_ekyc = sum(d["ekyc_completion_rate"] for d in MOCK_CONDITIONS.values()) / len(MOCK_CONDITIONS)
-    avg_delays = sum(d["payment_delays"] for d in MOCK_CONDITIONS.values()) / len(MOCK_CONDITIONS)
-    avg_adequacy = sum(d["amount_adequacy"] for d in MOCK_CONDITIONS.values()) / len(MOCK_CONDITIONS)
+    avg_ekyc = sum(d["ekyc_completion_rate"] for d in districts.values()) / len(districts)
+    avg_delays = sum(d["payment_delays"] for d in districts.values()) / len(districts)
+    avg_adequacy = sum(d["amount_adequacy"] for d in districts.values()) / len(districts)
     
-    primary_district = "Ahmedabad"
-    conditions = MOCK_CONDITIONS[primary_district]
+    primary_district = primary_district_name()
+    conditions = districts[primary_district]
     
-    return SimulationResponse(
+    simulation = SimulationResponse(
         timestamp=datetime.now(),
         conditions={
             "rainfall": conditions["rainfall"],
@@ -562,13 +890,157 @@ async def run_realistic_simulation():
             "realWorldChallenges": len(set(total_challenges))
         }
     )
+    await storage.record_simulation("realistic", simulation.summary)
+    
+    return simulation
+
+@app.post("/simulate-realistic/monte-carlo")
+async def run_monte_carlo_simulation(request: MonteCarloRequest):
+    """
+    Payout exposure of the realistic simulation: barrier rates and eligibility are sampled over
+    many trials and P50/P90/P99 (or requested) payouts returned per scheme, district and overall
+    """
+    if not 1 <= request.trials <= MONTE_CARLO_MAX_TRIALS:
+        raise HTTPException(status_code=400, detail=f"trials must be between 1 and {MONTE_CARLO_MAX_TRIALS}")
+    if not request.quantiles or not all(0 < q < 1 for q in request.quantiles):
+        raise HTTPException(status_code=400, detail="quantiles must be between 0 and 1 (exclusive)")
+    await sync_rules()
+    
+    result = run_realistic_kernel(rule_store.columns, district_columns)
+    model = PayoutModel(result, rule_store.columns, district_columns)
+    # Reproducible: the same seed, trial count and rules give the same quantiles on any worker
+    seed = request.seed if request.seed is not None else (int(SIMULATION_SEED) if SIMULATION_SEED else random.getrandbits(63))
+    distribution = await monte_carlo.run(model, request.trials, seed, request.quantiles)
+    distribution["point_estimate"] = int(result.payout.sum())
+    return distribution
+
+@app.get("/simulations/history")
+async def get_simulation_history(limit: int = 20):
+    """Get the most recent simulation runs recorded by any worker"""
+    return await storage.recent_simulations(min(max(limit, 1), 500))
+
+async def read_ledger(fn, *args):
+    """Ledger reads run in a thread: they may wait for a batch another request is writing"""
+    try:
+        return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+    except LedgerError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+@app.get("/ledger")
+async def get_ledger_head():
+    """Entry and batch counts and the hash of the latest batch (the ledger head)"""
+    return await read_ledger(ledger.head)
+
+@app.get("/ledger/entries/{seq}")
+async def get_ledger_entry(seq: int):
+    """One recorded disbursement"""
+    return await read_ledger(ledger.entry, seq)
+
+@app.get("/ledger/batches/{number}")
+async def get_ledger_batch(number: int):
+    """Batch header: entry range, Merkle root, previous and own batch hash"""
+    return await read_ledger(ledger.batch, number)
+
+@app.get("/ledger/proof/{seq}")
+async def get_ledger_proof(seq: int):
+    """Inclusion proof of a disbursement: the entry, its Merkle audit path and its batch header"""
+    return await read_ledger(ledger.proof, seq)
+
+@app.post("/ledger/verify")
+async def verify_ledger_proof(proof: dict):
+    """Check an inclusion proof (as returned by /ledger/proof/{seq}) against this ledger"""
+    try:
+        return await read_ledger(ledger.verify, proof)
+    except (KeyError, TypeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=f"Malformed proof: {e!r}")
+
+async def current_payouts(simulation_type: str) -> list:
+    """(rule, eligible farmers, payout) of every subsidy the simulation currently triggers"""
+    await sync_rules()
+    if simulation_type == "basic":
+        return list(simulation_state.triggered())
+    if simulation_type == "realistic":
+        rule_columns = rule_store.columns
+        result = run_realistic_kernel(rule_columns, district_columns)
+        return [(rule_columns.rules[i], eligible, payout) for i, eligible, payout in
+                zip(result.rule_index.tolist(), result.eligible.tolist(), result.payout.tolist())]
+    raise HTTPException(status_code=400, detail=f"Unknown simulation_type '{simulation_type}', expected basic or realistic")
+
+async def disbursement_status(run_id: str) -> dict:
+    run = await storage.get_disbursement_run(run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail=f"Disbursement run '{run_id}' not found")
+    done = run["chunk_status"].get("done", 0)
+    run["progress"] = round(done / run["chunks"], 4) if run["chunks"] else 1.0
+    run["executing_here"] = run_id in disbursements.running()
+    return run
+
+@app.post("/disbursements", status_code=202)
+async def create_disbursement_run(request: Request, body: DisbursementRequest):
+    """
+    Turn the currently triggered subsidies into per-farmer payment instructions and submit them to the
+    bank in chunked files (in the background). Send an Idempotency-Key header to make retries safe:
+    a key that was used before returns that run instead of starting another
+    """
+    chunk_size = body.chunk_size or DBT_CHUNK_SIZE
+    if not 1 <= chunk_size <= DBT_MAX_CHUNK_SIZE:
+        raise HTTPException(status_code=400, detail=f"chunk_size must be between 1 and {DBT_MAX_CHUNK_SIZE}")
+    run_id = request.headers.get("idempotency-key") or uuid.uuid4().hex
+    if len(run_id) > 64 or not run_id.replace("-", "").replace("_", "").isalnum():
+        raise HTTPException(status_code=400, detail="Idempotency-Key must be up to 64 letters, digits, '-' or '_'")
+    if await storage.get_disbursement_run(run_id) is None:
+        allocations = allocations_from(await current_payouts(body.simulation_type))
+        await disbursements.create(run_id, body.simulation_type, allocations, chunk_size)
+    return await disbursement_status(run_id)
+
+@app.get("/disbursements")
+async def list_disbursement_runs(limit: int = Query(20, ge=1, le=500)):
+    """Most recent disbursement runs with their progress"""
+    return await storage.recent_disbursement_runs(limit)
+
+@app.get("/disbursements/{run_id}")
+async def get_disbursement_run(run_id: str):
+    """Progress of a run: chunks by status, attempts, instructions and amount accepted by the bank"""
+    return await disbursement_status(run_id)
+
+@app.get("/disbursements/{run_id}/chunks")
+async def get_disbursement_chunks(
+    run_id: str,
+    status: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0)
+):
+    """Checkpointed chunks of a run (bank reference, attempts, rejected instructions, last error)"""
+    await disbursement_status(run_id)
+    return await storage.disbursement_chunks(run_id, status, limit, offset)
+
+@app.get("/disbursements/{run_id}/chunks/{chunk}/file")
+async def get_disbursement_file(run_id: str, chunk: int):
+    """The payment file of one chunk, exactly as it is (or was) submitted to the bank"""
+    run = await disbursement_status(run_id)
+    plan = PaymentPlan(run_id, await storage.get_disbursement_allocations(run_id), run["chunk_size"])
+    try:
+        return await asyncio.get_running_loop().run_in_executor(None, plan.payment_file, chunk)
+    except IndexError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+@app.post("/disbursements/{run_id}/resume", status_code=202)
+async def resume_disbursement_run(run_id: str):
+    """Resubmit every chunk not yet done (failed ones included); no-op while another worker holds the run"""
+    await disbursement_status(run_id)
+    disbursements.start(run_id, restart=True)
+    return await disbursement_status(run_id)
 
 @app.get("/analytics/districts")
-async def get_district_analytics():
-    """Get comprehensive analytics data for all districts"""
+async def get_district_analytics(request: Request):
+    """Get comprehensive analytics data for all districts (304 if unchanged since the client's ETag)"""
+    return derived_metrics.response(request, "analytics/districts", build_district_analytics)
+
+def build_district_analytics():
     enhanced_analytics = {}
+    risk_scores = district_risk_scores()
     
-    for district, data in MOCK_CONDITIONS.items():
+    for district, data in districts.items():
         enhanced_analytics[district] = {
             **data,
             "data_sources": {
@@ -577,12 +1049,18 @@ async def get_district_analytics():
                 "satellite": "EOSDA NDVI",
                 "market": "AGMARKNET"
             },
-            "last_updated": datetime.now().isoformat(),
-            "risk_score": calculate_risk_score(data)
+            "last_updated": district_data_updated_at(),
+            "risk_score": risk_scores[district]
         }
     
     return enhanced_analytics
 
+def district_risk_scores():
+    """Risk score of every district for the current district data"""
+    return derived_metrics.value("risk_scores", lambda: {
+        district: calculate_risk_score(data) for district, data in districts.items()
+    })
+
 def calculate_risk_score(district_data):
     """Calculate risk score based on multiple factors"""
     risk_factors = []
@@ -611,23 +1089,112 @@ def calculate_risk_score(district_data):
         "level": "high" if len(risk_factors) >= 3 else "medium" if len(risk_factors) >= 1 else "low"
     }
 
+@app.patch("/conditions/{district}")
+async def update_district_conditions(district: str, updates: dict):
+    """
+    Update a district's conditions (e.g. an hourly weather feed) and re-simulate incrementally:
+    only rules of this district that read a changed metric are re-evaluated.
+    The merged conditions are stored, and the other workers apply them on their next sync.
+    """
+    if district not in districts:
+        raise HTTPException(status_code=404, detail="District not found")
+    
+    await sync_rules()
+    async with conditions_sync_lock:
+        try:
+            record = merge_conditions(districts[district], updates)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        seq, changed_at = await storage.record_condition_change(district, record)
+        update = apply_conditions(district, record, changed_at)
+        # A change stored in between by another worker is synced later, then this one again over it
+        if seq == districts.synced_seq + 1:
+            districts.synced_seq = seq
+    publish_simulation_changes()
+    return {
+        "district": district,
+        "conditions": record,
+        "resimulation": update,
+        "district_totals": simulation_state.district_totals.get(district, {"rules": 0, "farmers": 0, "payout": 0}),
+        "totals": simulation_state.totals
+    }
+
+@app.post("/districts/reload")
+async def reload_district_data(force: bool = False):
+    """
+    Re-read the district source now if it changed (``force``: always, dropping the stored PATCHed
+    conditions). Runs on the worker that receives it; the others pick the file up on their next check.
+    """
+    try:
+        reloaded = await reload_districts(force)
+    except DistrictDataError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"reloaded": reloaded, **districts.stats()}
+
+@app.get("/events/stream")
+async def stream_events(request: Request, last_event_id: Optional[str] = None):
+    """
+    Server-sent events instead of dashboard polling. A new connection gets a "snapshot"
+    (totals, per-district totals and risk scores), then only changes: "triggers" (changed and
+    removed triggered subsidies with summary deltas), "district" (risk score changes) and
+    "reset" (rule set reloaded). Reconnecting clients resume from Last-Event-ID; "resync"
+    means they fell too far behind (or their id came from another worker or before a
+    restart) and should refetch /simulate.
+    """
+    if last_event_id is None:
+        last_event_id = request.headers.get("last-event-id") or None
+    await sync_rules()
+    subscriber = change_feed.subscribe(last_event_id)
+    snapshot = None
+    if last_event_id is None:
+        snapshot = encode_event(change_feed.event_id(), "snapshot", {
+            "totals": simulation_state.totals,
+            "district_totals": simulation_state.district_totals,
+            "district_risk": district_risk_scores()
+        })
+    
+    async def frames():
+        try:
+            yield b"retry: 3000\n\n"
+            if snapshot is not None:
+                yield snapshot
+            while True:
+                frame = await subscriber.next_frame(SSE_HEARTBEAT_SECONDS)
+                yield frame if frame is not None else b": keep-alive\n\n"
+        finally:
+            change_feed.unsubscribe(subscriber)
+    
+    return StreamingResponse(frames(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
     return {
         "status": "healthy",
         "timestamp": datetime.now(),
-        "active_rules": len(rules_db)
+        "active_rules": len(rule_store),
+        "caches": {"weather": weather_cache.stats(), "ai_insights": ai_cache.stats()},
+        "ai_gateway": ai_gateway.stats(),
+        "event_stream": {"subscribers": len(change_feed), "last_event_id": change_feed.event_id(), **change_feed.stats},
+        "derived_metrics": {"version": derived_metrics.version, **derived_metrics.stats},
+        "static_responses": static_responses.stats,
+        "districts": districts.stats(),
+        "satellite_fields": field_store.stats(),
+        "fraud_scoring": transaction_scorer.describe(),
+        "fraud_rings": ring_graph.stats(),
+        "ledger": {"entries": len(ledger), **ledger.stats},
+        "disbursements": {"running": disbursements.running(), **disbursements.stats}
     }
 
 # Future extension endpoints (placeholders)
 @app.get("/weather/{district}")
 async def get_weather_data(district: str):
     """Get comprehensive weather data with real API integration context"""
-    if district not in MOCK_CONDITIONS:
+    if district not in districts:
         raise HTTPException(status_code=404, detail="District not found")
     
-    district_data = MOCK_CONDITIONS[district]
+    district_data = districts[district]
     
     return {
         "district": district,
@@ -663,10 +1230,10 @@ async def get_weather_data(district: str):
 @app.get("/soil-health/{district}")
 async def get_soil_health_data(district: str, farmer_id: Optional[str] = None, plot_id: Optional[str] = None):
     """Get soil health data via Krishi-DSS integration"""
-    if district not in MOCK_CONDITIONS:
+    if district not in districts:
         raise HTTPException(status_code=404, detail="District not found")
     
-    soil_data = MOCK_CONDITIONS[district]["soil_health"]
+    soil_data = districts[district]["soil_health"]
     
     return {
         "district": district,
@@ -698,7 +1265,7 @@ async def get_soil_health_data(district: str, farmer_id: Optional[str] = None, p
 @app.get("/crop-data/{district}")
 async def get_crop_data(district: str, farmer_id: Optional[str] = None, season: Optional[str] = None):
     """Get crop sown data via AgriStack UFSI API"""
-    if district not in MOCK_CONDITIONS:
+    if district not in districts:
         raise HTTPException(status_code=404, detail="District not found")
     
     current_season = season or "Kharif-2024"
@@ -717,7 +1284,7 @@ async def get_crop_data(district: str, farmer_id: Optional[str] = None, season:
             "insurance_coverage": random.choice([True, False])
         },
         "ndvi_data": {
-            "current_value": MOCK_CONDITIONS[district]["crop_ndvi"],
+            "current_value": districts[district]["crop_ndvi"],
             "trend": random.choice(["improving", "stable", "declining"]),
             "satellite_source": "EOSDA Crop Monitoring"
         },
@@ -733,10 +1300,10 @@ async def get_crop_data(district: str, farmer_id: Optional[str] = None, season:
 @app.get("/satellite-data/{district}")
 async def get_satellite_data(district: str, polygon: Optional[str] = None):
     """Get satellite crop health data (NDVI) from multiple providers"""
-    if district not in MOCK_CONDITIONS:
+    if district not in districts:
         raise HTTPException(status_code=404, detail="District not found")
     
-    ndvi_value = MOCK_CONDITIONS[district]["crop_ndvi"]
+    ndvi_value = districts[district]["crop_ndvi"]
     
     return {
         "district": district,
@@ -768,85 +1335,60 @@ async def get_satellite_data(district: str, polygon: Optional[str] = None):
     }
 
 @app.get("/satellite/realtime/{district}")
-async def get_realtime_satellite_data(district: str):
+async def get_realtime_satellite_data(district: str, offset: int = Query(0, ge=0),
+                                      limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)):
     """Get real-time satellite data with detailed analytics and visualizations"""
-    if district not in MOCK_CONDITIONS:
+    if district not in districts:
         raise HTTPException(status_code=404, detail="District not found")
     
-    district_data = MOCK_CONDITIONS[district]
-    base_ndvi = district_data["crop_ndvi"]
-    
-    # Generate realistic real-time satellite data
     current_timestamp = datetime.now()
+    fields = satellite_fields()
     
-    # Create multiple field data points for visualization
-    field_data = []
-    for i in range(12):  # 12 different field segments
-        field_ndvi = base_ndvi + random.uniform(-0.25, 0.25)
-        field_ndvi = max(0.0, min(1.0, field_ndvi))  # Clamp between 0-1
-        
-        field_data.append({
-            "field_id": f"FIELD_{district[:3].upper()}_{i+1:03d}",
-            "coordinates": {
-                "lat": 28.5 + random.uniform(-2, 2),
-                "lng": 77.2 + random.uniform(-3, 3)
-            },
-            "ndvi": round(field_ndvi, 3),
-            "area_hectares": round(random.uniform(0.5, 8.0), 2),
-            "crop_type": random.choice(["Rice", "Wheat", "Cotton", "Sugarcane", "Maize"]),
-            "health_status": "excellent" if field_ndvi > 0.8 else "good" if field_ndvi > 0.6 else "moderate" if field_ndvi > 0.4 else "poor",
-            "stress_indicators": {
-                "water_stress": random.choice([True, False]) if field_ndvi < 0.6 else False,
-                "nutrient_deficiency": random.choice([True, False]) if field_ndvi < 0.5 else False,
-                "pest_damage": random.choice([True, False]) if field_ndvi < 0.4 else False
-            },
-            "last_captured": (current_timestamp - timedelta(minutes=random.randint(5, 180))).isoformat()
-        })
+    # District-wide statistics are precomputed per load; only the requested page of fields is materialized
+    summary = fields.district_summary(district)
+    part = fields.district_slice(district)
+    page = slice(min(part.start + offset, part.stop), min(part.start + offset + limit, part.stop))
+    field_data = fields.records(page)
     
-    # Calculate district-wide statistics
-    avg_ndvi = sum(field["ndvi"] for field in field_data) / len(field_data)
-    total_area = sum(field["area_hectares"] for field in field_data)
-    
-    health_distribution = {
-        "excellent": len([f for f in field_data if f["health_status"] == "excellent"]),
-        "good": len([f for f in field_data if f["health_status"] == "good"]),
-        "moderate": len([f for f in field_data if f["health_status"] == "moderate"]),
-        "poor": len([f for f in field_data if f["health_status"] == "poor"])
-    }
+    total_fields = summary["fields"]
+    water_stressed = summary["stress"]["water_stress"]
+    nutrient_deficient = summary["stress"]["nutrient_deficiency"]
     
     return {
         "district": district,
         "timestamp": current_timestamp.isoformat(),
         "satellite_overview": {
-            "total_fields_monitored": len(field_data),
-            "total_area_hectares": round(total_area, 2),
-            "average_ndvi": round(avg_ndvi, 3),
-            "district_health_score": round(avg_ndvi * 100, 1),
+            "total_fields_monitored": total_fields,
+            "total_area_hectares": summary["area_hectares"],
+            "average_ndvi": summary["average_ndvi"],
+            "district_health_score": round(summary["average_ndvi"] * 100, 1),
             "coverage_percentage": 98.7,
             "image_resolution": "10m x 10m per pixel",
             "cloud_coverage": f"{random.randint(3, 15)}%"
         },
         "field_data": field_data,
-        "health_distribution": health_distribution,
+        "paging": {"offset": offset, "limit": limit, "returned": len(field_data), "total": total_fields},
+        "health_distribution": summary["health_distribution"],
         "alerts": [
             {
                 "type": "water_stress",
-                "affected_fields": len([f for f in field_data if f["stress_indicators"]["water_stress"]]),
-                "severity": "medium" if len([f for f in field_data if f["stress_indicators"]["water_stress"]]) > 3 else "low",
+                "affected_fields": water_stressed,
+                # Share of fields (was an absolute count of 3 / 4 of the 12 sampled fields)
+                "severity": "medium" if water_stressed > total_fields * 0.25 else "low",
                 "recommendation": "Increase irrigation frequency in affected areas"
             },
             {
                 "type": "nutrient_deficiency", 
-                "affected_fields": len([f for f in field_data if f["stress_indicators"]["nutrient_deficiency"]]),
-                "severity": "high" if len([f for f in field_data if f["stress_indicators"]["nutrient_deficiency"]]) > 4 else "medium",
+                "affected_fields": nutrient_deficient,
+                "severity": "high" if nutrient_deficient > total_fields / 3 else "medium",
                 "recommendation": "Apply balanced NPK fertilizer"
             }
         ],
         "subsidy_recommendations": {
-            "drought_relief_eligible": len([f for f in field_data if f["ndvi"] < 0.5]),
-            "fertilizer_subsidy_eligible": len([f for f in field_data if f["stress_indicators"]["nutrient_deficiency"]]),
-            "crop_insurance_claims": len([f for f in field_data if f["ndvi"] < 0.4]),
-            "estimated_relief_amount": sum([5000 for f in field_data if f["ndvi"] < 0.5]) + sum([3000 for f in field_data if f["stress_indicators"]["nutrient_deficiency"]])
+            "drought_relief_eligible": summary["critical_fields"],
+            "fertilizer_subsidy_eligible": nutrient_deficient,
+            "crop_insurance_claims": summary["severe_fields"],
+            "estimated_relief_amount": 5000 * summary["critical_fields"] + 3000 * nutrient_deficient
         },
         "data_sources": {
             "primary_satellite": "Sentinel-2 (ESA)",
@@ -874,17 +1416,44 @@ async def get_realtime_satellite_data(district: str):
         }
     }
 
+@app.get("/satellite/fields")
+async def query_satellite_fields(bbox: Optional[str] = None, polygon: Optional[str] = None,
+                                 district: Optional[str] = None, offset: int = Query(0, ge=0),
+                                 limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)):
+    """Fields inside a region (``bbox=min_lng,min_lat,max_lng,max_lat`` and/or ``polygon=lng lat,lng lat,...``)"""
+    if bbox is None and polygon is None and district is None:
+        raise HTTPException(status_code=400, detail="Give a bbox, a polygon or a district")
+    if district is not None and district not in districts:
+        raise HTTPException(status_code=404, detail="District not found")
+    try:
+        box = parse_bbox(bbox) if bbox is not None else None
+        outline = parse_polygon(polygon) if polygon is not None else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    started = time.perf_counter()
+    fields = satellite_fields()
+    matches = fields.query(bbox=box, polygon=outline, district=district)
+    field_data = fields.records(matches[offset:offset + limit])
+    return {
+        "query": {"bbox": box, "polygon": outline, "district": district},
+        "summary": fields.summary(matches),
+        "field_data": field_data,
+        "paging": {"offset": offset, "limit": limit, "returned": len(field_data), "total": len(matches)},
+        "query_ms": round((time.perf_counter() - started) * 1000, 2)
+    }
+
 @app.get("/market-prices/{district}")
 async def get_market_prices(district: str, commodity: Optional[str] = None):
     """Get market commodity prices from AGMARKNET and e-NAM"""
-    if district not in MOCK_CONDITIONS:
+    if district not in districts:
         raise HTTPException(status_code=404, detail="District not found")
     
     commodities = ["Rice", "Wheat", "Cotton", "Sugarcane", "Onion", "Tomato"]
     selected_commodity = commodity or random.choice(commodities)
     
     base_price = random.randint(1500, 5000)
-    trend = MOCK_CONDITIONS[district]["market_price_trend"]
+    trend = districts[district]["market_price_trend"]
     
     return {
         "district": district,
@@ -920,8 +1489,11 @@ async def get_market_prices(district: str, commodity: Optional[str] = None):
     }
 
 @app.get("/research-insights")
-async def get_research_insights():
+async def get_research_insights(request: Request):
     """Get key insights from Agricultural Subsidy Fintech Platform Design research"""
+    return static_responses.response(request, "research-insights", build_research_insights)
+
+def build_research_insights():
     return {
         "research_title": "A Unified FinTech Architecture for India's Agricultural Subsidy Ecosystem",
         "key_findings": {
@@ -962,43 +1534,278 @@ async def get_research_insights():
         }
     }
 
+# Duplicate screening: flagged pairs listed per response (all are counted)
+FRAUD_MAX_PAIRS = 1000
+
 @app.post("/fraud-detection")
-async def detect_fraud():
-    """AI-based fraud detection (placeholder)"""
+async def detect_fraud(
+    request: Request,
+    fmt: Optional[str] = Query(None, alias="format"),
+    threshold: float = Query(SIMILARITY_THRESHOLD, gt=0, le=1),
+    max_pairs: int = Query(FRAUD_MAX_PAIRS, ge=0),
+    max_errors: int = BULK_MAX_ERRORS
+):
+    """Screen beneficiary records (NDJSON or CSV, one per line) for duplicate registrations"""
+    try:
+        fmt = detect_format(request.headers.get("content-type", ""), fmt)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    started = time.perf_counter()
+    loop = asyncio.get_running_loop()
+    screen = DuplicateScreen(threshold)
+    rows_received = rows_rejected = 0
+    errors = []
+    
+    async for row_number, record, error in iter_records(request.stream(), fmt):
+        rows_received += 1
+        if error is None:
+            try:
+                screen.add(record, default_id=f"row-{row_number}")
+            except ValueError as e:
+                error = str(e)
+        if error is not None:
+            rows_rejected += 1
+            if len(errors) < max_errors:
+                errors.append({"row": row_number, "error": error})
+            continue
+        # MinHash signatures are computed per chunk in a thread, keeping the event loop free
+        if screen.pending >= DEDUP_CHUNK_SIZE:
+            await loop.run_in_executor(None, screen.sign)
+    
+    pairs = await loop.run_in_executor(None, screen.find_pairs)
+    flagged = {index for pair in pairs for index in (pair.first, pair.second)}
+    signals = {}
+    for pair in pairs:
+        for signal in pair.signals:
+            signals[signal] = signals.get(signal, 0) + 1
+    
+    duration = time.perf_counter() - started
     return {
         "status": "analyzed",
-        "fraudulent_applications": random.randint(0, 5),
-        "confidence_score": random.uniform(0.85, 0.99),
-        "note": "Mock AI fraud detection - integrate ML model in production"
+        "format": fmt,
+        "records_screened": len(screen),
+        "rows_rejected": rows_rejected,
+        "errors": errors,
+        "errors_truncated": rows_rejected > len(errors),
+        "fraudulent_applications": len(flagged),
+        "duplicate_pairs": len(pairs),
+        "signals": signals,
+        "pairs": [screen.describe(pair) for pair in pairs[:max_pairs]],
+        "pairs_truncated": len(pairs) > max_pairs,
+        "screening": {"similarity_threshold": threshold, **screen.stats},
+        "duration_seconds": round(duration, 3),
+        "records_per_second": round(len(screen) / duration) if duration > 0 else 0
     }
 
+def refresh_scheme_caps():
+    """A scheme's cap is the largest amount any of its rules pays a farmer"""
+    if transaction_scorer.caps_version == rule_store.version:
+        return
+    caps = {}
+    for rule in rule_store.all():
+        caps[rule["schemeName"]] = max(caps.get(rule["schemeName"], 0), rule["amount"])
+    transaction_scorer.set_caps(caps, rule_store.version)
+
+@app.post("/fraud-detection/transactions")
+async def score_transactions(
+    request: Request,
+    fmt: Optional[str] = Query(None, alias="format"),
+    max_flagged: int = Query(FRAUD_MAX_PAIRS, ge=0),
+    max_errors: int = BULK_MAX_ERRORS
+):
+    """Score payout / rule_created events (NDJSON or CSV, one per line) as they stream in"""
+    try:
+        fmt = detect_format(request.headers.get("content-type", ""), fmt)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    await sync_rules()
+    refresh_scheme_caps()
+    started = time.perf_counter()
+    events_scored = rows_rejected = 0
+    errors = []
+    flagged = []
+    flagged_count = 0
+    signals = {}
+    
+    async for row_number, record, error in iter_records(request.stream(), fmt):
+        if error is None:
+            try:
+                scored = transaction_scorer.score(record)
+            except (TypeError, ValueError) as e:
+                error = str(e)
+        if error is not None:
+            rows_rejected += 1
+            if len(errors) < max_errors:
+                errors.append({"row": row_number, "error": error})
+            continue
+        events_scored += 1
+        if scored["flagged"]:
+            flagged_count += 1
+            for signal in scored["signals"]:
+                signals[signal] = signals.get(signal, 0) + 1
+            if len(flagged) < max_flagged:
+                flagged.append({"row": row_number, "event": record, **scored})
+    
+    duration = time.perf_counter() - started
+    return {
+        "format": fmt,
+        "events_scored": events_scored,
+        "rows_rejected": rows_rejected,
+        "errors": errors,
+        "errors_truncated": rows_rejected > len(errors),
+        "events_flagged": flagged_count,
+        "signals": signals,
+        "flagged": flagged,
+        "flagged_truncated": flagged_count > len(flagged),
+        "scorer": transaction_scorer.describe(),
+        "duration_seconds": round(duration, 3),
+        "events_per_second": round(events_scored / duration) if duration > 0 else 0
+    }
+
+@app.get("/fraud-detection/alerts")
+async def get_fraud_alerts(limit: int = Query(100, ge=1, le=1000)):
+    """Most recent flagged events, newest first"""
+    return {"alerts": transaction_scorer.recent_alerts(limit), "scorer": transaction_scorer.describe()}
+
+def district_payout_exposure() -> dict:
+    """Per-farmer amount of every subsidy currently triggered in each district"""
+    exposure = {}
+    for rule, _, _ in simulation_state.triggered():
+        exposure[rule["district"]] = exposure.get(rule["district"], 0) + rule["amount"]
+    return exposure
+
+async def rank_fraud_rings(min_size: int, top: int, sort: str) -> dict:
+    await sync_rules()
+    snapshot = ring_graph.snapshot()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(
+            None, rank_rings, snapshot, district_payout_exposure(), min_size, top, sort)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+async def sync_ring_graph():
+    """Merge ring records stored by any worker since this worker's last sync; start over after a clear"""
+    global ring_graph
+    async with ring_sync_lock:
+        while True:
+            oldest, rows = await storage.ring_records_since(ring_graph.synced_seq)
+            if ring_graph.first_seq is not None and oldest != ring_graph.first_seq:
+                ring_graph = RingGraph()
+                continue
+            if not rows:
+                return
+            if ring_graph.first_seq is None:
+                ring_graph.first_seq = rows[0][0]
+            for seq, beneficiary_id, district, keys in rows:
+                ring_graph.add_keys(beneficiary_id or f"record-{seq}", district, keys)
+            ring_graph.synced_seq = rows[-1][0]
+
+@app.post("/fraud-detection/rings")
+async def add_ring_records(
+    request: Request,
+    fmt: Optional[str] = Query(None, alias="format"),
+    min_size: int = Query(MIN_RING_SIZE, ge=2),
+    top: int = Query(RING_TOP, ge=0, le=1000),
+    sort: str = "exposure",
+    max_errors: int = BULK_MAX_ERRORS
+):
+    """Store beneficiary records (NDJSON or CSV, one per line), merge them into the ring graph and rank the rings"""
+    try:
+        fmt = detect_format(request.headers.get("content-type", ""), fmt)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if sort not in RING_SORT_KEYS:
+        raise HTTPException(status_code=400, detail=f"Unknown sort '{sort}', expected one of {', '.join(RING_SORT_KEYS)}")
+    
+    started = time.perf_counter()
+    records_added = rows_rejected = 0
+    errors = []
+    batch = []
+    
+    async for row_number, record, error in iter_records(request.stream(), fmt):
+        if error is None:
+            try:
+                batch.append(ring_record(record))
+            except ValueError as e:
+                error = str(e)
+        if error is not None:
+            rows_rejected += 1
+            if len(errors) < max_errors:
+                errors.append({"row": row_number, "error": error})
+        if len(batch) >= BULK_BATCH_SIZE:
+            records_added += await storage.insert_ring_records(batch)
+            batch = []
+    
+    if batch:
+        records_added += await storage.insert_ring_records(batch)
+    await sync_ring_graph()
+    merged = time.perf_counter() - started
+    ranking = await rank_fraud_rings(min_size, top, sort)
+    return {
+        "format": fmt,
+        "records_added": records_added,
+        "rows_rejected": rows_rejected,
+        "errors": errors,
+        "errors_truncated": rows_rejected > len(errors),
+        "graph": ring_graph.stats(),
+        **ranking,
+        "duration_seconds": round(time.perf_counter() - started, 3),
+        "records_per_second": round(records_added / merged) if merged > 0 else 0
+    }
+
+@app.get("/fraud-detection/rings")
+async def get_fraud_rings(
+    min_size: int = Query(MIN_RING_SIZE, ge=2),
+    top: int = Query(RING_TOP, ge=0, le=1000),
+    sort: str = "exposure"
+):
+    """Rings among every record stored so far, by payout exposure (or size)"""
+    await sync_ring_graph()
+    return {"graph": ring_graph.stats(), **await rank_fraud_rings(min_size, top, sort)}
+
+@app.delete("/fraud-detection/rings")
+async def clear_fraud_rings():
+    """Drop every stored record; each worker's graph starts over on its next sync"""
+    records = await storage.clear_ring_records()
+    await sync_ring_graph()
+    return {"message": "Ring graph cleared", "records_removed": records}
+
+def normalize_location(location: str) -> str:
+    return " ".join(location.replace(",", ", ").split()).lower()
+
 @app.get("/weather/{location}")
 async def get_live_weather(location: str):
-    """Get live weather data from WeatherAPI.com"""
+    """Get live weather data from WeatherAPI.com (cached for WEATHER_CACHE_TTL seconds)"""
     if not WEATHER_API_KEY:
         raise HTTPException(status_code=500, detail="Weather API key not configured")
     
+    return await weather_cache.get_or_fetch(normalize_location(location), lambda: fetch_live_weather(location))
+
+async def fetch_live_weather(location: str) -> WeatherData:
+    """Call WeatherAPI.com for the current conditions at a location"""
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"http://api.weatherapi.com/v1/current.json?key={WEATHER_API_KEY}&q={location}&aqi=yes"
+        response = await http_client.get(
+            REAL_DATA_SOURCES["weather"]["endpoints"]["weatherapi"],
+            params={"key": WEATHER_API_KEY, "q": location, "aqi": "yes"}
+        )
+        
+        if response.status_code == 200:
+            data = response.json()
+            weather_data = WeatherData(
+                location=data["location"]["name"] + ", " + data["location"]["region"],
+                temperature=data["current"]["temp_c"],
+                humidity=data["current"]["humidity"],
+                precipitation=data["current"]["precip_mm"],
+                wind_speed=data["current"]["wind_kph"],
+                condition=data["current"]["condition"]["text"],
+                uv_index=data["current"]["uv"],
+                pressure=data["current"]["pressure_mb"]
             )
-            
-            if response.status_code == 200:
-                data = response.json()
-                weather_data = WeatherData(
-                    location=data["location"]["name"] + ", " + data["location"]["region"],
-                    temperature=data["current"]["temp_c"],
-                    humidity=data["current"]["humidity"],
-                    precipitation=data["current"]["precip_mm"],
-                    wind_speed=data["current"]["wind_kph"],
-                    condition=data["current"]["condition"]["text"],
-                    uv_index=data["current"]["uv"],
-                    pressure=data["current"]["pressure_mb"]
-                )
-                return weather_data
-            else:
-                raise HTTPException(status_code=response.status_code, detail="Weather API error")
+            return weather_data
+        else:
+            raise HTTPException(status_code=response.status_code, detail="Weather API error")
                 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Weather API unavailable: {str(e)}")
@@ -1023,14 +1830,22 @@ async def get_district_weather(district: str):
 async def generate_ai_insights(simulation_data: dict):
     """Generate AI-powered insights using Gemini"""
     try:
+        # Prompt inputs; the cached AI response is keyed on exactly these
+        prompt_inputs = {
+            "districts": list(simulation_data.get('conditions', {}).keys()),
+            "triggered": len(simulation_data.get('triggeredSubsidies', [])),
+            "eligible_farmers": simulation_data.get('summary', {}).get('totalEligibleFarmers', 0),
+            "total_payout": simulation_data.get('summary', {}).get('totalPayout', 0)
+        }
+        
         # Prepare context for AI analysis
         context = f"""
         Agricultural Subsidy Simulation Analysis:
         
-        Districts analyzed: {list(simulation_data.get('conditions', {}).keys())}
-        Triggered subsidies: {len(simulation_data.get('triggeredSubsidies', []))}
-        Total farmers affected: {simulation_data.get('summary', {}).get('totalEligibleFarmers', 0)}
-        Total payout: ₹{simulation_data.get('summary', {}).get('totalPayout', 0):,}
+        Districts analyzed: {prompt_inputs['districts']}
+        Triggered subsidies: {prompt_inputs['triggered']}
+        Total farmers affected: {prompt_inputs['eligible_farmers']}
+        Total payout: ₹{prompt_inputs['total_payout']:,}
         
         Key challenges identified:
         - e-KYC completion gaps
@@ -1043,11 +1858,9 @@ async def generate_ai_insights(simulation_data: dict):
         Generate specific, actionable insights for improving subsidy delivery and farmer outcomes.
         """
         
-        # Generate insights using Gemini
-        if model:
-            response = model.generate_content(context)
-            ai_text = response.text
-        else:
+        # Generate insights using Gemini (or reuse the cached response for identical inputs)
+        ai_text = await ai_cache.get_or_generate("simulation", prompt_inputs, lambda: ai_gateway.generate_text(context))
+        if ai_text is None:
             ai_text = "AI service unavailable - using fallback analysis based on simulation data."
         
         # Parse and structure the AI response into categories
@@ -1148,76 +1961,196 @@ async def generate_ai_insights(simulation_data: dict):
             }
         }
 
+async def run_stage(name: str, stage, started: float, stages: dict):
+    """Await one /simulate-enhanced stage under its timeout, recording its timing in ``stages``; None on failure"""
+    stage_started = time.perf_counter()
+    record = {"status": "ok", "started_ms": round((stage_started - started) * 1000, 2)}
+    try:
+        return await asyncio.wait_for(stage, timeout=ENHANCED_STAGE_TIMEOUTS[name])
+    except asyncio.TimeoutError:
+        record.update(status="timeout", error=f"Timed out after {ENHANCED_STAGE_TIMEOUTS[name]}s")
+    except HTTPException as e:
+        record.update(status="failed", error=str(e.detail))
+    except Exception as e:
+        record.update(status="failed", error=str(e))
+    finally:
+        finished = time.perf_counter()
+        record["duration_ms"] = round((finished - stage_started) * 1000, 2)
+        record["finished_ms"] = round((finished - started) * 1000, 2)
+        stages[name] = record
+    return None
+
 @app.post("/simulate-enhanced")
 async def simulate_enhanced_subsidies(request: EnhancedSimulationRequest = None):
-    """Enhanced simulation with live weather data and AI insights"""
+    """
+    Enhanced simulation with live weather data and AI insights
+    Simulation and weather run concurrently; AI insights need both. Weather and AI are
+    non-critical: if either fails or times out, a partial result is returned.
+    """
     try:
         # Use provided location or default to Ludhiana
         location = request.location if request and request.location else "Ludhiana"
+        started = time.perf_counter()
+        stages = {}
+        simulation = asyncio.ensure_future(run_stage("simulation", run_realistic_simulation(), started, stages))
+        return await enhance_location(location, simulation, stages, started, stages)
         
-        # Get basic simulation data
-        basic_simulation = await run_realistic_simulation()
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Enhanced simulation failed: {str(e)}")
+
+@app.post("/simulate-enhanced/batch")
+async def simulate_enhanced_batch(request: EnhancedBatchSimulationRequest):
+    """
+    Enhanced simulation for many districts at once, streamed as NDJSON
+    The realistic simulation runs once; weather for every location is fetched concurrently
+    (at most max_concurrency at a time) and each district's result is written as soon as it is ready.
+    A final {"type": "summary"} line closes the stream.
+    """
+    locations = list(dict.fromkeys(location.strip() for location in request.locations if location.strip()))
+    if not locations:
+        raise HTTPException(status_code=400, detail="At least one location is required")
+    if len(locations) > ENHANCED_BATCH_MAX_LOCATIONS:
+        raise HTTPException(status_code=400, detail=f"At most {ENHANCED_BATCH_MAX_LOCATIONS} locations per batch")
+    concurrency = min(max(request.max_concurrency or ENHANCED_BATCH_CONCURRENCY, 1), ENHANCED_BATCH_MAX_CONCURRENCY)
+    
+    async def stream():
+        started = time.perf_counter()
+        simulation_stages = {}
+        simulation = asyncio.ensure_future(run_stage("simulation", run_realistic_simulation(), started, simulation_stages))
+        weather_slots = asyncio.Semaphore(concurrency)
         
-        # Get weather data for the selected district
-        weather_data = await get_district_weather(location)
+        async def district(location):
+            stages = {}
+            try:
+                result = await enhance_location(location, simulation, simulation_stages, started, stages,
+                                                weather_slots, include_ai_insights=request.include_ai_insights)
+                return {"type": "district", "location": location, **result}
+            except HTTPException as e:
+                return {"type": "error", "location": location, "error": str(e.detail), "stages": stages}
+            except Exception as e:
+                return {"type": "error", "location": location, "error": str(e), "stages": stages}
         
-        # Generate location-specific AI insights
+        tasks = [asyncio.ensure_future(district(location)) for location in locations]
+        failed = 0
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                result = await next_result
+                failed += result["type"] == "error"
+                yield json.dumps(result, default=str) + "\n"
+            yield json.dumps({
+                "type": "summary",
+                "locations": len(locations),
+                "succeeded": len(locations) - failed,
+                "failed": failed,
+                "max_concurrency": concurrency,
+                "simulation": simulation_stages.get("simulation"),
+                "total_ms": round((time.perf_counter() - started) * 1000, 2)
+            }, default=str) + "\n"
+        finally:
+            # Client went away (or we are done): don't leave fetches running
+            for task in tasks + [simulation]:
+                task.cancel()
+    
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+async def enhance_location(location: str, simulation: asyncio.Future, simulation_stages: dict, started: float,
+                           stages: dict, weather_slots: Optional[asyncio.Semaphore] = None,
+                           include_ai_insights: bool = True) -> dict:
+    """
+    Weather, AI insights and weather impact for one location on top of a (possibly shared,
+    still running) realistic simulation stage, whose timing run_stage writes to ``simulation_stages``.
+    Raises HTTPException if the simulation failed.
+    """
+    async def fetch_weather():
+        if weather_slots is None:
+            return await get_district_weather(location)
+        async with weather_slots:
+            return await get_district_weather(location)
+    
+    weather_data = await run_stage("weather", fetch_weather(), started, stages)
+    # shield: a batch shares one simulation task between all of its districts
+    basic_simulation = await asyncio.shield(simulation)
+    stages.setdefault("simulation", simulation_stages["simulation"])
+    if basic_simulation is None:
+        status_code = 504 if stages["simulation"]["status"] == "timeout" else 500
+        raise HTTPException(status_code=status_code, detail=f"Enhanced simulation failed: {stages['simulation']['error']}")
+    
+    # Generate location-specific AI insights (uses whatever weather we got)
+    ai_insights = []
+    if include_ai_insights:
         location_context = {
             "selected_location": location,
-            "weather_data": weather_data.dict(),
+            "weather_data": weather_data.dict() if weather_data else {},
             "simulation_data": basic_simulation.dict()
         }
-        ai_insights_response = await generate_location_specific_ai_insights(location_context)
-        ai_insights = ai_insights_response["insights"]
-        
-        # Enhance simulation based on weather conditions
+        ai_insights_response = await run_stage(
+            "ai_insights", generate_location_specific_ai_insights(location_context), started, stages
+        )
+        ai_insights = ai_insights_response["insights"] if ai_insights_response else []
+    
+    # Enhance simulation based on weather conditions (unadjusted if weather is unavailable)
+    if weather_data:
         weather_impact = analyze_weather_impact(weather_data, basic_simulation)
-        
-        # Create response without Pydantic validation issues
-        enhanced_response = {
-            "timestamp": datetime.now().isoformat(),
-            "conditions": basic_simulation.conditions,
-            "weather_data": {
-                "location": weather_data.location,
-                "temperature": weather_data.temperature,
-                "humidity": weather_data.humidity,
-                "precipitation": weather_data.precipitation,
-                "wind_speed": weather_data.wind_speed,
-                "condition": weather_data.condition,
-                "uv_index": weather_data.uv_index,
-                "pressure": weather_data.pressure
-            },
-            "ai_insights": [
-                {
-                    "category": insight.category,
-                    "insight": insight.insight,
-                    "confidence": insight.confidence,
-                    "recommendations": insight.recommendations,
-                    "risk_factors": insight.risk_factors
-                } for insight in ai_insights
-            ],
-            "triggeredSubsidies": [
-                {
-                    "schemeName": s.schemeName,
-                    "condition": s.condition,
-                    "amount": s.amount,
-                    "district": s.district,
-                    "eligibleFarmers": s.eligibleFarmers,
-                    "totalPayout": s.totalPayout
-                } for s in weather_impact["adjusted_subsidies"]
-            ],
-            "summary": {
-                **basic_simulation.summary,
-                "weather_impact": weather_impact["impact_summary"],
-                "ai_recommendations": len(ai_insights),
-                "enhancement_factor": weather_impact["enhancement_factor"]
-            }
+    else:
+        weather_impact = {
+            "adjusted_subsidies": basic_simulation.triggeredSubsidies,
+            "impact_summary": None,
+            "enhancement_factor": 1.0
         }
-        
-        return enhanced_response
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Enhanced simulation failed: {str(e)}")
+    
+    # Critical path: the slower of the concurrent stages, then AI insights
+    critical_path = [max(("simulation", "weather"), key=lambda name: stages[name]["finished_ms"])]
+    if include_ai_insights:
+        critical_path.append("ai_insights")
+    
+    # Create response without Pydantic validation issues
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "conditions": basic_simulation.conditions,
+        "weather_data": {
+            "location": weather_data.location,
+            "temperature": weather_data.temperature,
+            "humidity": weather_data.humidity,
+            "precipitation": weather_data.precipitation,
+            "wind_speed": weather_data.wind_speed,
+            "condition": weather_data.condition,
+            "uv_index": weather_data.uv_index,
+            "pressure": weather_data.pressure
+        } if weather_data else None,
+        "ai_insights": [
+            {
+                "category": insight.category,
+                "insight": insight.insight,
+                "confidence": insight.confidence,
+                "recommendations": insight.recommendations,
+                "risk_factors": insight.risk_factors
+            } for insight in ai_insights
+        ],
+        "triggeredSubsidies": [
+            {
+                "schemeName": s.schemeName,
+                "condition": s.condition,
+                "amount": s.amount,
+                "district": s.district,
+                "eligibleFarmers": s.eligibleFarmers,
+                "totalPayout": s.totalPayout
+            } for s in weather_impact["adjusted_subsidies"]
+        ],
+        "summary": {
+            **basic_simulation.summary,
+            "weather_impact": weather_impact["impact_summary"],
+            "ai_recommendations": len(ai_insights),
+            "enhancement_factor": weather_impact["enhancement_factor"]
+        },
+        "partial": any(stage["status"] != "ok" for stage in stages.values()),
+        "timings": {
+            "total_ms": round((time.perf_counter() - started) * 1000, 2),
+            "critical_path": critical_path,
+            "stages": stages
+        }
+    }
 
 async def generate_location_specific_ai_insights(location_context: dict):
     """Generate AI insights specific to the selected location and weather conditions"""
@@ -1226,17 +2159,27 @@ async def generate_location_specific_ai_insights(location_context: dict):
         weather_data = location_context.get("weather_data", {})
         simulation_data = location_context.get("simulation_data", {})
         
+        # Prompt inputs with weather bucketed, so similar readings share one cached AI response
+        prompt_inputs = {
+            "location": normalize_location(location),
+            "weather": bucket_weather(weather_data),
+            "eligible_farmers": simulation_data.get('summary', {}).get('totalEligibleFarmers', 0),
+            "total_payout": simulation_data.get('summary', {}).get('totalPayout', 0),
+            "triggered": len(simulation_data.get('triggeredSubsidies', []))
+        }
+        weather = {name: "N/A" if value is None else value for name, value in prompt_inputs["weather"].items()}
+        
         # Create location-specific context for AI analysis
         context = f"""
         Agricultural Subsidy Analysis for {location}, India:
         
-        Current Weather Conditions:
-        - Temperature: {weather_data.get('temperature', 'N/A')}°C
-        - Humidity: {weather_data.get('humidity', 'N/A')}%
-        - Precipitation: {weather_data.get('precipitation', 'N/A')}mm
-        - Wind Speed: {weather_data.get('wind_speed', 'N/A')} km/h
-        - Weather Condition: {weather_data.get('condition', 'N/A')}
-        - UV Index: {weather_data.get('uv_index', 'N/A')}
+        Current Weather Conditions (bucketed):
+        - Temperature: ~{weather['temperature']}°C
+        - Humidity: ~{weather['humidity']}%
+        - Rainfall: {weather['precipitation']} (IMD intensity class)
+        - Wind Speed: ~{weather['wind_speed']} km/h
+        - Weather Condition: {weather['condition']}
+        - UV Index: ~{weather['uv_index']}
         
         District Context: {location}
         - Known for specific agricultural practices and crops
@@ -1244,9 +2187,9 @@ async def generate_location_specific_ai_insights(location_context: dict):
         - Regional subsidy effectiveness patterns
         
         Simulation Results:
-        - Total eligible farmers: {simulation_data.get('summary', {}).get('totalEligibleFarmers', 0)}
-        - Total payout: ₹{simulation_data.get('summary', {}).get('totalPayout', 0):,}
-        - Triggered subsidies: {len(simulation_data.get('triggeredSubsidies', []))}
+        - Total eligible farmers: {prompt_inputs['eligible_farmers']}
+        - Total payout: ₹{prompt_inputs['total_payout']:,}
+        - Triggered subsidies: {prompt_inputs['triggered']}
         
         Generate location-specific insights considering:
         1. Local weather impact on agriculture
@@ -1258,11 +2201,9 @@ async def generate_location_specific_ai_insights(location_context: dict):
         Provide actionable insights for {location} district specifically.
         """
         
-        # Generate insights using Gemini AI
-        if model:
-            response = model.generate_content(context)
-            ai_text = response.text
-        else:
+        # Generate insights using Gemini AI (or reuse the cached response for identical inputs)
+        ai_text = await ai_cache.get_or_generate("location", prompt_inputs, lambda: ai_gateway.generate_text(context))
+        if ai_text is None:
             ai_text = f"AI service unavailable - providing location-based analysis for {location} using available data."
         
         # Create location-specific insights
@@ -1448,14 +2389,17 @@ def analyze_weather_impact(weather_data: WeatherData, simulation: SimulationResp
     }
 
 @app.get("/dashboard/efficiency")
-async def get_efficiency_dashboard():
-    """Get comprehensive system efficiency dashboard data"""
+async def get_efficiency_dashboard(request: Request):
+    """Get comprehensive system efficiency dashboard data (304 if unchanged since the client's ETag)"""
+    return derived_metrics.response(request, "dashboard/efficiency", build_efficiency_dashboard)
+
+def build_efficiency_dashboard():
     dashboard_data = {
         "overview": {
-            "total_districts": len(MOCK_CONDITIONS),
+            "total_districts": len(districts),
             "avg_efficiency": 0,
             "critical_districts": 0,
-            "last_updated": datetime.now().isoformat()
+            "last_updated": district_data_updated_at()
         },
         "district_metrics": {},
         "challenges_summary": {
@@ -1470,7 +2414,7 @@ async def get_efficiency_dashboard():
     total_efficiency = 0
     critical_count = 0
     
-    for district, data in MOCK_CONDITIONS.items():
+    for district, data in districts.items():
         # Calculate district efficiency score
         efficiency = (
             data["ekyc_completion_rate"] * 0.3 +
@@ -1502,7 +2446,7 @@ async def get_efficiency_dashboard():
         dashboard_data["challenges_summary"]["biometric_failures"] += int(data["farmers"] * data["biometric_failure_rate"])
         dashboard_data["challenges_summary"]["digital_exclusion"] += int(data["farmers"] * (1 - data["digital_literacy"]))
     
-    dashboard_data["overview"]["avg_efficiency"] = round((total_efficiency / len(MOCK_CONDITIONS)) * 100, 1)
+    dashboard_data["overview"]["avg_efficiency"] = round((total_efficiency / len(districts)) * 100, 1)
     dashboard_data["overview"]["critical_districts"] = critical_count
     
     # Generate recommendations based on data
@@ -1658,25 +2602,31 @@ async def validate_research_implementation():
     return validation_results
 
 @app.get("/satellite/subsidy-analysis/{district}")
-async def get_satellite_subsidy_analysis(district: str):
-    """Analyze satellite data to recommend targeted subsidies"""
+async def get_satellite_subsidy_analysis(district: str,
+                                         details: int = Query(DEFAULT_PAGE_SIZE, ge=0, le=MAX_PAGE_SIZE)):
+    """Analyze satellite data to recommend targeted subsidies (each scheme lists its ``details`` lowest-NDVI fields)"""
+    if district not in districts:
+        raise HTTPException(status_code=404, detail="District not found")
+    
+    fields = satellite_fields()
     try:
-        # Get real-time satellite data
-        satellite_data = await get_realtime_satellite_data(district)
-        
-        # Analyze field conditions for subsidy targeting
-        critical_fields = [field for field in satellite_data["field_data"] if field["ndvi"] < 0.5]
-        moderate_stress_fields = [field for field in satellite_data["field_data"] if 0.5 <= field["ndvi"] < 0.6]
+        # Counts and areas come from the district's precomputed histograms; fields are only
+        # read again (once, by NDVI band and stress flag) to list the targeted ones
+        summary = fields.district_summary(district)
+        bands = summary["ndvi_bands"]
+        targets = fields.targets(fields.district_slice(district))
+        critical_fields = targets["critical"]
+        critical_area = round(bands["severe"]["area_hectares"] + bands["critical"]["area_hectares"], 2)
         
         # Calculate precise subsidy recommendations
         subsidy_analysis = {
             "district": district,
             "analysis_timestamp": datetime.now().isoformat(),
             "satellite_insights": {
-                "total_fields_analyzed": len(satellite_data["field_data"]),
-                "critical_fields": len(critical_fields),
-                "moderate_stress_fields": len(moderate_stress_fields),
-                "healthy_fields": len([f for f in satellite_data["field_data"] if f["ndvi"] >= 0.6])
+                "total_fields_analyzed": summary["fields"],
+                "critical_fields": summary["critical_fields"],
+                "moderate_stress_fields": bands["moderate_stress"]["fields"],
+                "healthy_fields": bands["healthy"]["fields"]
             },
             "targeted_subsidies": [],
             "financial_projection": {
@@ -1687,74 +2637,84 @@ async def get_satellite_subsidy_analysis(district: str):
         }
         
         # Drought Relief Analysis
-        if critical_fields:
+        if len(critical_fields):
+            listed = fields.lowest_ndvi(critical_fields, details)
             drought_subsidy = {
                 "scheme_name": "Emergency Drought Relief (Satellite-Targeted)",
                 "target_fields": len(critical_fields),
                 "eligibility_criteria": "NDVI < 0.5 (Critical crop stress)",
                 "amount_per_hectare": 8000,
-                "total_area": sum(field["area_hectares"] for field in critical_fields),
+                "total_area": critical_area,
                 "estimated_farmers": len(critical_fields),  # Assuming 1 farmer per field
-                "total_allocation": sum(field["area_hectares"] * 8000 for field in critical_fields),
+                "total_allocation": round(critical_area * 8000, 2),
                 "urgency": "High",
                 "field_details": [
                     {
-                        "field_id": field["field_id"],
-                        "ndvi": field["ndvi"],
-                        "area": field["area_hectares"],
-                        "subsidy_amount": field["area_hectares"] * 8000
-                    } for field in critical_fields
-                ]
+                        "field_id": field_id,
+                        "ndvi": ndvi,
+                        "area": area,
+                        "subsidy_amount": area * 8000
+                    } for field_id, ndvi, area in zip(fields.field_ids(listed.tolist()),
+                                                      fields.ndvi[listed].tolist(),
+                                                      fields.area[listed].tolist())
+                ],
+                "field_details_truncated": len(critical_fields) > details
             }
             subsidy_analysis["targeted_subsidies"].append(drought_subsidy)
             subsidy_analysis["financial_projection"]["total_estimated_cost"] += drought_subsidy["total_allocation"]
             subsidy_analysis["financial_projection"]["farmers_to_benefit"] += drought_subsidy["estimated_farmers"]
         
         # Fertilizer Subsidy Analysis
-        nutrient_deficient_fields = [f for f in satellite_data["field_data"] if f["stress_indicators"]["nutrient_deficiency"]]
-        if nutrient_deficient_fields:
+        nutrient_deficient_fields = targets["nutrient_deficiency"]
+        if len(nutrient_deficient_fields):
+            nutrient_area = summary["stress_area_hectares"]["nutrient_deficiency"]
+            listed = fields.lowest_ndvi(nutrient_deficient_fields, details)
             fertilizer_subsidy = {
                 "scheme_name": "Precision Fertilizer Subsidy (Satellite-Guided)",
                 "target_fields": len(nutrient_deficient_fields),
                 "eligibility_criteria": "Satellite-detected nutrient deficiency",
                 "amount_per_hectare": 3500,
-                "total_area": sum(field["area_hectares"] for field in nutrient_deficient_fields),
+                "total_area": nutrient_area,
                 "estimated_farmers": len(nutrient_deficient_fields),
-                "total_allocation": sum(field["area_hectares"] * 3500 for field in nutrient_deficient_fields),
+                "total_allocation": round(nutrient_area * 3500, 2),
                 "urgency": "Medium",
                 "field_details": [
                     {
-                        "field_id": field["field_id"],
-                        "area": field["area_hectares"],
-                        "subsidy_amount": field["area_hectares"] * 3500,
+                        "field_id": field_id,
+                        "area": area,
+                        "subsidy_amount": area * 3500,
                         "recommended_fertilizer": "NPK 10:26:26"
-                    } for field in nutrient_deficient_fields
-                ]
+                    } for field_id, area in zip(fields.field_ids(listed.tolist()), fields.area[listed].tolist())
+                ],
+                "field_details_truncated": len(nutrient_deficient_fields) > details
             }
             subsidy_analysis["targeted_subsidies"].append(fertilizer_subsidy)
             subsidy_analysis["financial_projection"]["total_estimated_cost"] += fertilizer_subsidy["total_allocation"]
             subsidy_analysis["financial_projection"]["farmers_to_benefit"] += fertilizer_subsidy["estimated_farmers"]
         
         # Water Stress Subsidy
-        water_stressed_fields = [f for f in satellite_data["field_data"] if f["stress_indicators"]["water_stress"]]
-        if water_stressed_fields:
+        water_stressed_fields = targets["water_stress"]
+        if len(water_stressed_fields):
+            water_area = summary["stress_area_hectares"]["water_stress"]
+            listed = fields.lowest_ndvi(water_stressed_fields, details)
             irrigation_subsidy = {
                 "scheme_name": "Irrigation Support Scheme (Satellite-Detected)",
                 "target_fields": len(water_stressed_fields),
                 "eligibility_criteria": "Satellite-detected water stress indicators",
                 "amount_per_hectare": 5000,
-                "total_area": sum(field["area_hectares"] for field in water_stressed_fields),
+                "total_area": water_area,
                 "estimated_farmers": len(water_stressed_fields),
-                "total_allocation": sum(field["area_hectares"] * 5000 for field in water_stressed_fields),
+                "total_allocation": round(water_area * 5000, 2),
                 "urgency": "High",
                 "field_details": [
                     {
-                        "field_id": field["field_id"],
-                        "area": field["area_hectares"],
-                        "subsidy_amount": field["area_hectares"] * 5000,
+                        "field_id": field_id,
+                        "area": area,
+                        "subsidy_amount": area * 5000,
                         "intervention": "Drip/Sprinkler irrigation support"
-                    } for field in water_stressed_fields
-                ]
+                    } for field_id, area in zip(fields.field_ids(listed.tolist()), fields.area[listed].tolist())
+                ],
+                "field_details_truncated": len(water_stressed_fields) > details
             }
             subsidy_analysis["targeted_subsidies"].append(irrigation_subsidy)
             subsidy_analysis["financial_projection"]["total_estimated_cost"] += irrigation_subsidy["total_allocation"]
@@ -1771,8 +2731,8 @@ async def get_satellite_subsidy_analysis(district: str):
         
         # Efficiency metrics
         subsidy_analysis["efficiency_metrics"] = {
-            "precision_targeting": f"{(len(critical_fields + moderate_stress_fields) / len(satellite_data['field_data']) * 100):.1f}%",
-            "cost_per_hectare": round(subsidy_analysis["financial_projection"]["total_estimated_cost"] / satellite_data["satellite_overview"]["total_area_hectares"], 2) if satellite_data["satellite_overview"]["total_area_hectares"] > 0 else 0,
+            "precision_targeting": f"{((summary['critical_fields'] + bands['moderate_stress']['fields']) / summary['fields'] * 100) if summary['fields'] else 0:.1f}%",
+            "cost_per_hectare": round(subsidy_analysis["financial_projection"]["total_estimated_cost"] / summary["area_hectares"], 2) if summary["area_hectares"] > 0 else 0,
             "expected_impact": "Direct intervention in stress-affected areas",
             "monitoring_advantage": "Real-time satellite verification of subsidy effectiveness"
         }
@@ -0,0 +1,221 @@
+"""
+Monte Carlo payout exposure for the realistic simulation.
+
+The realistic kernel gives one point estimate per rule. Here the barrier
+rates of every district (e-KYC completion, biometric failure, exclusion
+errors, digital literacy) are sampled around the district's research values
+with the spread of a Beta distribution of concentration
+BARRIER_CONCENTRATION (as a clipped normal: Beta sampling is several times
+slower and dominated the run time). The base eligibility share is drawn from
+the same 0.15-0.35 range the basic simulation uses. The barrier chain then
+runs as in simulation_kernel.barrier_chain, one batch of trials at a time as
+(trials x districts) arrays.
+
+Payout is linear in eligible farmers, so triggered rules are folded up front
+into a (districts x series) matrix of payout per eligible farmer, and a batch
+of trials costs one matrix product whatever the rule count. Each series
+(scheme, district, total) goes into a fixed-range histogram. This keeps
+memory independent of the number of trials, and batches computed in other
+processes merge by addition. Quantiles are read from the merged histograms, accurate to one bin
+(upper bound / bins).
+
+Batch ``i`` always draws from the seeded stream ("monte-carlo", i), so a
+result depends only on the seed and trial count, not on how batches were
+spread over worker processes.
+"""
+
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Sequence
+
+import numpy as np
+
+from random_streams import RandomStreams
+from simulation_kernel import DistrictColumns, KernelResult, RuleColumns
+
+# Spread of the sampled barrier rates: standard deviation of a Beta with this concentration (alpha + beta)
+BARRIER_CONCENTRATION = 40.0
+# DistrictColumns barrier rates that are sampled per trial
+SAMPLED_BARRIERS = ("ekyc_rate", "biometric_failure", "exclusion_errors", "digital_literacy")
+ELIGIBILITY_RANGE = (0.15, 0.35)
+DEFAULT_QUANTILES = (0.5, 0.9, 0.99)
+
+
+class PayoutModel:
+    """Picklable inputs of one Monte Carlo run, built from a realistic kernel pass"""
+
+    def __init__(self, result: KernelResult, rules: RuleColumns, districts: DistrictColumns):
+        barriers = result.barriers
+        # Payout per eligible farmer of each triggered rule: amount x adequacy factor x timing effectiveness
+        per_farmer = (rules.amount[result.rule_index] * barriers["amount_factor"][result.district]
+                      * barriers["timing_effectiveness"][result.district])
+        schemes = [rules.rules[i]["schemeName"] for i in result.rule_index.tolist()]
+
+        self.farmers = districts.farmers.copy()
+        self.barrier_means = {name: getattr(districts, name).copy() for name in SAMPLED_BARRIERS}
+        self.schemes = sorted(set(schemes))
+        triggered = sorted(set(result.district.tolist()), key=lambda d: districts.names[d])
+        self.districts = [districts.names[d] for d in triggered]
+
+        # [district, series] payout per eligible farmer; series are schemes, then districts, then the total
+        scheme_index = {scheme: s for s, scheme in enumerate(self.schemes)}
+        district_series = {d: len(self.schemes) + i for i, d in enumerate(triggered)}
+        self.weights = np.zeros((len(districts), len(self.schemes) + len(triggered) + 1))
+        for district, scheme, weight in zip(result.district.tolist(), schemes, per_farmer.tolist()):
+            self.weights[district, scheme_index[scheme]] += weight
+            self.weights[district, district_series[district]] += weight
+            self.weights[district, -1] += weight
+
+        # Eligible farmers never exceed farmers x max eligibility (every barrier factor is <= 1)
+        self.upper = (self.farmers * ELIGIBILITY_RANGE[1]) @ self.weights
+        self.upper[self.upper <= 0] = 1.0
+
+    @property
+    def series_count(self) -> int:
+        return self.weights.shape[1]
+
+
+class Histograms:
+    """Fixed-range histograms for every series of a model, mergeable across processes"""
+
+    def __init__(self, series: int, bins: int):
+        self.bins = bins
+        self.counts = np.zeros((series, bins), dtype=np.int64)
+        self.sums = np.zeros(series)
+        self.trials = 0
+
+    def add(self, values: np.ndarray, upper: np.ndarray):
+        """Record a (trials x series) block of payouts"""
+        index = np.minimum((values / upper * self.bins).astype(np.int64), self.bins - 1)
+        index += np.arange(values.shape[1]) * self.bins
+        self.counts += np.bincount(index.ravel(), minlength=self.counts.size).reshape(self.counts.shape)
+        self.sums += values.sum(axis=0)
+        self.trials += values.shape[0]
+
+    def merge(self, other: "Histograms"):
+        self.counts += other.counts
+        self.sums += other.sums
+        self.trials += other.trials
+
+    def quantiles(self, upper: np.ndarray, quantiles: Sequence[float]) -> np.ndarray:
+        """(series x quantiles) estimates, interpolated linearly within the bin"""
+        width = upper / self.bins
+        cumulative = np.cumsum(self.counts, axis=1)
+        out = np.empty((len(upper), len(quantiles)))
+        for q, quantile in enumerate(quantiles):
+            target = quantile * self.trials
+            position = (cumulative < target).sum(axis=1).clip(max=self.bins - 1)
+            rows = np.arange(len(upper))
+            before = np.where(position > 0, cumulative[rows, np.maximum(position - 1, 0)], 0)
+            in_bin = np.maximum(self.counts[rows, position], 1)
+            out[:, q] = (position + np.clip((target - before) / in_bin, 0, 1)) * width
+        return out
+
+
+def simulate_batches(model: PayoutModel, seed: int, batches: Sequence[int], batch_size: int,
+                     trials: int, bins: int) -> Histograms:
+    """Run the given batch numbers of a run (the unit of work sent to a worker process)"""
+    streams = RandomStreams(seed)
+    histograms = Histograms(model.series_count, bins)
+    spread = {name: np.sqrt(mean * (1 - mean) / (BARRIER_CONCENTRATION + 1)) for name, mean in model.barrier_means.items()}
+    shape_districts = len(model.farmers)
+
+    for batch in batches:
+        size = min(batch_size, trials - batch * batch_size)
+        if size <= 0:
+            continue
+        rng = streams.generator("monte-carlo", batch)
+        shape = (size, shape_districts)
+        base = rng.uniform(*ELIGIBILITY_RANGE, shape)
+        rate = {name: np.clip(model.barrier_means[name] + spread[name] * rng.standard_normal(shape), 0, 1)
+                for name in SAMPLED_BARRIERS}
+
+        # Barrier chain as in simulation_kernel.barrier_chain, with sampled rates
+        eligible = np.trunc(model.farmers * base * rate["ekyc_rate"])
+        eligible = np.trunc(eligible * (1 - rate["biometric_failure"]))
+        eligible = np.trunc(eligible * (1 - rate["exclusion_errors"]))
+        eligible = np.trunc(eligible * (0.7 + 0.3 * rate["digital_literacy"]))
+
+        histograms.add(eligible @ model.weights, model.upper)
+    return histograms
+
+
+class MonteCarloEngine:
+    """Spreads Monte Carlo batches over a process pool and merges the results"""
+
+    def __init__(self, workers: int = 0, batch_size: int = 20_000, bins: int = 2048):
+        self.workers = workers
+        self.batch_size = batch_size
+        self.bins = bins
+        self._pool = None
+
+    def open(self):
+        if self.workers > 1:
+            # spawn: forking a process that already runs the event loop and thread pools is unsafe
+            self._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+            # Start the workers now rather than on the first request (spawned processes take a while to boot)
+            for _ in range(self.workers):
+                self._pool.submit(int)
+
+    def close(self):
+        if self._pool:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def run(self, model: PayoutModel, trials: int, seed: int,
+                  quantiles: Sequence[float] = DEFAULT_QUANTILES) -> dict:
+        started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        batch_count = -(-trials // self.batch_size)
+        if not model.schemes:
+            parts = []  # nothing triggered: every payout is 0
+        elif self._pool is None:
+            parts = [await loop.run_in_executor(None, simulate_batches, model, seed, range(batch_count),
+                                                self.batch_size, trials, self.bins)]
+        else:
+            # Interleaved chunks keep the workers evenly loaded when the last batch is short
+            chunks = [list(range(w, batch_count, self.workers)) for w in range(min(self.workers, batch_count))]
+            parts = await asyncio.gather(*(
+                loop.run_in_executor(self._pool, simulate_batches, model, seed, chunk, self.batch_size, trials, self.bins)
+                for chunk in chunks
+            ))
+
+        histograms = Histograms(model.series_count, self.bins)
+        for part in parts:
+            histograms.merge(part)
+        return summarize(model, histograms, quantiles, {
+            "trials": trials,
+            "seed": seed,
+            "workers": max(self.workers, 1),
+            "batches": batch_count,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 1)
+        })
+
+
+def quantile_label(quantile: float) -> str:
+    return f"p{quantile * 100:g}"
+
+
+def summarize(model: PayoutModel, histograms: Histograms, quantiles: Sequence[float], run: dict) -> dict:
+    """Response body: mean and payout quantiles per scheme, per district and overall"""
+    labels = [quantile_label(q) for q in quantiles]
+    if histograms.trials:
+        values = histograms.quantiles(model.upper, quantiles)
+        means = histograms.sums / histograms.trials
+    else:
+        values = np.zeros((model.series_count, len(quantiles)))
+        means = np.zeros(model.series_count)
+
+    def stats(i: int) -> dict:
+        return {"mean": round(float(means[i])), **{label: round(float(v)) for label, v in zip(labels, values[i])}}
+
+    schemes = len(model.schemes)
+    return {
+        **run,
+        "quantiles": list(quantiles),
+        "total": stats(model.series_count - 1),
+        "schemes": [{"schemeName": scheme, **stats(s)} for s, scheme in enumerate(model.schemes)],
+        "districts": [{"district": district, **stats(schemes + d)} for d, district in enumerate(model.districts)],
+    }
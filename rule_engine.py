@@ -0,0 +1,228 @@
+"""
+Compiled rule-condition engine for the Subsidy Design Engine.
+
+Rule conditions such as ``rainfall < 75`` or
+``temperature > 40 and crop_ndvi < 0.6`` are parsed once (when a rule is
+created or updated) into predicate objects. Simulations then only call
+``predicate.evaluate(district_data)``.
+
+Grammar (case-insensitive):
+
+    condition  := and_expr (("or" | "||") and_expr)*
+    and_expr   := factor (("and" | "&&") factor)*
+    factor     := "(" condition ")" | comparison
+    comparison := METRIC OP VALUE
+    OP         := "<" | "<=" | ">" | ">=" | "=" | "==" | "!="
+    VALUE      := number | level label (low/medium/high, poor/moderate/good/excellent)
+"""
+
+import operator
+import re
+from functools import lru_cache
+
+
+class ConditionSyntaxError(ValueError):
+    """Raised when a rule condition cannot be compiled"""
+
+
+# Ordinal encoding for categorical soil nutrient levels
+NUTRIENT_LEVELS = {"low": 0, "medium": 1, "high": 2}
+
+# NDVI lower bounds for crop health labels (same bands as the satellite endpoints)
+CROP_HEALTH_LEVELS = {"poor": 0.0, "moderate": 0.4, "good": 0.6, "excellent": 0.8}
+
+
+def _nutrient(name):
+    def extract(district_data):
+        level = district_data.get("soil_health", {}).get(name)
+        return NUTRIENT_LEVELS.get(level)
+    return extract
+
+
+def _soil_ph(district_data):
+    return district_data.get("soil_health", {}).get("ph")
+
+
+# Canonical metric name -> (value extractor over a MOCK_CONDITIONS entry, label levels)
+METRICS = {
+    "rainfall": (lambda d: d.get("rainfall"), None),
+    "temperature": (lambda d: d.get("temperature"), None),
+    "humidity": (lambda d: d.get("humidity"), None),
+    "crop_ndvi": (lambda d: d.get("crop_ndvi"), CROP_HEALTH_LEVELS),
+    "soil_ph": (_soil_ph, None),
+    "nitrogen": (_nutrient("nitrogen"), NUTRIENT_LEVELS),
+    "phosphorus": (_nutrient("phosphorus"), NUTRIENT_LEVELS),
+}
+
+METRIC_ALIASES = {
+    "ndvi": "crop_ndvi",
+    "crop_health": "crop_ndvi",
+    "ph": "soil_ph",
+}
+
+OPERATORS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "=": operator.eq,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+_TOKEN_RE = re.compile(r"\s*(?:(\(|\)|&&|\|\||<=|>=|==|!=|<|>|=)|([a-z_][a-z0-9_]*)|(-?\d+(?:\.\d+)?|-?\.\d+))")
+
+
+class Comparison:
+    """Leaf predicate: ``metric op threshold``"""
+
+    __slots__ = ("metric", "op", "threshold", "metrics", "_extract", "_compare")
+
+    def __init__(self, metric: str, op: str, threshold: float):
+        self.metric = metric
+        self.op = "==" if op == "=" else op
+        self.threshold = threshold
+        self.metrics = frozenset((metric,))
+        self._extract = METRICS[metric][0]
+        self._compare = OPERATORS[op]
+
+    def evaluate(self, district_data: dict) -> bool:
+        value = self._extract(district_data)
+        return value is not None and self._compare(value, self.threshold)
+
+    def __repr__(self):
+        return f"{self.metric} {self.op} {self.threshold:g}"
+
+
+class AllOf:
+    """Compound predicate: every term must hold"""
+
+    __slots__ = ("terms", "metrics")
+
+    def __init__(self, terms):
+        self.terms = tuple(terms)
+        self.metrics = frozenset().union(*(term.metrics for term in self.terms))
+
+    def evaluate(self, district_data: dict) -> bool:
+        return all(term.evaluate(district_data) for term in self.terms)
+
+    def __repr__(self):
+        return "(" + " and ".join(repr(term) for term in self.terms) + ")"
+
+
+class AnyOf:
+    """Compound predicate: at least one term must hold"""
+
+    __slots__ = ("terms", "metrics")
+
+    def __init__(self, terms):
+        self.terms = tuple(terms)
+        self.metrics = frozenset().union(*(term.metrics for term in self.terms))
+
+    def evaluate(self, district_data: dict) -> bool:
+        return any(term.evaluate(district_data) for term in self.terms)
+
+    def __repr__(self):
+        return "(" + " or ".join(repr(term) for term in self.terms) + ")"
+
+
+def _tokenize(text: str) -> list:
+    tokens = []
+    position = 0
+    text = text.rstrip()
+    while position < len(text):
+        match = _TOKEN_RE.match(text, position)
+        if not match:
+            raise ConditionSyntaxError(f"Unexpected character {text[position:].strip()[:1]!r} at position {position}")
+        symbol, word, number = match.groups()
+        if symbol:
+            tokens.append(("op", symbol))
+        elif word in ("and", "or"):
+            tokens.append(("op", "&&" if word == "and" else "||"))
+        elif word:
+            tokens.append(("word", word))
+        else:
+            tokens.append(("number", float(number)))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    """Recursive-descent parser producing predicate objects"""
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.position = 0
+
+    def peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else (None, None)
+
+    def take(self):
+        if self.position >= len(self.tokens):
+            raise ConditionSyntaxError("Condition ended unexpectedly")
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+
+    def parse(self):
+        if not self.tokens:
+            raise ConditionSyntaxError("Condition is empty")
+        predicate = self.parse_or()
+        if self.position != len(self.tokens):
+            raise ConditionSyntaxError(f"Unexpected token {self.peek()[1]!r}")
+        return predicate
+
+    def parse_or(self):
+        terms = [self.parse_and()]
+        while self.peek() == ("op", "||"):
+            self.take()
+            terms.append(self.parse_and())
+        return terms[0] if len(terms) == 1 else AnyOf(terms)
+
+    def parse_and(self):
+        terms = [self.parse_factor()]
+        while self.peek() == ("op", "&&"):
+            self.take()
+            terms.append(self.parse_factor())
+        return terms[0] if len(terms) == 1 else AllOf(terms)
+
+    def parse_factor(self):
+        if self.peek() == ("op", "("):
+            self.take()
+            predicate = self.parse_or()
+            if self.take() != ("op", ")"):
+                raise ConditionSyntaxError("Missing closing parenthesis")
+            return predicate
+        return self.parse_comparison()
+
+    def parse_comparison(self):
+        kind, name = self.take()
+        if kind != "word":
+            raise ConditionSyntaxError(f"Expected a metric name, got {name!r}")
+        metric = METRIC_ALIASES.get(name, name)
+        if metric not in METRICS:
+            raise ConditionSyntaxError(f"Unknown metric {name!r}")
+
+        kind, op = self.take()
+        if kind != "op" or op not in OPERATORS:
+            raise ConditionSyntaxError(f"Expected a comparison operator after {name!r}")
+
+        kind, value = self.take()
+        if kind == "number":
+            threshold = value
+        elif kind == "word" and METRICS[metric][1] and value in METRICS[metric][1]:
+            threshold = METRICS[metric][1][value]
+        else:
+            raise ConditionSyntaxError(f"Invalid threshold {value!r} for metric {name!r}")
+        return Comparison(metric, op, threshold)
+
+
+@lru_cache(maxsize=65536)
+def _compile_normalized(normalized: str):
+    return _Parser(_tokenize(normalized)).parse()
+
+
+@lru_cache(maxsize=65536)
+def compile_condition(condition: str):
+    """Compile a rule condition into a reusable predicate (cached by normalized text)"""
+    return _compile_normalized(" ".join(condition.lower().split()))
@@ -0,0 +1,145 @@
+"""
+Indexed rule repository.
+
+Keeps rules in an id -> rule hash index with secondary district -> ids,
+metric -> ids and (district, metric) -> ids indexes, so CRUD stays O(1) regardless of how many rules are
+loaded. The vectorized simulation columns (simulation_kernel.RuleColumns) are
+maintained alongside every write instead of being rebuilt per simulation.
+
+Rules are persisted by storage.RuleStorage; the repository is the in-memory
+index each worker keeps in sync by replaying the storage change log.
+"""
+
+import threading
+from typing import Iterable, Optional
+
+from simulation_kernel import DistrictColumns, RuleColumns
+
+# Compact the column store once released rows outnumber live ones (and exceed this floor)
+COMPACTION_THRESHOLD = 1024
+
+
+class RuleRepository:
+    """Thread-safe in-memory rule store with id, district and metric indexes"""
+
+    def __init__(self, districts: DistrictColumns):
+        self._lock = threading.Lock()
+        self._districts = districts
+        self._rules = {}        # id -> rule
+        self._slots = {}        # id -> row in self.columns
+        self._by_district = {}  # district -> set of rule ids
+        self._by_metric = {}    # metric -> set of rule ids
+        self._by_district_metric = {}  # (district, metric) -> set of rule ids
+        self.version = 0
+        self.synced_seq = 0     # storage change-log position already applied
+        self.columns = RuleColumns(districts)
+
+    def __len__(self):
+        return len(self._rules)
+
+    def all(self) -> list:
+        """All rules in creation order"""
+        return list(self._rules.values())
+
+    def get(self, rule_id: int) -> Optional[dict]:
+        return self._rules.get(rule_id)
+
+    def apply_changes(self, changes) -> bool:
+        """Apply a storage.RuleChanges batch; stale batches (already applied) are ignored"""
+        with self._lock:
+            if changes.seq < self.synced_seq or (changes.seq == self.synced_seq and not changes.full_reload):
+                return False
+            if changes.full_reload:
+                self._load(changes.rules)
+            else:
+                for rule in changes.rules:
+                    self._put(rule)
+            for rule_id in changes.deleted_ids:
+                self._delete(rule_id)
+            self.synced_seq = changes.seq
+            self.version += 1
+            return True
+
+    def _put(self, rule: dict):
+        existing = self._rules.get(rule["id"])
+        if existing is None:
+            self._rules[rule["id"]] = rule
+            self._slots[rule["id"]] = self.columns.append(rule)
+        else:
+            self._unindex(existing)
+            existing.update(rule)
+            rule = existing
+            self.columns.assign(self._slots[rule["id"]], rule)
+        self._index(rule)
+
+    def _delete(self, rule_id: int):
+        rule = self._rules.pop(rule_id, None)
+        if rule is None:
+            return
+        self._unindex(rule)
+        self.columns.release(self._slots.pop(rule_id))
+        released = self.columns.size - len(self._rules)
+        if released > COMPACTION_THRESHOLD and released > len(self._rules):
+            self._compact()
+
+    def _load(self, rules: list):
+        """Replace the whole rule set (full reload from storage)"""
+        self._rules = {rule["id"]: rule for rule in rules}
+        self._slots = {rule["id"]: slot for slot, rule in enumerate(rules)}
+        self._by_district = {}
+        self._by_metric = {}
+        self._by_district_metric = {}
+        for rule in rules:
+            self._index(rule)
+        self.columns = RuleColumns.from_rules(rules, self._districts)
+
+    def rebind(self, districts: DistrictColumns):
+        """Point the rule columns at a reloaded district table (district indexes may have moved)"""
+        with self._lock:
+            self._districts = districts
+            self._compact()
+
+    def ids_for_district(self, district: str) -> frozenset:
+        return frozenset(self._by_district.get(district, ()))
+
+    def ids_for_metric(self, metric: str) -> frozenset:
+        return frozenset(self._by_metric.get(metric, ()))
+
+    def ids_reading(self, district: str, metrics: Iterable[str]) -> set:
+        """Ids of rules for ``district`` whose condition reads any of ``metrics``"""
+        return set().union(*(self._by_district_metric.get((district, metric), ()) for metric in metrics))
+
+    def candidates(self, districts: Iterable[str], metrics: Optional[Iterable[str]] = None) -> list:
+        """Rules for the given districts (optionally only those reading one of ``metrics``), by id"""
+        ids = set().union(*(self._by_district.get(district, ()) for district in districts))
+        if metrics is not None:
+            ids &= set().union(*(self._by_metric.get(metric, ()) for metric in metrics))
+        return [self._rules[rule_id] for rule_id in sorted(ids)]
+
+    def _index(self, rule: dict):
+        self._by_district.setdefault(rule["district"], set()).add(rule["id"])
+        for metric in rule["predicate"].metrics:
+            self._by_metric.setdefault(metric, set()).add(rule["id"])
+            self._by_district_metric.setdefault((rule["district"], metric), set()).add(rule["id"])
+
+    def _unindex(self, rule: dict):
+        ids = self._by_district.get(rule["district"])
+        ids.discard(rule["id"])
+        if not ids:
+            del self._by_district[rule["district"]]
+        for metric in rule["predicate"].metrics:
+            ids = self._by_metric[metric]
+            ids.discard(rule["id"])
+            if not ids:
+                del self._by_metric[metric]
+            key = (rule["district"], metric)
+            ids = self._by_district_metric[key]
+            ids.discard(rule["id"])
+            if not ids:
+                del self._by_district_metric[key]
+
+    def _compact(self):
+        """Rebuild the columns without released rows (amortized O(1) per delete)"""
+        rules = list(self._rules.values())
+        self.columns = RuleColumns.from_rules(rules, self._districts)
+        self._slots = {rule["id"]: slot for slot, rule in enumerate(rules)}
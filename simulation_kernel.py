@@ -0,0 +1,277 @@
+"""
+Columnar, vectorized simulation kernel.
+
+District conditions are stored as district-indexed NumPy arrays and rules as
+parallel columns (district index, amount, metric, operator, threshold). One
+vectorized pass computes the trigger mask, the research-based eligibility
+barrier chain (e-KYC -> biometric -> exclusion -> digital literacy) and the
+realistic payouts. The arithmetic mirrors run_realistic_simulation step by
+step (same operation order, truncation via np.trunc) so results are
+bit-identical to the scalar loop.
+"""
+
+import numpy as np
+
+from rule_engine import METRICS, Comparison
+
+METRIC_NAMES = tuple(METRICS)
+METRIC_INDEX = {name: i for i, name in enumerate(METRIC_NAMES)}
+
+# Operator codes used in the rule columns
+OP_CODES = {"<": 0, "<=": 1, ">": 2, ">=": 3, "==": 4, "!=": 5}
+
+# Truth table indexed by [operator code, comparison state] where state is 0 (>), 1 (<) or 2 (==)
+OP_TRUTH = np.array([
+    [False, True, False],
+    [False, True, True],
+    [True, False, False],
+    [True, False, True],
+    [False, False, True],
+    [True, True, False],
+])
+
+# DistrictColumns attribute -> district condition key for the barrier chain inputs
+BARRIER_COLUMNS = {
+    "farmers": "farmers",
+    "ekyc_rate": "ekyc_completion_rate",
+    "payment_delays": "payment_delays",
+    "amount_adequacy": "amount_adequacy",
+    "digital_literacy": "digital_literacy",
+    "biometric_failure": "biometric_failure_rate",
+    "exclusion_errors": "beneficiary_exclusion_errors",
+}
+
+# Share of district farmers assumed eligible before barriers (as in run_realistic_simulation)
+BASE_ELIGIBILITY = 0.25
+
+
+class DistrictColumns:
+    """District conditions as district-indexed arrays"""
+
+    def __init__(self, conditions: dict):
+        self.names = list(conditions)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.records = list(conditions.values())
+
+        # [metric, district] values padded with a trailing NaN row and column, so the
+        # -1 sentinels used in RuleColumns (unknown district / compound rule) read NaN
+        self.metrics = np.full((len(METRIC_NAMES) + 1, len(self.names) + 1), np.nan)
+        for m, (extract, _) in enumerate(METRICS.values()):
+            self.metrics[m, :-1] = [_as_float(extract(record)) for record in self.records]
+
+        def column(key):
+            return np.array([record[key] for record in self.records], dtype=np.float64)
+
+        for attribute, key in BARRIER_COLUMNS.items():
+            setattr(self, attribute, column(key))
+
+    def __len__(self):
+        return len(self.names)
+
+    def update(self, name: str, record: dict):
+        """Rewrite one district's column entries after its conditions changed"""
+        i = self.index[name]
+        self.records[i] = record
+        for m, (extract, _) in enumerate(METRICS.values()):
+            self.metrics[m, i] = _as_float(extract(record))
+        for attribute, key in BARRIER_COLUMNS.items():
+            getattr(self, attribute)[i] = record[key]
+
+
+class RuleColumns:
+    """
+    Rules as parallel columns, one row (slot) per rule.
+
+    Rows can be appended, reassigned and released in O(1) so the rule store can
+    keep the columns in sync with CRUD operations. Released rows keep the -1
+    district sentinel and never trigger.
+    """
+
+    def __init__(self, districts: DistrictColumns, capacity: int = 1024):
+        self.district_index = districts.index
+        self.size = 0
+        self.rules = []
+        self.compound_predicates = []
+        self._compound_ids = {}
+        self._district = np.full(capacity, -1, dtype=np.int32)
+        self._amount = np.zeros(capacity, dtype=np.int64)
+        self._metric = np.full(capacity, -1, dtype=np.int16)
+        self._op = np.zeros(capacity, dtype=np.int8)
+        self._threshold = np.zeros(capacity, dtype=np.float64)
+        # Compound predicates are evaluated once per (unique predicate, district)
+        self._compound = np.full(capacity, -1, dtype=np.int32)
+
+    @classmethod
+    def from_rules(cls, rules: list, districts: DistrictColumns) -> "RuleColumns":
+        """Build the columns for a whole rule list in bulk"""
+        count = len(rules)
+        columns = cls(districts, capacity=max(count, 1024))
+        columns.size = count
+        columns.rules = list(rules)
+        columns._district[:count] = [districts.index.get(rule["district"], -1) for rule in rules]
+        columns._amount[:count] = [rule["amount"] for rule in rules]
+
+        metric, op, threshold, compound = [], [], [], []
+        for rule in rules:
+            predicate = rule["predicate"]
+            if isinstance(predicate, Comparison):
+                metric.append(METRIC_INDEX[predicate.metric])
+                op.append(OP_CODES[predicate.op])
+                threshold.append(predicate.threshold)
+                compound.append(-1)
+            else:
+                metric.append(-1)
+                op.append(0)
+                threshold.append(0.0)
+                compound.append(columns._compound_id(predicate))
+        columns._metric[:count] = metric
+        columns._op[:count] = op
+        columns._threshold[:count] = threshold
+        columns._compound[:count] = compound
+        return columns
+
+    # Views over the live rows
+    district = property(lambda self: self._district[:self.size])
+    amount = property(lambda self: self._amount[:self.size])
+    metric = property(lambda self: self._metric[:self.size])
+    op = property(lambda self: self._op[:self.size])
+    threshold = property(lambda self: self._threshold[:self.size])
+    compound = property(lambda self: self._compound[:self.size])
+
+    def __len__(self):
+        return self.size
+
+    def _grow(self):
+        capacity = len(self._district) * 2
+        for name, fill in (("_district", -1), ("_amount", 0), ("_metric", -1),
+                           ("_op", 0), ("_threshold", 0), ("_compound", -1)):
+            old = getattr(self, name)
+            new = np.full(capacity, fill, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def append(self, rule: dict) -> int:
+        """Add a rule as a new row and return its slot"""
+        if self.size == len(self._district):
+            self._grow()
+        slot = self.size
+        self.size += 1
+        self.rules.append(None)
+        self.assign(slot, rule)
+        return slot
+
+    def assign(self, slot: int, rule: dict):
+        """(Re)write the row for a rule after it was created or updated"""
+        self.rules[slot] = rule
+        self._district[slot] = self.district_index.get(rule["district"], -1)
+        self._amount[slot] = rule["amount"]
+        predicate = rule["predicate"]
+        if isinstance(predicate, Comparison):
+            self._metric[slot] = METRIC_INDEX[predicate.metric]
+            self._op[slot] = OP_CODES[predicate.op]
+            self._threshold[slot] = predicate.threshold
+            self._compound[slot] = -1
+        else:
+            self._metric[slot] = -1
+            self._compound[slot] = self._compound_id(predicate)
+
+    def _compound_id(self, predicate) -> int:
+        key = id(predicate)
+        if key not in self._compound_ids:
+            self._compound_ids[key] = len(self.compound_predicates)
+            self.compound_predicates.append(predicate)
+        return self._compound_ids[key]
+
+    def release(self, slot: int):
+        """Blank the row of a deleted rule"""
+        self.rules[slot] = None
+        self._district[slot] = -1
+        self._metric[slot] = -1
+        self._compound[slot] = -1
+
+
+class KernelResult:
+    """Output of one vectorized pass; rows are aligned with ``rule_index``"""
+
+    __slots__ = ("rule_index", "district", "eligible", "payout", "barriers")
+
+    def __init__(self, rule_index, district, eligible, payout, barriers):
+        self.rule_index = rule_index
+        self.district = district
+        self.eligible = eligible
+        self.payout = payout
+        self.barriers = barriers
+
+
+def _as_float(value):
+    return np.nan if value is None else float(value)
+
+
+def trigger_mask(rules: RuleColumns, districts: DistrictColumns) -> np.ndarray:
+    """Boolean mask of rules whose condition holds for their district"""
+    values = districts.metrics[rules.metric, rules.district]
+    state = (values < rules.threshold).view(np.int8) + 2 * (values == rules.threshold).view(np.int8)
+    mask = OP_TRUTH[rules.op, state] & ~np.isnan(values)
+
+    if rules.compound_predicates:
+        # [compound predicate, district] truth table, padded with False for the -1 sentinels
+        table = np.zeros((len(rules.compound_predicates) + 1, len(districts) + 1), dtype=bool)
+        for p, predicate in enumerate(rules.compound_predicates):
+            table[p, :-1] = [predicate.evaluate(record) for record in districts.records]
+        mask |= table[rules.compound, rules.district]
+
+    return mask
+
+
+def barrier_chain(districts: DistrictColumns) -> dict:
+    """Per-district eligibility after each research-based barrier"""
+    # 1. e-KYC completion barrier (64.67% lack awareness)
+    after_ekyc = np.trunc(districts.farmers * BASE_ELIGIBILITY * districts.ekyc_rate)
+    # 2. Biometric authentication failures
+    after_biometric = np.trunc(after_ekyc * (1 - districts.biometric_failure))
+    # 3. Exclusion errors (deserving farmers excluded due to data issues)
+    after_exclusion = np.trunc(after_biometric * (1 - districts.exclusion_errors))
+    # 4. Digital literacy barrier (minimum 70% can get help)
+    final_eligible = np.trunc(after_exclusion * (0.7 + 0.3 * districts.digital_literacy))
+    payment_reliability = 1 - districts.payment_delays
+    return {
+        "after_ekyc": after_ekyc,
+        "after_biometric": after_biometric,
+        "after_exclusion": after_exclusion,
+        "final_eligible": final_eligible,
+        # Inadequate amounts are not utilized effectively
+        "amount_factor": 0.6 + 0.4 * districts.amount_adequacy,
+        # Delayed payments (56.67% face delays) reduce effectiveness by 20-40%
+        "timing_effectiveness": np.where(payment_reliability > 0.6, 0.8, 0.6),
+    }
+
+
+def run_realistic_kernel(rules: RuleColumns, districts: DistrictColumns) -> KernelResult:
+    """Vectorized equivalent of the run_realistic_simulation rule loop"""
+    barriers = barrier_chain(districts)
+    rule_index = np.flatnonzero(trigger_mask(rules, districts))
+    district = rules.district[rule_index]
+
+    eligible = barriers["final_eligible"][district]
+    effective_amount = rules.amount[rule_index] * barriers["amount_factor"][district]
+    payout = np.trunc(eligible * effective_amount * barriers["timing_effectiveness"][district])
+
+    return KernelResult(
+        rule_index=rule_index,
+        district=district,
+        eligible=eligible.astype(np.int64),
+        payout=payout.astype(np.int64),
+        barriers=barriers
+    )
+
+
+def barrier_challenges(districts: DistrictColumns, barriers: dict, district: int) -> list:
+    """Challenge report lines for one triggered district (same wording as the scalar loop)"""
+    record = districts.records[district]
+    payment_reliability = 1 - record["payment_delays"]
+    return [
+        f"e-KYC barrier: {int(record['farmers'] * BASE_ELIGIBILITY * (1-record['ekyc_completion_rate']))} farmers",
+        f"Biometric failures: {int(barriers['after_ekyc'][district] * record['biometric_failure_rate'])} farmers",
+        f"Exclusion errors: {int(barriers['after_biometric'][district] * record['beneficiary_exclusion_errors'])} farmers",
+        f"Payment delays affecting {int(barriers['final_eligible'][district] * (1-payment_reliability))} farmers"
+    ]
@@ -0,0 +1,653 @@
+"""
+SQLite-backed persistence for subsidy rules and simulation runs.
+
+The database runs in WAL mode so several uvicorn workers can read while one
+writes. SQLite assigns rule ids, and every rule write appends an id range to
+the ``rule_changes`` log in the same transaction. Each worker replays the log
+into its in-memory RuleRepository (see main.sync_rules), so all workers
+converge on the same rule set without losing writes. The same database holds
+the on-disk tier of the AI insight cache (see ai_cache.AIResultCache), the
+checkpoints of disbursement runs (see disbursement.DisbursementPipeline) and
+the beneficiary records of the collusion-ring graph, which every worker
+replays the same way (see main.sync_ring_graph), and the PATCHed district
+conditions, which every worker applies over its district data (see
+main.sync_conditions).
+Blocking sqlite3 calls run on a small thread pool with one pooled connection
+per thread; sqlite3 caches the prepared statements per connection.
+"""
+
+import asyncio
+import json
+import queue
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from functools import lru_cache
+from typing import Iterable, List, NamedTuple, Optional
+
+from rule_engine import ConditionSyntaxError, compile_condition
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rules (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    scheme_name TEXT NOT NULL,
+    condition TEXT NOT NULL,
+    amount INTEGER NOT NULL,
+    district TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_rules_district ON rules(district);
+
+CREATE TABLE IF NOT EXISTS rule_changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    first_rule_id INTEGER NOT NULL,
+    last_rule_id INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS condition_changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    district TEXT NOT NULL,
+    conditions TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS simulation_runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    simulation_type TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    rules_triggered INTEGER NOT NULL,
+    farmers_impacted INTEGER NOT NULL,
+    total_payout INTEGER NOT NULL,
+    summary TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS ai_results (
+    key TEXT PRIMARY KEY,
+    text TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS disbursement_runs (
+    run_id TEXT PRIMARY KEY,
+    simulation_type TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    finished_at TEXT,
+    status TEXT NOT NULL,
+    chunk_size INTEGER NOT NULL,
+    instructions INTEGER NOT NULL,
+    chunks INTEGER NOT NULL,
+    total_amount INTEGER NOT NULL,
+    allocations TEXT NOT NULL,
+    lease_owner TEXT,
+    lease_until REAL
+);
+
+CREATE TABLE IF NOT EXISTS disbursement_chunks (
+    run_id TEXT NOT NULL,
+    chunk INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL,
+    instructions INTEGER NOT NULL,
+    amount INTEGER NOT NULL,
+    accepted INTEGER NOT NULL DEFAULT 0,
+    amount_accepted INTEGER NOT NULL DEFAULT 0,
+    rejected TEXT,
+    bank_reference TEXT,
+    error TEXT,
+    updated_at REAL NOT NULL,
+    ledger_from INTEGER,
+    ledger_seq INTEGER,
+    PRIMARY KEY (run_id, chunk)
+);
+
+CREATE TABLE IF NOT EXISTS ring_records (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    beneficiary_id TEXT,
+    district TEXT NOT NULL,
+    identifiers TEXT NOT NULL
+);
+"""
+
+INSERT_RULE = "INSERT INTO rules (scheme_name, condition, amount, district, created_at) VALUES (?, ?, ?, ?, ?)"
+UPDATE_RULE = "UPDATE rules SET scheme_name = ?, condition = ?, amount = ?, district = ? WHERE id = ?"
+DELETE_RULE = "DELETE FROM rules WHERE id = ?"
+SELECT_ALL_RULES = "SELECT id, scheme_name, condition, amount, district, created_at FROM rules ORDER BY id"
+LOG_CHANGE = "INSERT INTO rule_changes (first_rule_id, last_rule_id) VALUES (?, ?)"
+SELECT_CHANGED_RULES = """
+SELECT DISTINCT r.id, r.scheme_name, r.condition, r.amount, r.district, r.created_at
+FROM rule_changes c JOIN rules r ON r.id BETWEEN c.first_rule_id AND c.last_rule_id
+WHERE c.seq > ? AND c.seq <= ?
+ORDER BY r.id
+"""
+SELECT_DELETED_RULE_IDS = """
+SELECT DISTINCT c.first_rule_id FROM rule_changes c
+WHERE c.seq > ? AND c.seq <= ? AND c.first_rule_id = c.last_rule_id
+AND NOT EXISTS (SELECT 1 FROM rules r WHERE r.id = c.first_rule_id)
+"""
+SELECT_CHANGE_BOUNDS = "SELECT COALESCE(MIN(seq), 0), COALESCE(MAX(seq), 0) FROM rule_changes"
+PRUNE_CHANGES = "DELETE FROM rule_changes WHERE seq <= ?"
+INSERT_CONDITION_CHANGE = "INSERT INTO condition_changes (district, conditions, created_at) VALUES (?, ?, ?)"
+# Each change holds the district's whole merged record, so older changes of the district are superseded
+PRUNE_CONDITION_CHANGES = "DELETE FROM condition_changes WHERE district = ? AND seq < ?"
+SELECT_CONDITION_CHANGES = """
+SELECT seq, district, conditions, created_at FROM condition_changes WHERE seq > ? AND created_at > ? ORDER BY seq
+"""
+CLEAR_CONDITION_CHANGES = "DELETE FROM condition_changes"
+INSERT_SIMULATION = """
+INSERT INTO simulation_runs (simulation_type, created_at, rules_triggered, farmers_impacted, total_payout, summary)
+VALUES (?, ?, ?, ?, ?, ?)
+"""
+SELECT_SIMULATIONS = """
+SELECT id, simulation_type, created_at, rules_triggered, farmers_impacted, total_payout, summary
+FROM simulation_runs ORDER BY id DESC LIMIT ?
+"""
+SELECT_AI_RESULT = "SELECT text FROM ai_results WHERE key = ? AND created_at >= ?"
+UPSERT_AI_RESULT = "INSERT OR REPLACE INTO ai_results (key, text, created_at) VALUES (?, ?, ?)"
+PRUNE_AI_RESULTS = "DELETE FROM ai_results WHERE created_at < ?"
+INSERT_DISBURSEMENT_RUN = """
+INSERT OR IGNORE INTO disbursement_runs
+(run_id, simulation_type, created_at, status, chunk_size, instructions, chunks, total_amount, allocations)
+VALUES (?, ?, ?, 'running', ?, ?, ?, ?, ?)
+"""
+SELECT_DISBURSEMENT_RUN = """
+SELECT run_id, simulation_type, created_at, finished_at, status, chunk_size, instructions, chunks, total_amount,
+       lease_owner, lease_until
+FROM disbursement_runs WHERE run_id = ?
+"""
+SELECT_DISBURSEMENT_RUNS = "SELECT run_id FROM disbursement_runs ORDER BY created_at DESC LIMIT ?"
+SELECT_DISBURSEMENT_ALLOCATIONS = "SELECT allocations FROM disbursement_runs WHERE run_id = ?"
+SELECT_UNFINISHED_DISBURSEMENTS = "SELECT run_id FROM disbursement_runs WHERE status = 'running' ORDER BY created_at"
+# A run is executed by one worker at a time: whoever holds an unexpired lease (or renews its own)
+CLAIM_DISBURSEMENT_RUN = """
+UPDATE disbursement_runs SET lease_owner = ?, lease_until = ?
+WHERE run_id = ? AND status = 'running' AND (lease_owner = ? OR lease_until IS NULL OR lease_until < ?)
+"""
+RESTART_DISBURSEMENT_RUN = "UPDATE disbursement_runs SET status = 'running', finished_at = NULL WHERE run_id = ?"
+FINISH_DISBURSEMENT_RUN = """
+UPDATE disbursement_runs SET status = ?, finished_at = ?, lease_owner = NULL, lease_until = NULL
+WHERE run_id = ? AND lease_owner = ?
+"""
+RELEASE_DISBURSEMENT_RUN = "UPDATE disbursement_runs SET lease_owner = NULL, lease_until = NULL WHERE run_id = ? AND lease_owner = ?"
+UPSERT_CHUNK_ATTEMPT = """
+INSERT INTO disbursement_chunks (run_id, chunk, status, attempts, instructions, amount, updated_at)
+VALUES (?, ?, 'submitting', 1, ?, ?, ?)
+ON CONFLICT (run_id, chunk) DO UPDATE SET status = 'submitting', attempts = attempts + 1, error = NULL,
+                                          updated_at = excluded.updated_at
+"""
+UPDATE_CHUNK_RESULT = """
+UPDATE disbursement_chunks SET status = ?, accepted = ?, amount_accepted = ?, rejected = ?, bank_reference = ?,
+                               error = ?, updated_at = ?
+WHERE run_id = ? AND chunk = ?
+"""
+SELECT_DONE_CHUNKS = "SELECT chunk FROM disbursement_chunks WHERE run_id = ? AND status = 'done'"
+SELECT_CHUNK_PROGRESS = """
+SELECT status, COUNT(*), SUM(attempts), SUM(instructions), SUM(amount), SUM(accepted), SUM(amount_accepted)
+FROM disbursement_chunks WHERE run_id = ? GROUP BY status
+"""
+SELECT_CHUNKS = """
+SELECT chunk, status, attempts, instructions, amount, accepted, amount_accepted, rejected, bank_reference, error, updated_at,
+       ledger_seq
+FROM disbursement_chunks WHERE run_id = ? AND (? IS NULL OR status = ?) ORDER BY chunk LIMIT ? OFFSET ?
+"""
+# Ledger recording of done chunks: ledger_from (the ledger length before appending) is stored first, so
+# after a crash between the append and ledger_seq the entry is searched for from there instead of appended again
+SELECT_CHUNK_LEDGER = """
+SELECT status, instructions, amount, accepted, amount_accepted, bank_reference, ledger_from, ledger_seq
+FROM disbursement_chunks WHERE run_id = ? AND chunk = ?
+"""
+SELECT_UNRECORDED_CHUNKS = """
+SELECT chunk FROM disbursement_chunks WHERE run_id = ? AND status = 'done' AND ledger_seq IS NULL ORDER BY chunk
+"""
+UPDATE_CHUNK_LEDGER_FROM = "UPDATE disbursement_chunks SET ledger_from = ? WHERE run_id = ? AND chunk = ? AND ledger_seq IS NULL"
+UPDATE_CHUNK_LEDGER_SEQ = "UPDATE disbursement_chunks SET ledger_seq = ? WHERE run_id = ? AND chunk = ? AND ledger_seq IS NULL"
+INSERT_RING_RECORD = "INSERT INTO ring_records (beneficiary_id, district, identifiers) VALUES (?, ?, ?)"
+SELECT_RING_RECORDS = "SELECT seq, beneficiary_id, district, identifiers FROM ring_records WHERE seq > ? ORDER BY seq LIMIT ?"
+# Records are only ever cleared all at once, so a changed oldest seq means the graph was cleared
+SELECT_OLDEST_RING_RECORD = "SELECT MIN(seq) FROM ring_records"
+CLEAR_RING_RECORDS = "DELETE FROM ring_records"
+
+# Bulk-imported rows share one timestamp, so parsing is memoized
+parse_timestamp = lru_cache(maxsize=1024)(datetime.fromisoformat)
+
+# Change-log entries kept when pruning; workers further behind do a full reload
+CHANGE_LOG_RETENTION = 100_000
+
+
+class RuleChanges(NamedTuple):
+    """Rule writes committed since a change-log position"""
+    seq: int
+    rules: List[dict]
+    deleted_ids: List[int]
+    full_reload: bool
+
+
+def rule_from_row(row) -> Optional[dict]:
+    """Build an in-memory rule (with compiled predicate) from a rules row"""
+    rule_id, scheme_name, condition, amount, district, created_at = row
+    try:
+        predicate = compile_condition(condition)
+    except ConditionSyntaxError as e:
+        print(f"⚠️  Skipping stored rule {rule_id}: invalid condition '{condition}' ({e})")
+        return None
+    return {
+        "id": rule_id,
+        "schemeName": scheme_name,
+        "condition": condition,
+        "amount": amount,
+        "district": district,
+        "created_at": parse_timestamp(created_at),
+        "predicate": predicate
+    }
+
+
+class RuleStorage:
+    """Pooled SQLite (WAL) storage with an asyncio front-end backed by a thread executor"""
+
+    def __init__(self, path: str, pool_size: int = 4):
+        self.path = path
+        self.pool_size = pool_size
+        self._pool = None
+        self._executor = None
+
+    def open(self):
+        self._pool = queue.Queue()
+        for _ in range(self.pool_size):
+            self._pool.put(self._connect())
+        self._executor = ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix="sqlite")
+        with self._connection() as conn:
+            conn.executescript(SCHEMA)
+        self._prune_changes()
+
+    def close(self):
+        if self._executor:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        while self._pool is not None and not self._pool.empty():
+            self._pool.get_nowait().close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False,
+                               timeout=30.0, cached_statements=256)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=30000")
+        return conn
+
+    @contextmanager
+    def _connection(self):
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    @contextmanager
+    def _transaction(self, write: bool = False):
+        with self._connection() as conn:
+            # BEGIN IMMEDIATE takes the write lock up front so concurrent writers queue instead of deadlocking
+            conn.execute("BEGIN IMMEDIATE" if write else "BEGIN")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    async def _run(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
+
+    # Rules
+
+    def insert_rule_sync(self, scheme_name: str, condition: str, amount: int, district: str) -> int:
+        with self._transaction(write=True) as conn:
+            rule_id = conn.execute(INSERT_RULE, (scheme_name, condition, amount, district,
+                                                 datetime.now().isoformat())).lastrowid
+            conn.execute(LOG_CHANGE, (rule_id, rule_id))
+            return rule_id
+
+    def update_rule_sync(self, rule_id: int, scheme_name: str, condition: str, amount: int, district: str) -> bool:
+        with self._transaction(write=True) as conn:
+            if conn.execute(UPDATE_RULE, (scheme_name, condition, amount, district, rule_id)).rowcount == 0:
+                return False
+            conn.execute(LOG_CHANGE, (rule_id, rule_id))
+            return True
+
+    def delete_rule_sync(self, rule_id: int) -> bool:
+        with self._transaction(write=True) as conn:
+            if conn.execute(DELETE_RULE, (rule_id,)).rowcount == 0:
+                return False
+            conn.execute(LOG_CHANGE, (rule_id, rule_id))
+            return True
+
+    def bulk_insert_rules_sync(self, rows: Iterable[tuple], batch_size: int = 50_000) -> int:
+        """
+        Insert (scheme_name, condition, amount, district) rows in large batches,
+        one transaction per batch. Rows are expected to be validated already.
+        """
+        created_at = datetime.now().isoformat()
+        inserted = 0
+        batch = []
+        for scheme_name, condition, amount, district in rows:
+            batch.append((scheme_name, condition, amount, district, created_at))
+            if len(batch) >= batch_size:
+                inserted += self._insert_batch(batch)
+                batch = []
+        if batch:
+            inserted += self._insert_batch(batch)
+        self._prune_changes()
+        return inserted
+
+    def _insert_batch(self, batch: list) -> int:
+        with self._transaction(write=True) as conn:
+            conn.executemany(INSERT_RULE, batch)
+            # The write lock is held for the whole transaction, so the batch got consecutive ids
+            last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+            conn.execute(LOG_CHANGE, (last_id - len(batch) + 1, last_id))
+        return len(batch)
+
+    def _prune_changes(self):
+        with self._transaction(write=True) as conn:
+            _, latest = conn.execute(SELECT_CHANGE_BOUNDS).fetchone()
+            if latest > CHANGE_LOG_RETENTION:
+                conn.execute(PRUNE_CHANGES, (latest - CHANGE_LOG_RETENTION,))
+
+    def rule_changes_since_sync(self, seq: int, full: bool = False) -> RuleChanges:
+        """Rules written since ``seq``; every rule if ``full`` or the log no longer reaches back that far"""
+        with self._transaction() as conn:
+            oldest, latest = conn.execute(SELECT_CHANGE_BOUNDS).fetchone()
+            if not full and latest <= seq:
+                return RuleChanges(seq, [], [], False)
+            if full or oldest > seq + 1:
+                rows = conn.execute(SELECT_ALL_RULES).fetchall()
+                return RuleChanges(latest, [r for r in map(rule_from_row, rows) if r], [], True)
+            rows = conn.execute(SELECT_CHANGED_RULES, (seq, latest)).fetchall()
+            deleted_ids = [row[0] for row in conn.execute(SELECT_DELETED_RULE_IDS, (seq, latest))]
+        return RuleChanges(latest, [r for r in map(rule_from_row, rows) if r], deleted_ids, False)
+
+    async def insert_rule(self, scheme_name: str, condition: str, amount: int, district: str) -> int:
+        return await self._run(self.insert_rule_sync, scheme_name, condition, amount, district)
+
+    async def update_rule(self, rule_id: int, scheme_name: str, condition: str, amount: int, district: str) -> bool:
+        return await self._run(self.update_rule_sync, rule_id, scheme_name, condition, amount, district)
+
+    async def delete_rule(self, rule_id: int) -> bool:
+        return await self._run(self.delete_rule_sync, rule_id)
+
+    async def bulk_insert_rules(self, rows: Iterable[tuple], batch_size: int = 50_000) -> int:
+        return await self._run(self.bulk_insert_rules_sync, rows, batch_size)
+
+    async def rule_changes_since(self, seq: int, full: bool = False) -> RuleChanges:
+        return await self._run(self.rule_changes_since_sync, seq, full)
+
+    # District condition changes (PATCH /conditions)
+
+    def record_condition_change_sync(self, district: str, conditions: dict) -> tuple:
+        """Store a district's merged condition record; (seq, created_at as a Unix timestamp)"""
+        created_at = time.time()
+        with self._transaction(write=True) as conn:
+            seq = conn.execute(INSERT_CONDITION_CHANGE, (district, json.dumps(conditions), created_at)).lastrowid
+            conn.execute(PRUNE_CONDITION_CHANGES, (district, seq))
+        return seq, created_at
+
+    def condition_changes_since_sync(self, seq: int, after: float = 0) -> list:
+        """(seq, district, conditions, created_at) changes after ``seq`` made later than the ``after`` timestamp"""
+        with self._transaction() as conn:
+            rows = conn.execute(SELECT_CONDITION_CHANGES, (seq, after)).fetchall()
+        return [(row[0], row[1], json.loads(row[2]), row[3]) for row in rows]
+
+    def clear_condition_changes_sync(self) -> int:
+        with self._transaction(write=True) as conn:
+            return conn.execute(CLEAR_CONDITION_CHANGES).rowcount
+
+    async def record_condition_change(self, district: str, conditions: dict) -> tuple:
+        return await self._run(self.record_condition_change_sync, district, conditions)
+
+    async def condition_changes_since(self, seq: int, after: float = 0) -> list:
+        return await self._run(self.condition_changes_since_sync, seq, after)
+
+    async def clear_condition_changes(self) -> int:
+        return await self._run(self.clear_condition_changes_sync)
+
+    # Simulation runs
+
+    def record_simulation_sync(self, simulation_type: str, summary: dict) -> int:
+        with self._transaction(write=True) as conn:
+            cursor = conn.execute(INSERT_SIMULATION, (
+                simulation_type,
+                datetime.now().isoformat(),
+                summary.get("totalRulesTriggered", 0),
+                summary.get("totalFarmersImpacted", 0),
+                summary.get("totalPayoutAmount", 0),
+                json.dumps(summary, default=str)
+            ))
+            return cursor.lastrowid
+
+    def recent_simulations_sync(self, limit: int) -> list:
+        with self._connection() as conn:
+            rows = conn.execute(SELECT_SIMULATIONS, (limit,)).fetchall()
+        return [
+            {
+                "id": row[0],
+                "simulation_type": row[1],
+                "created_at": row[2],
+                "rules_triggered": row[3],
+                "farmers_impacted": row[4],
+                "total_payout": row[5],
+                "summary": json.loads(row[6])
+            } for row in rows
+        ]
+
+    async def record_simulation(self, simulation_type: str, summary: dict) -> int:
+        return await self._run(self.record_simulation_sync, simulation_type, summary)
+
+    async def recent_simulations(self, limit: int = 20) -> list:
+        return await self._run(self.recent_simulations_sync, limit)
+
+    # AI results (on-disk cache tier)
+
+    def get_ai_result_sync(self, key: str, max_age: float) -> Optional[str]:
+        with self._connection() as conn:
+            row = conn.execute(SELECT_AI_RESULT, (key, time.time() - max_age)).fetchone()
+        return row[0] if row else None
+
+    def put_ai_result_sync(self, key: str, text: str):
+        with self._transaction(write=True) as conn:
+            conn.execute(UPSERT_AI_RESULT, (key, text, time.time()))
+
+    def prune_ai_results_sync(self, max_age: float) -> int:
+        with self._transaction(write=True) as conn:
+            return conn.execute(PRUNE_AI_RESULTS, (time.time() - max_age,)).rowcount
+
+    async def get_ai_result(self, key: str, max_age: float) -> Optional[str]:
+        return await self._run(self.get_ai_result_sync, key, max_age)
+
+    async def put_ai_result(self, key: str, text: str):
+        return await self._run(self.put_ai_result_sync, key, text)
+
+    async def prune_ai_results(self, max_age: float) -> int:
+        return await self._run(self.prune_ai_results_sync, max_age)
+
+    # Disbursement runs (checkpoints of disbursement.DisbursementPipeline)
+
+    def create_disbursement_run_sync(self, run_id: str, simulation_type: str, chunk_size: int, instructions: int,
+                                     chunks: int, total_amount: int, allocations: list) -> bool:
+        """False if a run with this id exists already"""
+        with self._transaction(write=True) as conn:
+            return conn.execute(INSERT_DISBURSEMENT_RUN, (
+                run_id, simulation_type, datetime.now().isoformat(), chunk_size, instructions, chunks, total_amount,
+                json.dumps(allocations)
+            )).rowcount == 1
+
+    def get_disbursement_run_sync(self, run_id: str) -> Optional[dict]:
+        with self._connection() as conn:
+            row = conn.execute(SELECT_DISBURSEMENT_RUN, (run_id,)).fetchone()
+            if row is None:
+                return None
+            progress = conn.execute(SELECT_CHUNK_PROGRESS, (run_id,)).fetchall()
+        keys = ("run_id", "simulation_type", "created_at", "finished_at", "status", "chunk_size", "instructions",
+                "chunks", "total_amount", "lease_owner", "lease_until")
+        run = dict(zip(keys, row))
+        run["chunk_status"] = {status: count for status, count, *_ in progress}
+        run["attempts"] = sum(attempts for _, _, attempts, *_ in progress)
+        run["instructions_accepted"] = sum(accepted for *_, accepted, _ in progress)
+        run["amount_accepted"] = sum(amount for *_, amount in progress)
+        return run
+
+    def get_disbursement_allocations_sync(self, run_id: str) -> Optional[list]:
+        with self._connection() as conn:
+            row = conn.execute(SELECT_DISBURSEMENT_ALLOCATIONS, (run_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def recent_disbursement_runs_sync(self, limit: int) -> list:
+        with self._connection() as conn:
+            run_ids = [row[0] for row in conn.execute(SELECT_DISBURSEMENT_RUNS, (limit,))]
+        return [self.get_disbursement_run_sync(run_id) for run_id in run_ids]
+
+    def unfinished_disbursement_runs_sync(self) -> List[str]:
+        with self._connection() as conn:
+            return [row[0] for row in conn.execute(SELECT_UNFINISHED_DISBURSEMENTS)]
+
+    def claim_disbursement_run_sync(self, run_id: str, owner: str, lease_seconds: float, restart: bool = False) -> bool:
+        """Take (or renew) the run's lease; restart first reopens a finished run"""
+        now = time.time()
+        with self._transaction(write=True) as conn:
+            if restart:
+                conn.execute(RESTART_DISBURSEMENT_RUN, (run_id,))
+            return conn.execute(CLAIM_DISBURSEMENT_RUN, (owner, now + lease_seconds, run_id, owner, now)).rowcount == 1
+
+    def finish_disbursement_run_sync(self, run_id: str, owner: str, status: Optional[str]):
+        """Record the outcome and drop the lease; status None only drops the lease (run left to resume)"""
+        with self._transaction(write=True) as conn:
+            if status is None:
+                conn.execute(RELEASE_DISBURSEMENT_RUN, (run_id, owner))
+            else:
+                conn.execute(FINISH_DISBURSEMENT_RUN, (status, datetime.now().isoformat(), run_id, owner))
+
+    def done_disbursement_chunks_sync(self, run_id: str) -> set:
+        with self._connection() as conn:
+            return {row[0] for row in conn.execute(SELECT_DONE_CHUNKS, (run_id,))}
+
+    def record_chunk_attempt_sync(self, run_id: str, chunk: int, instructions: int, amount: int):
+        with self._transaction(write=True) as conn:
+            conn.execute(UPSERT_CHUNK_ATTEMPT, (run_id, chunk, instructions, amount, time.time()))
+
+    def record_chunk_result_sync(self, run_id: str, chunk: int, status: str, receipt: Optional[dict] = None,
+                                 error: Optional[str] = None):
+        receipt = receipt or {}
+        with self._transaction(write=True) as conn:
+            conn.execute(UPDATE_CHUNK_RESULT, (
+                status, receipt.get("accepted", 0), receipt.get("amount_accepted", 0),
+                json.dumps(receipt["rejected"]) if receipt.get("rejected") else None,
+                receipt.get("bank_reference"), error, time.time(), run_id, chunk
+            ))
+
+    def disbursement_chunks_sync(self, run_id: str, status: Optional[str], limit: int, offset: int) -> list:
+        with self._connection() as conn:
+            rows = conn.execute(SELECT_CHUNKS, (run_id, status, status, limit, offset)).fetchall()
+        keys = ("chunk", "status", "attempts", "instructions", "amount", "accepted", "amount_accepted", "rejected",
+                "bank_reference", "error", "updated_at", "ledger_seq")
+        chunks = [dict(zip(keys, row)) for row in rows]
+        for chunk in chunks:
+            chunk["rejected"] = json.loads(chunk["rejected"]) if chunk["rejected"] else []
+        return chunks
+
+    def chunk_ledger_state_sync(self, run_id: str, chunk: int) -> Optional[dict]:
+        with self._connection() as conn:
+            row = conn.execute(SELECT_CHUNK_LEDGER, (run_id, chunk)).fetchone()
+        keys = ("status", "instructions", "amount", "accepted", "amount_accepted", "bank_reference", "ledger_from",
+                "ledger_seq")
+        return dict(zip(keys, row)) if row else None
+
+    def unrecorded_disbursement_chunks_sync(self, run_id: str) -> List[int]:
+        with self._connection() as conn:
+            return [row[0] for row in conn.execute(SELECT_UNRECORDED_CHUNKS, (run_id,))]
+
+    def set_chunk_ledger_from_sync(self, run_id: str, chunk: int, ledger_from: int):
+        with self._transaction(write=True) as conn:
+            conn.execute(UPDATE_CHUNK_LEDGER_FROM, (ledger_from, run_id, chunk))
+
+    def set_chunk_ledger_seq_sync(self, run_id: str, chunk: int, seq: int):
+        with self._transaction(write=True) as conn:
+            conn.execute(UPDATE_CHUNK_LEDGER_SEQ, (seq, run_id, chunk))
+
+    async def create_disbursement_run(self, run_id: str, simulation_type: str, chunk_size: int, instructions: int,
+                                      chunks: int, total_amount: int, allocations: list) -> bool:
+        return await self._run(self.create_disbursement_run_sync, run_id, simulation_type, chunk_size, instructions,
+                               chunks, total_amount, allocations)
+
+    async def get_disbursement_run(self, run_id: str) -> Optional[dict]:
+        return await self._run(self.get_disbursement_run_sync, run_id)
+
+    async def get_disbursement_allocations(self, run_id: str) -> Optional[list]:
+        return await self._run(self.get_disbursement_allocations_sync, run_id)
+
+    async def recent_disbursement_runs(self, limit: int = 20) -> list:
+        return await self._run(self.recent_disbursement_runs_sync, limit)
+
+    async def unfinished_disbursement_runs(self) -> List[str]:
+        return await self._run(self.unfinished_disbursement_runs_sync)
+
+    async def claim_disbursement_run(self, run_id: str, owner: str, lease_seconds: float, restart: bool = False) -> bool:
+        return await self._run(self.claim_disbursement_run_sync, run_id, owner, lease_seconds, restart)
+
+    async def finish_disbursement_run(self, run_id: str, owner: str, status: Optional[str]):
+        return await self._run(self.finish_disbursement_run_sync, run_id, owner, status)
+
+    async def done_disbursement_chunks(self, run_id: str) -> set:
+        return await self._run(self.done_disbursement_chunks_sync, run_id)
+
+    async def record_chunk_attempt(self, run_id: str, chunk: int, instructions: int, amount: int):
+        return await self._run(self.record_chunk_attempt_sync, run_id, chunk, instructions, amount)
+
+    async def record_chunk_result(self, run_id: str, chunk: int, status: str, receipt: Optional[dict] = None,
+                                  error: Optional[str] = None):
+        return await self._run(self.record_chunk_result_sync, run_id, chunk, status, receipt, error)
+
+    async def disbursement_chunks(self, run_id: str, status: Optional[str] = None, limit: int = 100,
+                                  offset: int = 0) -> list:
+        return await self._run(self.disbursement_chunks_sync, run_id, status, limit, offset)
+
+    async def chunk_ledger_state(self, run_id: str, chunk: int) -> Optional[dict]:
+        return await self._run(self.chunk_ledger_state_sync, run_id, chunk)
+
+    async def unrecorded_disbursement_chunks(self, run_id: str) -> List[int]:
+        return await self._run(self.unrecorded_disbursement_chunks_sync, run_id)
+
+    async def set_chunk_ledger_from(self, run_id: str, chunk: int, ledger_from: int):
+        return await self._run(self.set_chunk_ledger_from_sync, run_id, chunk, ledger_from)
+
+    async def set_chunk_ledger_seq(self, run_id: str, chunk: int, seq: int):
+        return await self._run(self.set_chunk_ledger_seq_sync, run_id, chunk, seq)
+
+    # Ring records (beneficiary records of the collusion-ring graph)
+
+    def insert_ring_records_sync(self, rows: Iterable[tuple]) -> int:
+        """Store (beneficiary id or None, district, identifier keys) rows in one transaction"""
+        batch = [(beneficiary_id, district, json.dumps(keys, separators=(",", ":")))
+                 for beneficiary_id, district, keys in rows]
+        with self._transaction(write=True) as conn:
+            conn.executemany(INSERT_RING_RECORD, batch)
+        return len(batch)
+
+    def ring_records_since_sync(self, seq: int, limit: int) -> tuple:
+        """(oldest stored seq or None, up to ``limit`` (seq, beneficiary id, district, keys) rows after ``seq``)"""
+        with self._transaction() as conn:
+            oldest = conn.execute(SELECT_OLDEST_RING_RECORD).fetchone()[0]
+            rows = conn.execute(SELECT_RING_RECORDS, (seq, limit)).fetchall()
+        return oldest, [(row[0], row[1], row[2], json.loads(row[3])) for row in rows]
+
+    def clear_ring_records_sync(self) -> int:
+        with self._transaction(write=True) as conn:
+            return conn.execute(CLEAR_RING_RECORDS).rowcount
+
+    async def insert_ring_records(self, rows: List[tuple]) -> int:
+        return await self._run(self.insert_ring_records_sync, rows)
+
+    async def ring_records_since(self, seq: int, limit: int = 50_000) -> tuple:
+        return await self._run(self.ring_records_since_sync, seq, limit)
+
+    async def clear_ring_records(self) -> int:
+        return await self._run(self.clear_ring_records_sync)
@@ -0,0 +1,180 @@
+"""
+Crash recovery and lease takeover of disbursement runs.
+
+Runs go through a real RuleStorage (SQLite in a temporary directory), a
+real DisbursementLedger and a stub bank that keeps every instruction it
+paid, so a test can check that each instruction was paid, and each bank
+file recorded in the ledger, exactly once across an interrupted run.
+Usage: python -m pytest tests
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from disbursement import DisbursementPipeline, PaymentPlan, StubBankAdapter
+from ledger import DisbursementLedger
+from storage import RuleStorage
+
+CHUNK_SIZE = 50
+# Payouts that do not split evenly, so some farmers get the extra rupee
+ALLOCATIONS = [
+    {"rule_id": rule_id, "schemeName": "PM-KISAN", "district": "Ludhiana", "eligible": eligible, "payout": payout}
+    for rule_id, eligible, payout in [(1, 120, 720_007), (2, 95, 475_003), (3, 140, 350_011)]
+]
+
+
+class RecordingBank(StubBankAdapter):
+    """Stub bank that records what it paid, and stalls after paying the file of ``stall_chunk``"""
+
+    def __init__(self, stall_chunk=None, stall_seconds=0.0):
+        super().__init__(latency=0.001, failure_rate=0, rejection_rate=0)
+        self.stall_chunk = stall_chunk
+        self.stall_seconds = stall_seconds
+        self.paid = []  # (instruction id, amount) of every file accepted the first time
+        self.stalled = asyncio.Event()
+
+    async def submit(self, payment_file: dict) -> dict:
+        replayed = payment_file["file_id"] in self._receipts
+        receipt = await super().submit(payment_file)
+        if not replayed:
+            self.paid.extend((instruction["instruction_id"], instruction["amount"])
+                             for instruction in payment_file["instructions"])
+            if payment_file["chunk"] == self.stall_chunk:
+                self.stalled.set()
+                await asyncio.sleep(self.stall_seconds)
+        return receipt
+
+
+def open_storage(tmp_path) -> RuleStorage:
+    storage = RuleStorage(str(tmp_path / "rules.db"))
+    storage.open()
+    return storage
+
+
+def open_ledger(tmp_path) -> DisbursementLedger:
+    ledger = DisbursementLedger(str(tmp_path / "ledger"), fsync=False)
+    ledger.open()
+    return ledger
+
+
+async def wait_for(pipeline: DisbursementPipeline, timeout: float = 10.0):
+    await asyncio.wait_for(asyncio.gather(*pipeline._tasks.values(), return_exceptions=True), timeout)
+
+
+def assert_paid_once(bank: RecordingBank, plan: PaymentPlan):
+    ids = [instruction_id for instruction_id, _ in bank.paid]
+    assert len(ids) == len(set(ids)) == plan.instructions
+    assert sum(amount for _, amount in bank.paid) == plan.total_amount
+
+
+def assert_recorded_once(ledger: DisbursementLedger, plan: PaymentPlan):
+    entries = [ledger.entry(seq) for seq in range(len(ledger))]
+    assert sorted(entry["chunk"] for entry in entries) == list(range(plan.chunks))
+    assert {entry["run_id"] for entry in entries} == {plan.run_id}
+    assert sum(entry["amount_accepted"] for entry in entries) == plan.total_amount
+
+
+def test_resume_after_crash_mid_chunk_pays_each_instruction_once(tmp_path):
+    async def scenario():
+        storage, ledger = open_storage(tmp_path), open_ledger(tmp_path)
+        bank = RecordingBank(stall_chunk=3, stall_seconds=60)
+        crashed = DisbursementPipeline(storage, bank, concurrency=2, backoff_base=0.01, lease_seconds=1, ledger=ledger)
+        plan = PaymentPlan("run-crash", ALLOCATIONS, CHUNK_SIZE)
+        assert await crashed.create("run-crash", "basic", ALLOCATIONS, CHUNK_SIZE)
+
+        # The bank paid chunk 3, but the worker dies before recording the receipt
+        await asyncio.wait_for(bank.stalled.wait(), 10)
+        for task in crashed._tasks.values():
+            task.cancel()
+        await wait_for(crashed)
+        # A killed process never releases its lease
+        assert await storage.claim_disbursement_run("run-crash", crashed.owner, 1)
+        run = await storage.get_disbursement_run("run-crash")
+        assert run["status"] == "running"
+        assert run["chunk_status"].get("submitting")
+
+        bank.stall_chunk = None
+        resumed = DisbursementPipeline(storage, bank, concurrency=2, backoff_base=0.01, lease_seconds=1, ledger=ledger)
+        assert await resumed.resume_unfinished() == ["run-crash"]
+        await wait_for(resumed)
+
+        run = await storage.get_disbursement_run("run-crash")
+        assert run["status"] == "completed"
+        assert run["instructions_accepted"] == plan.instructions
+        assert run["amount_accepted"] == run["total_amount"] == plan.total_amount
+        # The interrupted file was resubmitted under the same id and answered from the bank's receipt
+        assert bank.stats["replayed"] >= 1
+        assert_paid_once(bank, plan)
+        assert_recorded_once(ledger, plan)
+        ledger.close()
+        storage.close()
+
+    asyncio.run(scenario())
+
+
+def test_second_owner_takes_over_a_stalled_run(tmp_path, capsys):
+    async def scenario():
+        storage, ledger = open_storage(tmp_path), open_ledger(tmp_path)
+        bank = RecordingBank(stall_chunk=2, stall_seconds=3)
+        stalled = DisbursementPipeline(storage, bank, concurrency=1, backoff_base=0.01, lease_seconds=1, ledger=ledger)
+        plan = PaymentPlan("run-lease", ALLOCATIONS, CHUNK_SIZE)
+        assert await stalled.create("run-lease", "basic", ALLOCATIONS, CHUNK_SIZE)
+        await asyncio.wait_for(bank.stalled.wait(), 10)
+
+        # The lease is still live: the second owner waits it out, then finishes the run
+        takeover = DisbursementPipeline(storage, bank, concurrency=2, backoff_base=0.01, lease_seconds=1, ledger=ledger)
+        assert not await storage.claim_disbursement_run("run-lease", takeover.owner, 1)
+        takeover.start("run-lease")
+        await wait_for(takeover)
+        run = await storage.get_disbursement_run("run-lease")
+        assert run["status"] == "completed"
+        assert stalled.running() == ["run-lease"]
+
+        # The stalled owner wakes up, finds its lease gone and stops without touching the run
+        await wait_for(stalled)
+        assert "lease taken over" in capsys.readouterr().out
+        run = await storage.get_disbursement_run("run-lease")
+        assert run["status"] == "completed"
+        assert run["lease_owner"] is None
+        assert run["amount_accepted"] == plan.total_amount
+        assert_paid_once(bank, plan)
+        assert_recorded_once(ledger, plan)
+        ledger.close()
+        storage.close()
+
+    asyncio.run(scenario())
+
+
+def test_chunk_appended_before_a_crash_is_not_recorded_again(tmp_path):
+    async def scenario():
+        storage, ledger = open_storage(tmp_path), open_ledger(tmp_path)
+        bank = RecordingBank()
+        first = DisbursementPipeline(storage, bank, concurrency=2, backoff_base=0.01, lease_seconds=1, ledger=ledger)
+        plan = PaymentPlan("run-ledger", ALLOCATIONS, CHUNK_SIZE)
+        assert await first.create("run-ledger", "basic", ALLOCATIONS, CHUNK_SIZE)
+        await wait_for(first)
+        assert_recorded_once(ledger, plan)
+
+        # Crash between the ledger append and storing its seq: chunk 1 looks unrecorded, the run unfinished
+        entries = len(ledger)
+        with storage._transaction(write=True) as conn:
+            conn.execute("UPDATE disbursement_chunks SET ledger_seq = NULL WHERE run_id = ? AND chunk = 1", ("run-ledger",))
+            conn.execute("UPDATE disbursement_runs SET status = 'running' WHERE run_id = ?", ("run-ledger",))
+
+        resumed = DisbursementPipeline(storage, bank, concurrency=2, backoff_base=0.01, lease_seconds=1, ledger=ledger)
+        assert await resumed.resume_unfinished() == ["run-ledger"]
+        await wait_for(resumed)
+        # The entry was found from ledger_from on instead of appended again
+        assert len(ledger) == entries
+        assert resumed.stats["chunks_recorded"] == 0
+        chunks = {chunk["chunk"]: chunk["ledger_seq"] for chunk in await storage.disbursement_chunks("run-ledger")}
+        assert ledger.entry(chunks[1])["chunk"] == 1
+        assert bank.stats["files"] == plan.chunks
+        assert_recorded_once(ledger, plan)
+        ledger.close()
+        storage.close()
+
+    asyncio.run(scenario())
@@ -0,0 +1,105 @@
+"""
+Async TTL cache with LRU bound, request coalescing and stale-while-revalidate.
+
+Fresh entries are returned without awaiting anything. When an entry is past
+its TTL but still inside the stale window, the stale value is returned
+immediately and one background refresh is started. Concurrent misses for the
+same key share a single in-flight fetch, so upstream sees one call per key
+however many requests arrive at once. Failed fetches are never cached; a
+failed background refresh keeps serving the stale value. Values rejected by
+the optional ``cacheable`` predicate are returned but not stored.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+
+class TTLCache:
+    """Bounded async cache: ttl seconds fresh, then stale_ttl seconds served stale while refreshing"""
+
+    def __init__(self, ttl: float, stale_ttl: float = 0.0, max_entries: int = 1024,
+                 clock: Callable[[], float] = time.monotonic,
+                 cacheable: Optional[Callable[[Any], bool]] = None):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._cacheable = cacheable
+        self._entries = OrderedDict()  # key -> (value, fetched_at), least recently used first
+        self._inflight = {}            # key -> asyncio.Task fetching the value
+        self._stats = {"hits": 0, "stale_hits": 0, "misses": 0, "coalesced": 0,
+                       "upstream_calls": 0, "upstream_errors": 0, "evictions": 0}
+
+    def __len__(self):
+        return len(self._entries)
+
+    async def get_or_fetch(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, fetched_at = entry
+            age = self._clock() - fetched_at
+            if age < self.ttl:
+                self._stats["hits"] += 1
+                self._entries.move_to_end(key)
+                return value
+            if age < self.ttl + self.stale_ttl:
+                self._stats["stale_hits"] += 1
+                self._entries.move_to_end(key)
+                if key not in self._inflight:
+                    self._start_fetch(key, fetch)
+                return value
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self._stats["coalesced"] += 1
+        else:
+            self._stats["misses"] += 1
+            task = self._start_fetch(key, fetch)
+        # shield: one cancelled caller must not cancel the fetch the others are waiting on
+        return await asyncio.shield(task)
+
+    def _start_fetch(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        self._stats["upstream_calls"] += 1
+        task = asyncio.ensure_future(self._fetch(key, fetch))
+        self._inflight[key] = task
+        task.add_done_callback(self._fetch_done)
+        return task
+
+    async def _fetch(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            value = await fetch()
+        finally:
+            self._inflight.pop(key, None)
+        if self._cacheable is None or self._cacheable(value):
+            self._store(key, value)
+        return value
+
+    def _fetch_done(self, task: asyncio.Task):
+        # Retrieve the exception so background refresh failures are not reported as unhandled
+        if not task.cancelled() and task.exception() is not None:
+            self._stats["upstream_errors"] += 1
+
+    def _store(self, key: Hashable, value: Any):
+        self._entries[key] = (value, self._clock())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def invalidate(self, key: Hashable = None):
+        """Drop one key, or everything when no key is given"""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    def stats(self) -> dict:
+        lookups = self._stats["hits"] + self._stats["stale_hits"] + self._stats["misses"] + self._stats["coalesced"]
+        served_from_cache = self._stats["hits"] + self._stats["stale_hits"]
+        return {
+            **self._stats,
+            "entries": len(self._entries),
+            "hit_rate": round(served_from_cache / lookups, 4) if lookups else 0.0
+        }